@@ -0,0 +1,69 @@
+"""
+Benchmark the vectorized gif_chroma_to_transparent against the former
+per-pixel Python loop.
+
+Run with ``python benchmarks/bench_chroma_key.py``.
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from stemplot.arrows._flow_arrows import gif_chroma_to_transparent
+
+
+def _chroma_loop(frame, bg_rgb):
+    # the previous implementation, one Python iteration per pixel
+    fr = frame.convert("RGBA")
+    new_data = []
+    for (r, g, b, a) in fr.getdata():
+        if (r, g, b) == bg_rgb:
+            new_data.append((r, g, b, 0))
+        else:
+            new_data.append((r, g, b, a))
+    fr.putdata(new_data)
+    return fr
+
+
+def make_gif(path, n_frames=100, size=720, bg_rgb=(255, 0, 255)):
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(n_frames):
+        a = np.empty((size, size, 3), dtype=np.uint8)
+        a[:] = bg_rgb
+        y0 = (i * 5) % (size - 100)
+        a[y0:y0 + 100, 100:600] = (100, 149, 237)
+        a[rng.integers(0, size, 500), rng.integers(0, size, 500)] = (0, 0, 0)
+        frames.append(Image.fromarray(a))
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50, loop=0)
+
+
+def main(n_frames=100, size=720, n_loop=2):
+    bg_rgb = (255, 0, 255)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = Path(tmpdir) / 'in.gif'
+        dst = Path(tmpdir) / 'out.gif'
+        make_gif(src, n_frames, size, bg_rgb)
+
+        # the loop takes seconds per frame; time a few frames and extrapolate
+        with Image.open(src) as im:
+            t0 = time.perf_counter()
+            for k, frame in enumerate(ImageSequence.Iterator(im)):
+                if k == n_loop:
+                    break
+                _chroma_loop(frame, bg_rgb)
+        t_loop = (time.perf_counter() - t0) * n_frames / n_loop
+
+        t0 = time.perf_counter()
+        gif_chroma_to_transparent(src, dst, bg_rgb=bg_rgb)
+        t_vec = time.perf_counter() - t0
+
+    print(f"{n_frames} frames of {size}x{size}")
+    print(f"per-pixel loop (extrapolated): {t_loop:8.2f} s")
+    print(f"vectorized:                    {t_vec:8.2f} s  ({t_loop / t_vec:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark plot_confusion_matrix and annotate_heatmap against the former
+one-artist-per-cell implementations for 50, 100 and 500 classes.
+
+Run with ``python benchmarks/bench_heatmap_labels.py``.
+"""
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import ticker
+from matplotlib.patches import Rectangle
+
+from stemplot.utils import annotate_heatmap, plot_confusion_matrix
+
+
+def _confusion_matrix_loop(mat, ax, fontsize=10):
+    # the previous implementation, one Rectangle and one Text per cell
+    n = mat.shape[0]
+    ax.set_aspect('equal')
+    ax.set_xlim(0, n)
+    ax.set_ylim(n, 0)
+    for i in range(n):
+        for j in range(n):
+            color = '#a6cee3' if i == j else '#f0f0f0'
+            ax.add_patch(Rectangle((j, i), 1, 1, facecolor=color, edgecolor='white', linewidth=1.0))
+            ax.text(j + 0.5, i + 0.5, str(mat[i, j]), ha='center', va='center', color='black',
+                    fontsize=fontsize)
+
+
+def _annotate_loop(im, data, valfmt="{x:.2f}", textcolors=("black", "white")):
+    # the previous implementation, one norm call and one Text per cell
+    threshold = im.norm(data.max()) / 2.
+    valfmt = ticker.StrMethodFormatter(valfmt)
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            im.axes.text(j, i, valfmt(data[i, j], None), ha='center', va='center',
+                         color=textcolors[int(im.norm(data[i, j]) > threshold)])
+
+
+def _time(plot, data, size=10):
+    fig, ax = plt.subplots(figsize=(size, size), dpi=100)
+    t0 = time.perf_counter()
+    plot(ax, data)
+    fig.canvas.draw()
+    t = time.perf_counter() - t0
+    plt.close(fig)
+    return t
+
+
+def main(sizes=(50, 100, 500), max_loop=100):
+    rng = np.random.default_rng(0)
+    print(f"{'classes':>8} {'':>18} {'per-cell':>10} {'batched':>10}")
+    for n in sizes:
+        mat = rng.integers(0, 1000, (n, n))
+        heat = rng.random((n, n))
+
+        def cm_new(ax, m): plot_confusion_matrix(m, ax)
+        def cm_old(ax, m): _confusion_matrix_loop(m, ax)
+        def hm_new(ax, d): annotate_heatmap(ax.imshow(d), batched=True)
+        def hm_old(ax, d): _annotate_loop(ax.imshow(d), d)
+
+        for name, old, new, data in (('confusion matrix', cm_old, cm_new, mat),
+                                     ('annotate_heatmap', hm_old, hm_new, heat)):
+            t_new = _time(new, data)
+            if n <= max_loop:
+                t_old = f"{_time(old, data):9.2f}s"
+            else:
+                # the per-cell version grows with the number of cells; time a
+                # max_loop-sized matrix and extrapolate
+                t_old = f"~{_time(old, data[:max_loop, :max_loop]) * (n / max_loop) ** 2:8.0f}s"
+            print(f"{n:>8} {name:>18} {t_old:>10} {t_new:9.2f}s")
+
+
+if __name__ == '__main__':
+    main()
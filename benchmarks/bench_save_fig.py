@@ -0,0 +1,61 @@
+"""
+Benchmark exporting a 12-panel figure to PNG, PDF and SVG with one
+``save_fig(..., formats=...)`` call against three ``save_fig`` calls, which
+each redo the layout and the tight-bbox measurement draw.
+
+Run with ``python benchmarks/bench_save_fig.py``.
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from stemplot.utils import save_fig
+
+
+FORMATS = ('png', 'pdf', 'svg')
+
+
+def _make_fig(seed=0):
+    rng = np.random.default_rng(seed)
+    fig, axs = plt.subplots(3, 4, figsize=(12, 8))
+    for i, ax in enumerate(axs.flat):
+        ax.plot(rng.normal(size=(300, 3)).cumsum(axis=0))
+        ax.set_title(f'panel {i}')
+        ax.set_xlabel('step')
+        ax.set_ylabel('value')
+    return fig
+
+
+def _time(save, out, repeat):
+    times = []
+    for i in range(repeat):
+        fig = _make_fig(i)
+        t0 = time.perf_counter()
+        save(fig, out)
+        times.append(time.perf_counter() - t0)
+        plt.close(fig)
+    return min(times)
+
+
+def main(repeat=3, dpi=150):
+    def separate(fig, out):
+        for fmt in FORMATS:
+            save_fig(fig, f'{out}.{fmt}', dpi=dpi)
+
+    def combined(fig, out):
+        save_fig(fig, out, formats=FORMATS, dpi=dpi)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t_separate = _time(separate, Path(tmp) / 'separate', repeat)
+        t_combined = _time(combined, Path(tmp) / 'combined', repeat)
+    print(f"{'three save_fig calls':>24} {t_separate:6.2f}s")
+    print(f"{'save_fig(formats=...)':>24} {t_combined:6.2f}s ({1 - t_combined / t_separate:.0%} saved)")
+
+
+if __name__ == '__main__':
+    main()
@@ -25,26 +25,45 @@ colors = _LazyLoader('stemplot.colors')
 arrows = _LazyLoader('stemplot.arrows')
 layout = _LazyLoader('stemplot.layout')
 io = _LazyLoader('stemplot.io')
+batch = _LazyLoader('stemplot.batch')
 
-# Explicit imports for frequently used functions or classes
-# These are assumed to be lightweight and commonly used enough to justify immediate loading.
-from stemplot.colors._colors import colors_from_lbs  # Assuming colors_from_lbs is lightweight
-from stemplot.layout._layout import h_axes
-from stemplot.patches._polygon import ax_add_gradient_polygon
-from stemplot.patches._fancybox import fig_add_fancybox
-from stemplot.patches._fancybox import ax_add_fancybox
-from stemplot.utils._plot_density import plot_density
-from stemplot.interactive._data_explorer import interactive_data
-from stemplot.interactive._data_slicer import imshow
-from stemplot.interactive._data_slicer import plot
-from stemplot.utils._plot_pca import plot_pca
-from stemplot.utils._plot_image import plot_image
-from stemplot.external import plot_chord_diagram
-from stemplot.utils import save_fig
+# Frequently used functions and classes, imported from their module on first
+# access so that importing a compute-only part of the package (e.g.
+# stemplot.batch) does not import matplotlib.pyplot.
+_LAZY_ATTRS = {
+    'colors_from_lbs': 'stemplot.colors._colors',
+    'h_axes': 'stemplot.layout._layout',
+    'ax_add_gradient_polygon': 'stemplot.patches._polygon',
+    'fig_add_fancybox': 'stemplot.patches._fancybox',
+    'ax_add_fancybox': 'stemplot.patches._fancybox',
+    'plot_density': 'stemplot.utils._plot_density',
+    'interactive_data': 'stemplot.interactive._data_explorer',
+    'imshow': 'stemplot.interactive._data_slicer',
+    'plot': 'stemplot.interactive._data_slicer',
+    'plot_pca': 'stemplot.utils._plot_pca',
+    'plot_image': 'stemplot.utils._plot_image',
+    'plot_chord_diagram': 'stemplot.external',
+    'save_fig': 'stemplot.utils',
+    'save_figs': 'stemplot.utils',
+    'set_style': 'stemplot.style.utils',
+    'reset_style': 'stemplot.style.utils',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 #from matplotlib import rcParams
 #from .style.rc1 import rc1
-from .style.utils import set_style, reset_style
 # Automatically apply rc settings on import
 # rcParams.update(rc1)
 
@@ -52,6 +71,7 @@ __all__ = ['colors',
            'arrows',
            'layout',
            'io',
+           'batch',
            'colors_from_lbs',
            'h_axes',
            'ax_add_gradient_polygon',
@@ -67,4 +87,5 @@ __all__ = ['colors',
            'set_style',
            'reset_style',
            'save_fig',
+           'save_figs',
            ]
\ No newline at end of file
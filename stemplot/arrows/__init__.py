@@ -1,9 +1,17 @@
 from ._arrows import ax_add_arrow
 from ._flow_arrows import get_arrow
 from ._flow_arrows import get_arrow_head
+from ._flow_arrows import get_arrow_heads
 from ._flow_arrows import flow_arrow_animation
+from ._arrow_animator import ArrowAnimator
+from ._connectors import connect_by_branches_collection
+from ._connectors import connect_by_gradients
 
 __all__ = ['ax_add_arrow',
            'get_arrow',
            'get_arrow_head',
-           'flow_arrow_animation',]
\ No newline at end of file
+           'get_arrow_heads',
+           'flow_arrow_animation',
+           'ArrowAnimator',
+           'connect_by_branches_collection',
+           'connect_by_gradients',]
\ No newline at end of file
@@ -0,0 +1,273 @@
+import numpy as np
+import matplotlib as mpl
+import matplotlib.animation as animation
+import matplotlib.colors as mc
+from itertools import repeat
+from pathlib import Path
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection, PolyCollection
+
+from ._flow_arrows import _render_frames, _write_gif_frames
+
+
+class _FlushOnDraw:
+    """Push the arrows added to the group since the last draw first."""
+
+    def draw(self, renderer):
+        self.group.flush()
+        super().draw(renderer)
+
+
+class _ArrowLines(_FlushOnDraw, LineCollection):
+    pass
+
+
+class _ArrowHeads(_FlushOnDraw, PolyCollection):
+    pass
+
+
+class _ArrowGroup:
+    """
+    Arrows drawn in one Axes: one LineCollection for the dashed bodies and
+    one PolyCollection for the static heads.
+
+    Added arrows are only appended to lists, which are handed to the
+    collections once before the next draw, so adding n arrows costs O(n).
+    """
+
+    def __init__(self, ax, transform, antialiased, zorder, dash_pattern):
+        self.segments = []
+        self.colors = []
+        self.lws = []
+        self.phases = []
+        self.heads = []
+        self.head_colors = []
+        self.dash_pattern = tuple(dash_pattern)
+        self.frame = 0
+        self._dirty = False
+        self.lc = _ArrowLines([], transform=transform, antialiaseds=antialiased,
+                              capstyle='butt', zorder=zorder)
+        self.pc = _ArrowHeads([], transform=transform, antialiaseds=antialiased,
+                              edgecolors='none', zorder=zorder)
+        self.lc.group = self.pc.group = self
+        ax.add_collection(self.lc)
+        ax.add_collection(self.pc)
+
+    def add(self, xy, color, lw, phase, head):
+        self.segments.append(xy)
+        self.colors.append(color)
+        self.lws.append(lw)
+        self.phases.append(phase)
+        if head is not None:
+            self.heads.append(head)
+            self.head_colors.append(color)
+        self._dirty = True
+        self.lc.stale = True
+
+    def flush(self):
+        if not self._dirty:
+            return
+        self.lc.set_segments(self.segments)
+        self.lc.set_color(self.colors)
+        self.lc.set_linewidth(self.lws)
+        self.pc.set_verts(self.heads)
+        self.pc.set_facecolor(self.head_colors)
+        self._phases = np.asarray(self.phases, dtype=float)
+        self._scale = np.asarray(self.lws, dtype=float) if mpl.rcParams['lines.scale_dashes'] else 1.
+        scales = np.broadcast_to(self._scale, (len(self.lws),)).tolist()
+        self._scaled_patterns = [tuple(k * d for d in self.dash_pattern) for k in scales]
+        self._dirty = False
+        self.set_frame(self.frame)
+
+    def set_frame(self, frame):
+        """
+        Shift the dashes of all lines to `frame` in one array operation.
+
+        This sets what ``LineCollection.set_linestyle`` would compute from one
+        ``(offset, dash_pattern)`` style per line, without parsing them.
+        """
+        self.frame = frame
+        if self._dirty:
+            self.flush()
+            return
+        offsets = np.mod(self._phases - frame, sum(self.dash_pattern))
+        self.lc._us_linestyles = list(zip(offsets.tolist(), repeat(self.dash_pattern)))
+        self.lc._linestyles = list(zip((offsets * self._scale).tolist(), self._scaled_patterns))
+        self.lc.stale = True
+
+
+class ArrowAnimator:
+    """
+    Animate many flowing dashed arrows on an existing figure.
+
+    Arrows are grouped per Axes (or a transparent Axes over the whole figure,
+    for arrows in figure coordinates) into a single `LineCollection` whose per-line dash offsets are advanced
+    together every frame; arrow heads are static and live in one
+    `PolyCollection` per group. The animation blits only the line
+    collections, and `save` draws the static figure once and composites the
+    arrow layer over it for every frame.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to draw on.
+    dash_on_length : float, default 10
+        Dash length in points.
+    dash_off_length : float, default 5
+        Gap length in points.
+    interval : int, default 50
+        Delay between frames in milliseconds.
+    color : color, default 'cornflowerblue'
+        Default arrow color.
+    lw : float, default 3
+        Default line width.
+    antialiased : bool, default True
+        Antialias lines and heads; False keeps GIF palettes small.
+    zorder : float, default 3
+        Drawing order of the arrows.
+
+    Examples
+    --------
+    >>> anim = ArrowAnimator(fig)
+    >>> anim.add_arrow(*get_arrow((0, 0), (1, 1), radius=0.1, head_length=0.1), ax=ax)
+    >>> anim.add_arrow(*get_arrow((0.1, 0.5), (0.9, 0.5), radius=0, head_length=0.02))  # figure coords
+    >>> ani = anim.animate()
+    >>> anim.save('schematic.gif')
+    """
+
+    def __init__(self, fig, dash_on_length=10, dash_off_length=5, interval=50,
+                 color='cornflowerblue', lw=3, antialiased=True, zorder=3):
+        self.fig = fig
+        self.dash_pattern = (dash_on_length, dash_off_length)
+        self.period = dash_on_length + dash_off_length
+        self.interval = interval
+        self.color = color
+        self.lw = lw
+        self.antialiased = antialiased
+        self.zorder = zorder
+        self.ani = None
+        self._groups = {}
+        self._overlay_ax = None
+
+    def _overlay(self):
+        # Axes covering the figure for arrows in figure coordinates, so that
+        # they can be blitted like the others. It is a figure artist rather
+        # than one of fig.axes, so it takes no mouse events and no layout.
+        if self._overlay_ax is None:
+            ax = Axes(self.fig, (0, 0, 1, 1), zorder=self.zorder)
+            ax.set_axis_off()
+            ax.set_navigate(False)
+            ax.set_in_layout(False)
+            self.fig.add_artist(ax)
+            self._overlay_ax = ax
+        return self._overlay_ax
+
+    def _group(self, ax):
+        key = id(ax)
+        if key not in self._groups:
+            if ax is None:
+                container, transform = self._overlay(), self.fig.transFigure
+            else:
+                container, transform = ax, ax.transData
+            self._groups[key] = _ArrowGroup(container, transform, self.antialiased, self.zorder,
+                                            self.dash_pattern)
+        return self._groups[key]
+
+    def add_arrow(self, x, y, head=None, ax=None, color=None, lw=None, phase=0):
+        """
+        Add an arrow, e.g. the result of `get_arrow`.
+
+        Parameters
+        ----------
+        x, y : array-like
+            Coordinates of the arrow body.
+        head : array-like, shape (3, 2), optional
+            Triangle vertices of the arrow head.
+        ax : matplotlib.axes.Axes, optional
+            Axes whose data coordinates `x`, `y` and `head` are in. By default
+            they are figure coordinates, so the arrow can span several axes.
+        color : color, optional
+            Arrow color, defaults to the animator color.
+        lw : float, optional
+            Line width, defaults to the animator line width.
+        phase : float, default 0
+            Dash offset in points, to desynchronize arrows.
+        """
+        xy = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+        if head is not None:
+            head = np.asarray(head, dtype=float)
+        color = mc.to_rgba(self.color if color is None else color)
+        lw = self.lw if lw is None else lw
+        self._group(ax).add(xy, color, lw, phase, head)
+
+    def add_arrows(self, arrows, ax=None, **kwargs):
+        """
+        Add several ``(x, y, head)`` tuples, see `add_arrow`.
+        """
+        for x, y, head in arrows:
+            self.add_arrow(x, y, head, ax=ax, **kwargs)
+
+    def add_line(self, line, head=None, phase=0):
+        """
+        Animate an existing `Line2D`; the original line is hidden.
+        """
+        x, y = line.get_data()
+        self.add_arrow(x, y, head, ax=line.axes, color=line.get_color(), lw=line.get_linewidth(), phase=phase)
+        line.set_visible(False)
+
+    @property
+    def collections(self):
+        for g in self._groups.values():
+            g.flush()
+        return [g.lc for g in self._groups.values()]
+
+    def _init(self):
+        return self._update(0)
+
+    def _update(self, frame):
+        for g in self._groups.values():
+            g.set_frame(frame)
+        return self.collections
+
+    def animate(self, blit=True, repeat=True):
+        """
+        Start the animation.
+
+        Returns
+        -------
+        matplotlib.animation.FuncAnimation
+        """
+        self.ani = animation.FuncAnimation(self.fig, self._update, frames=np.arange(0, self.period),
+                                           init_func=self._init, interval=self.interval,
+                                           blit=blit, repeat=repeat)
+        return self.ani
+
+    def save(self, path, fps=None, chroma_rgb=None, tolerance=0):
+        """
+        Save one period of the animation.
+
+        GIFs are written from frames composited over a background drawn once;
+        other formats go through ``FuncAnimation.save``.
+
+        Parameters
+        ----------
+        path : str or Path
+            Output file.
+        fps : float, optional
+            Frame rate, defaults to ``1000 / interval``.
+        chroma_rgb : tuple of (R, G, B), optional
+            GIF only: make this color (0–255) transparent, e.g. the figure
+            face color.
+        tolerance : int, default 0
+            Channel tolerance of the chroma key.
+        """
+        path = Path(path)
+        fps = fps or max(1, int(1000 / self.interval))
+        if path.suffix.lower() == '.gif':
+            self._init()
+            frames = _render_frames(self.fig, self.collections, self._update, np.arange(0, self.period))
+            _write_gif_frames(path, frames, duration=int(round(1000 / fps)),
+                              chroma_rgb=chroma_rgb, tolerance=tolerance)
+        else:
+            ani = self.ani or self.animate(blit=False)
+            ani.save(path, writer='pillow', fps=fps)
@@ -0,0 +1,254 @@
+import numpy as np
+import matplotlib as mpl
+from matplotlib.path import Path
+from matplotlib.collections import PathCollection
+
+from stemplot.layout._utils import get_fig_aspect
+
+
+# Collection-backed versions of the panel connectors in _arrow_old. Positions
+# are figure fractions throughout; all connectors of one call share a single
+# artist instead of one patch (or one clipped image) per connection.
+
+_LOCS = {'lower left': 0, 'lower right': 3,
+         'upper left': 1, 'upper right': 2,
+         'top': 1.5, 'bottom': 3.5,
+         'left': 0.5, 'right': 2.5}
+
+_BRANCH_CODES = [1, 2, 3, 3, 2, 3, 3, 2, 2, 3, 3, 2, 3, 3, 79]
+
+
+def _ax_point(ax, loc):
+    """
+    Figure-fraction position of `loc` on the border of `ax`, walking the
+    border counter-clockwise from the lower left corner (0) as in
+    ``_arrow_old.ax_get_position``.
+    """
+    s = _LOCS[loc]
+    x, y, w, h = ax.get_position().bounds
+    if s <= 1:
+        return x, y + h * s
+    elif s < 2:
+        return x + w * (s - 1), y + h
+    elif s < 3:
+        return x + w, y + h * (3 - s)
+    return x + w * (4 - s), y
+
+
+def _ax_center_pixels(ax):
+    x, y, w, h = ax.get_position().bounds
+    return ax.figure.transFigure.transform((x + w / 2, y + h / 2))
+
+
+def _estimate_locs(ax1, ax2):
+    if np.iterable(ax1):
+        x1, y1 = np.mean([_ax_center_pixels(a) for a in ax1], axis=0)
+    else:
+        x1, y1 = _ax_center_pixels(ax1)
+    if np.iterable(ax2):
+        x2, y2 = np.mean([_ax_center_pixels(a) for a in ax2], axis=0)
+    else:
+        x2, y2 = _ax_center_pixels(ax2)
+
+    if np.abs(x1 - x2) > np.abs(y1 - y2):
+        return ('left', 'right') if x1 > x2 else ('right', 'left')
+    return ('bottom', 'top') if y1 > y2 else ('top', 'bottom')
+
+
+def _branch_vertices(start, ends, mode='h', r=0.1, lamda=2, aspect_ratio=1.0):
+    """
+    Vertices of the closed branch paths from `start` to every point of
+    `ends`, shape (n, 15, 2); the geometry of ``_arrow_old.get_path_from_pts``.
+    """
+    start = np.asarray(start, dtype=float)
+    ends = np.atleast_2d(np.asarray(ends, dtype=float))
+    n = len(ends)
+    mid = (lamda * start + ends) / (lamda + 1)
+    sign = np.sign(ends - start)
+    dx = np.abs(start[0] - ends[:, 0])
+    dy = np.abs(start[1] - ends[:, 1])
+    L = np.minimum(dx * aspect_ratio, dy)
+    lx = (L / aspect_ratio * r * sign[:, 0])[:, None] * [1, 0]
+    ly = (L * r * sign[:, 1])[:, None] * [0, 1]
+    starts = np.broadcast_to(start, (n, 2))
+
+    if mode == 'h':
+        p1 = np.column_stack([mid[:, 0], starts[:, 1]])
+        p2 = np.column_stack([mid[:, 0], ends[:, 1]])
+        p1s, p1e = p1 - lx, p1 + ly
+        p2s, p2e = p2 - ly, p2 + lx
+    elif mode == 'v':
+        p1 = np.column_stack([starts[:, 0], mid[:, 1]])
+        p2 = np.column_stack([ends[:, 0], mid[:, 1]])
+        p1s, p1e = p1 - ly, p1 + lx
+        p2s, p2e = p2 - lx, p2 + ly
+    else:
+        raise ValueError(f"mode must be 'h' or 'v', got {mode!r}.")
+
+    return np.stack([starts, p1s, p1, p1e, p2s, p2, p2e, ends,
+                     p2e, p2, p2s, p1e, p1, p1s, starts], axis=1)
+
+
+def connect_by_branches_collection(ax, axes, loc1=None, loc2=None, mode='h', r=0.15, lamda=2, **kwargs):
+    """
+    Connect `ax` to each of `axes` with branch shapes drawn as one collection.
+
+    Same geometry as ``connect_by_branches``, but all branches are vertices
+    of a single `PathCollection` in figure coordinates instead of one
+    `PathPatch` per connection.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Source panel.
+    axes : sequence of matplotlib.axes.Axes
+        Target panels.
+    loc1, loc2 : str, optional
+        Border locations on the source and target panels ('left', 'right',
+        'top', 'bottom' or a corner). Estimated from the panel positions by
+        default.
+    mode : {'h', 'v'}, default 'h'
+        Horizontal or vertical branches.
+    r : float, default 0.15
+        Corner rounding relative to the branch extent.
+    lamda : float, default 2
+        Position of the bend, ``(lamda * start + end) / (lamda + 1)``.
+    **kwargs
+        Passed to `matplotlib.collections.PathCollection`.
+
+    Returns
+    -------
+    matplotlib.collections.PathCollection
+    """
+    if loc1 is None and loc2 is None:
+        loc1, loc2 = _estimate_locs(ax, axes)
+
+    fig = ax.figure
+    p1 = _ax_point(ax, loc1)
+    ends = [_ax_point(ax_, loc2) for ax_ in axes]
+    verts = _branch_vertices(p1, ends, mode=mode, r=r, lamda=lamda, aspect_ratio=get_fig_aspect(fig))
+
+    kwargs.setdefault('facecolor', mpl.rcParams['patch.facecolor'])
+    kwargs.setdefault('edgecolor', 'none')
+    paths = [Path(v, _BRANCH_CODES) for v in verts]
+    pc = PathCollection(paths, transform=fig.transFigure, **kwargs)
+    fig.add_artist(pc)
+    return pc
+
+
+def _bspline(x):
+    x = np.abs(x)
+    return np.where(x < 1, 2 / 3 - x ** 2 + x ** 3 / 2, np.where(x < 2, (2 - x) ** 3 / 6, 0.))
+
+
+def _bicubic_ramp(s):
+    """
+    Two pixel ramp [0, 1] as upsampled by matplotlib's 'bicubic'
+    interpolation (a cubic B-spline, edges reflected), at fractions `s` of
+    the image extent.
+    """
+    # pixel centres at 1/4 and 3/4 of the extent are at t = 0 and 1; the
+    # reflected samples are ... 1 0 | 0 1 | 1 0 ...
+    t = 2 * np.asarray(s, dtype=float) - 0.5
+    return sum(_bspline(t - j) for j in (-2, 1, 2))
+
+
+def _gradient_polygon(ax1, ax2, loc1, loc2):
+    def _expand_loc(loc):
+        if loc in ['left', 'right']:
+            return ['lower ' + loc, 'upper ' + loc]
+        elif loc == 'top':
+            return ['upper left', 'upper right']
+        return ['lower left', 'lower right']
+
+    pts = np.array([_ax_point(ax1, l) for l in _expand_loc(loc1)]
+                   + [_ax_point(ax2, l) for l in _expand_loc(loc2)])
+    centered = pts - pts.mean(axis=0)
+    return pts[np.argsort(np.arctan2(centered[:, 1], centered[:, 0]))]
+
+
+def connect_by_gradients(pairs, loc1=None, loc2=None, cmap='gray', direction=0, alpha=0.5,
+                         resolution=None, zorder=-2):
+    """
+    Fill the gaps between pairs of panels with gradients drawn as one image.
+
+    ``connect_by_gradient`` adds an axes and an image clipped by a polygon
+    per connection. Here every connection's ramp is written into one shared
+    RGBA raster covering the figure, which is drawn once and clipped by the
+    compound path of all connection polygons. The ramps reproduce the
+    bicubic upsampling of the 2x2 image of ``gradient_image``.
+
+    Parameters
+    ----------
+    pairs : sequence of (Axes, Axes)
+        Panels to connect.
+    loc1, loc2 : str, optional
+        Border locations used for every pair. Estimated per pair by default.
+    cmap : str or Colormap, default 'gray'
+        Colormap of the gradient.
+    direction : float, default 0
+        Gradient direction in units of 90 degrees, as in ``connect_by_gradient``.
+    alpha : float, default 0.5
+        Opacity of the gradient.
+    resolution : tuple of int, optional
+        (width, height) of the shared raster in pixels. Defaults to the
+        figure size in pixels.
+    zorder : float, default -2
+        Drawing order of the image within its overlay axes.
+
+    Returns
+    -------
+    matplotlib.image.AxesImage
+        The shared gradient image.
+    """
+    if not pairs:
+        raise ValueError("pairs must contain at least one pair of axes.")
+    fig = pairs[0][0].figure
+    if resolution is None:
+        resolution = np.round(fig.bbox.size).astype(int)
+    W, H = (max(1, int(e)) for e in resolution)
+
+    # gradient direction, normalized like the 2x2 image of gradient_image
+    phi = direction * np.pi / 2
+    v = np.array([np.cos(phi), np.sin(phi)])
+    corner_max = max(v @ [1, 0], v @ [1, 1], v @ [0, 0], v @ [0, 1])
+    scale = 1 / corner_max if corner_max > 0 else 0.
+
+    values = np.zeros((H, W), dtype=np.float32)
+    inside = np.zeros((H, W), dtype=bool)
+    xs = (np.arange(W) + 0.5) / W
+    ys = 1 - (np.arange(H) + 0.5) / H
+    verts = []
+    for ax1, ax2 in pairs:
+        l1, l2 = (loc1, loc2) if loc1 is not None or loc2 is not None else _estimate_locs(ax1, ax2)
+        pts = _gradient_polygon(ax1, ax2, l1, l2)
+        verts.append(pts)
+        xmin, ymin = pts.min(axis=0)
+        w, h = np.ptp(pts, axis=0)
+        if w == 0 or h == 0:
+            continue
+        cols = np.flatnonzero((xs >= xmin) & (xs <= xmin + w))
+        rows = np.flatnonzero((ys >= ymin) & (ys <= ymin + h))
+        if len(cols) == 0 or len(rows) == 0:
+            continue
+        # the 2x2 image is the sum of a ramp over its rows and one over its
+        # columns, so its bicubic upsampling is the sum of the 1D profiles
+        u = _bicubic_ramp((ys[rows] - ymin) / h)
+        x = _bicubic_ramp((xs[cols] - xmin) / w)
+        values[np.ix_(rows, cols)] = (v[0] * u[:, None] + v[1] * x[None, :]) * scale
+        inside[np.ix_(rows, cols)] = True
+
+    rgba = mpl.colormaps[cmap](values) if isinstance(cmap, str) else cmap(values)
+    rgba[..., 3] = np.where(inside, alpha, 0)
+
+    ax_ = fig.add_axes([0, 0, 1, 1])
+    ax_.set_fc([0, 0, 0, 0])
+    ax_.axis('off')
+    im = ax_.imshow(rgba, extent=[0, 1, 0, 1], aspect='auto', interpolation='bilinear', zorder=zorder)
+    ax_.set_xlim(0, 1)
+    ax_.set_ylim(0, 1)
+
+    codes = np.tile([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], len(verts))
+    compound = np.concatenate([np.vstack([p, p[:1]]) for p in verts])
+    im.set_clip_path(Path(compound, codes), transform=fig.transFigure)
+    return im
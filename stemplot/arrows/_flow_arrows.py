@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from stemplot.patches._utils import _add_rounded_corners
 
@@ -9,6 +10,8 @@ import tempfile
 from pathlib import Path
 from PIL import Image, ImageSequence
 
+from stemplot.io._gif import GifWriter
+
 
 def get_arrow_path(start, end, mode='line', radius=0):
     """
@@ -160,56 +163,264 @@ def get_arrow_head(x, y, head_length, head_width=1.0, clip_curve=True):
 
     return new_x, new_y, head
 
+def _as_flat_curves(curves, offsets=None):
+    if offsets is not None:
+        return np.asarray(curves, dtype=float).reshape(-1, 2), np.asarray(offsets, dtype=np.intp)
+    curves = [np.asarray(c, dtype=float).reshape(-1, 2) for c in curves]
+    offsets = np.concatenate([[0], np.cumsum([len(c) for c in curves])]).astype(np.intp)
+    points = np.concatenate(curves) if curves else np.empty((0, 2))
+    return points, offsets
+
+
+def get_arrow_heads(curves, head_length, head_width=1.0, offsets=None, clip_curve=True):
+    """
+    Construct the arrow heads of many curves at once, see `get_arrow_head`.
+
+    Arc lengths, base positions and head vertices of all curves are computed
+    on one flat vertex buffer.
+
+    Parameters
+    ----------
+    curves : sequence of array-like (N_i, 2), or array-like (N, 2)
+        The curves, or all curves stored back to back if `offsets` is given.
+    head_length : float or array-like, shape (n_curves,)
+        Arrow-head length measured along each curve (in data units).
+    head_width : float or array-like, shape (n_curves,), default 1.0
+        Relative width factor; 1.0 → base width ≈ head_length.
+    offsets : array-like of int, shape (n_curves + 1,), optional
+        Start of every curve in `curves`, followed by N.
+    clip_curve : bool, default True
+        If True, every curve is truncated so it ends at its arrow base.
+
+    Returns
+    -------
+    heads : np.ndarray, shape (n_curves, 3, 2)
+        (tip, left, right) of every head, ready for ``PolyCollection(heads)``.
+    points : np.ndarray, shape (M, 2)
+        Vertices of the (truncated) curves, back to back.
+    offsets : np.ndarray of int, shape (n_curves + 1,)
+        Start of every curve in `points`.
+
+    Examples
+    --------
+    >>> heads, points, offsets = get_arrow_heads(curves, head_length=2)
+    >>> ax.add_collection(LineCollection(np.split(points, offsets[1:-1])))
+    >>> ax.add_collection(PolyCollection(heads))
+    """
+    P, offsets = _as_flat_curves(curves, offsets)
+    start, end = offsets[:-1], offsets[1:]
+    n_curves = len(start)
+    if np.any(end - start < 2):
+        raise ValueError("Need at least two points to define every curve.")
+
+    # segment k joins P[k] and P[k + 1]; segments between two curves get zero length
+    seg_vecs = P[1:] - P[:-1]
+    seg_lens = np.hypot(seg_vecs[:, 0], seg_vecs[:, 1])
+    seg_lens[end[:-1] - 1] = 0
+    cum = np.concatenate(([0.0], np.cumsum(seg_lens)))
+
+    total_len = cum[end - 1] - cum[start]
+    if np.any(total_len == 0):
+        raise ValueError("All points are identical; zero-length curve.")
+    eff_head_len = np.minimum(np.broadcast_to(head_length, (n_curves,)), total_len)
+    s_base = cum[end - 1] - eff_head_len
+
+    i = np.searchsorted(cum, s_base, side="right") - 1
+    i = np.clip(i, start, end - 2)
+    degenerate = seg_lens[i] == 0
+    if degenerate.any():
+        # fall back to the last non-zero segment of the curve
+        seg_idx = np.where(seg_lens > 0, np.arange(len(seg_lens)), -1)
+        last = np.maximum.reduceat(np.append(seg_idx, -1), start)
+        i = np.where(degenerate, last, i)
+
+    t = (s_base - cum[i]) / seg_lens[i]
+    base = P[i] + t[:, None] * seg_vecs[i]
+    tip = P[end - 1]
+
+    dir_vec = tip - base
+    L = np.hypot(dir_vec[:, 0], dir_vec[:, 1])
+    if np.any(L == 0):
+        raise ValueError("Tip and base coincide; cannot define arrow direction.")
+    tangent = dir_vec / L[:, None]
+    perp = np.column_stack([-tangent[:, 1], tangent[:, 0]])
+    half_width = 0.5 * L * np.broadcast_to(head_width, (n_curves,))
+    offset = half_width[:, None] * perp
+    heads = np.stack([tip, base + offset, base - offset], axis=1)
+
+    if not clip_curve:
+        return heads, P.copy(), offsets.copy()
+
+    # keep P[start:i + 1] of every curve and append its base
+    counts = i - start + 2
+    new_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+    curve_id = np.repeat(np.arange(n_curves), end - start)
+    local = np.arange(len(P)) - start[curve_id]
+    keep = local <= (i - start)[curve_id]
+    new_P = np.empty((new_offsets[-1], 2))
+    new_P[new_offsets[:-1][curve_id[keep]] + local[keep]] = P[keep]
+    new_P[new_offsets[1:] - 1] = base
+    return heads, new_P, new_offsets
+
+
 def get_arrow(start, end, radius, head_length, head_width=1.0, mode='line', clip_curve=True):
     x, y = get_arrow_path(start, end, mode=mode, radius=radius)
     x_new, y_new, head = get_arrow_head(x, y, head_length, head_width, clip_curve=clip_curve)
     return x_new, y_new, head
 
 
-def gif_chroma_to_transparent(in_path, out_path, bg_rgb=(255, 0, 255)):
+def _chroma_mask(rgb, bg_rgb, tolerance=0):
+    """
+    True where every channel of `rgb` (..., 3) is within `tolerance` of `bg_rgb`.
+    """
+    rgb = np.asarray(rgb)
+    mask = np.ones(rgb.shape[:-1], dtype=bool)
+    for k in range(3):
+        channel = rgb[..., k]
+        if tolerance == 0:
+            mask &= channel == bg_rgb[k]
+        else:
+            mask &= np.abs(channel.astype(np.int16) - bg_rgb[k]) <= tolerance
+    return mask
+
+
+def _index_rgb(rgb, n_colors=255):
+    """
+    Palette indices and palette of an RGB frame. Frames with at most
+    `n_colors` distinct colors (all rendered diagrams) are indexed exactly,
+    others are quantized.
+    """
+    packed = (rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8) | rgb[..., 2]
+    colors, idx = np.unique(packed, return_inverse=True)
+    if len(colors) <= n_colors:
+        palette = np.stack([colors >> 16, (colors >> 8) & 255, colors & 255], axis=1)
+        return idx.reshape(packed.shape).astype(np.uint8), palette.astype(np.uint8).ravel().tolist()
+    im = Image.fromarray(np.ascontiguousarray(rgb)).quantize(colors=n_colors, method=Image.Quantize.FASTOCTREE)
+    return np.array(im), im.getpalette()[:3 * n_colors]
+
+
+def _chroma_key_frame(frame, bg_rgb, tolerance=0):
+    """
+    Turn the chroma-key color of one frame transparent.
+
+    Returns a P-mode image and the transparent palette index (None if the key
+    color does not occur). Palette frames are keyed on their palette entries
+    only; other frames are indexed to at most 255 colors with index 255
+    reserved for the key.
+    """
+    if frame.mode == 'P':
+        idx = np.array(frame)
+        palette = np.asarray(frame.getpalette(), dtype=np.uint8).reshape(-1, 3)
+        key = _chroma_mask(palette, bg_rgb, tolerance)
+        transparency = frame.info.get('transparency')
+        if isinstance(transparency, int):
+            key[transparency] = True
+        if not key.any():
+            return frame, None
+        t = int(np.argmax(key))
+        idx[key[idx]] = t
+        out = Image.fromarray(idx, mode='P')
+        out.putpalette(palette.ravel().tolist())
+        return out, t
+
+    if frame.mode == 'RGBA':
+        rgba = np.asarray(frame)
+        rgb = rgba[..., :3]
+        mask = _chroma_mask(rgb, bg_rgb, tolerance) | (rgba[..., 3] == 0)
+    else:
+        rgb = np.asarray(frame.convert('RGB'))
+        mask = _chroma_mask(rgb, bg_rgb, tolerance)
+    idx, palette = _index_rgb(rgb)
+    idx[mask] = 255
+    palette = palette + [0] * (3 * 255 - len(palette)) + list(bg_rgb)
+    out = Image.fromarray(idx, mode='P')
+    out.putpalette(palette)
+    return out, 255
+
+
+def gif_chroma_to_transparent(in_path, out_path, bg_rgb=(255, 0, 255), tolerance=0):
     """
     Convert a GIF with a solid background color to a GIF with transparency.
 
+    Frames are keyed with NumPy masks and written one at a time, so only the
+    current frame is held in memory. Palette frames are keyed through their
+    palette entries without touching the pixel colors.
+
     Parameters
     ----------
     in_path : str or Path
         Input GIF with a uniform background (e.g. magenta).
     out_path : str or Path
-        Output GIF with that background turned transparent.
+        Output GIF with that background turned transparent. May be the same
+        file as `in_path`.
     bg_rgb : tuple of (R, G, B)
         Background color to treat as transparent (0–255).
+    tolerance : int, default 0
+        Colors whose channels all differ from `bg_rgb` by at most this much
+        are also made transparent, e.g. to catch anti-aliased edges.
     """
     in_path = Path(in_path)
     out_path = Path(out_path)
 
-    im = Image.open(in_path)
-
-    frames = []
-    r0, g0, b0 = bg_rgb
-
-    for frame in ImageSequence.Iterator(im):
-        fr = frame.convert("RGBA")
-        data = fr.getdata()
-        new_data = []
-        for (r, g, b, a) in data:
-            if (r, g, b) == (r0, g0, b0):
-                new_data.append((r, g, b, 0))   # fully transparent
-            else:
-                new_data.append((r, g, b, a))
-        fr.putdata(new_data)
-        frames.append(fr)
-
-    duration = im.info.get("duration", 50)
-
-    frames[0].save(
-        out_path,
-        format="GIF",
-        save_all=True,
-        append_images=frames[1:],
-        loop=0,
-        duration=duration,
-        disposal=2,   # clear to background between frames
-    )
+    # write next to the output and move into place, so in_path == out_path works
+    fd, tmp_path = tempfile.mkstemp(suffix='.gif', dir=out_path.parent)
+    os.close(fd)
+    try:
+        with Image.open(in_path) as im:
+            default_duration = im.info.get("duration", 50)
+            with GifWriter(tmp_path, duration=default_duration, transparent=True) as writer:
+                for frame in ImageSequence.Iterator(im):
+                    out, t = _chroma_key_frame(frame, bg_rgb, tolerance)
+                    writer.append_indexed(out, transparency=t,
+                                          duration=frame.info.get("duration", default_duration))
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _render_frames(fig, artists, update, frames):
+    """
+    Rasterize an animation with the Agg backend.
+
+    The figure is drawn once without `artists` and that background is
+    cached; for every frame it is restored and only `artists` are drawn on
+    top after calling ``update(frame)``.
+
+    Yields
+    ------
+    np.ndarray, shape (H, W, 4)
+        RGBA frame, uint8.
+    """
+    canvas = fig.canvas
+    animated = [a.get_animated() for a in artists]
+    agg = FigureCanvasAgg(fig)
+    try:
+        for a in artists:
+            a.set_animated(True)
+        agg.draw()
+        background = agg.copy_from_bbox(fig.bbox)
+        for frame in frames:
+            update(frame)
+            agg.restore_region(background)
+            for a in artists:
+                fig.draw_artist(a)
+            yield np.asarray(agg.buffer_rgba()).copy()
+    finally:
+        for a, state in zip(artists, animated):
+            a.set_animated(state)
+        fig.set_canvas(canvas)
+
+
+def _write_gif_frames(path, frames, duration, chroma_rgb=None, tolerance=0):
+    """
+    Write RGBA frames to a GIF, turning `chroma_rgb` transparent if given.
+    """
+    with GifWriter(path, duration=duration, transparent=chroma_rgb is not None) as writer:
+        for frame in frames:
+            if chroma_rgb is not None:
+                frame[_chroma_mask(frame[..., :3], chroma_rgb, tolerance), 3] = 0
+            writer.append(frame)
 
 
 def flow_arrow_animation(
@@ -225,14 +436,18 @@ def flow_arrow_animation(
         save_path=None,
         make_transparent=False,
         chroma_bg_rgb=(255, 0, 255),
+        blit=True,
 ):
     """
     Create a flowing dashed-line animation with an arrow head at the end
     of a given curve.
 
-    If make_transparent=True and save_path is a GIF, this function:
-      1) Renders a normal GIF on a chroma-key background (chroma_bg_rgb).
-      2) Post-processes it so that chroma_bg_rgb becomes transparent.
+    The dash pattern repeats every ``dash_on_length + dash_off_length``
+    frames, so a GIF is written from one rasterized frame per phase: the
+    static figure is drawn once and only the line and head are drawn over
+    it for each phase. If make_transparent=True, the figure is rendered on a
+    chroma-key background (chroma_bg_rgb) which is keyed out of the cached
+    frames before they are written.
 
     Parameters
     ----------
@@ -258,6 +473,9 @@ def flow_arrow_animation(
         If True and save_path is a GIF, post-process to transparent GIF.
     chroma_bg_rgb : tuple of (R, G, B)
         Background color (0–255) used as chroma key when make_transparent=True.
+    blit : bool, optional
+        If True, the interactive animation only redraws the line and head
+        over a cached background.
 
     Returns
     -------
@@ -327,7 +545,7 @@ def flow_arrow_animation(
         frames=np.arange(0, pattern_period),
         init_func=init,
         interval=interval,
-        blit=False,
+        blit=blit,
         repeat=True,
     )
 
@@ -336,9 +554,13 @@ def flow_arrow_animation(
         save_path = Path(save_path)
         fps = max(1, int(1000 / interval))
 
-        is_gif = save_path.suffix.lower() == ".gif"
-        if not (make_transparent and is_gif):
-            # Simple case: no transparency or non-GIF target
+        if save_path.suffix.lower() == ".gif":
+            # one cached raster per phase, keyed and written directly
+            init()
+            frames = _render_frames(fig, [line, arrow_head], update, np.arange(0, pattern_period))
+            _write_gif_frames(save_path, frames, duration=int(round(1000 / fps)),
+                              chroma_rgb=chroma_bg_rgb if make_transparent else None)
+        else:
             ani.save(
                 save_path,
                 writer="pillow",
@@ -348,20 +570,6 @@ def flow_arrow_animation(
                     "facecolor": bg_color,
                 },
             )
-        else:
-            # Transparent GIF: save to temp with chroma background, then post-process
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmp_gif = Path(tmpdir) / "tmp_flow.gif"
-                ani.save(
-                    tmp_gif,
-                    writer="pillow",
-                    fps=fps,
-                    savefig_kwargs={
-                        "transparent": False,
-                        "facecolor": bg_color,
-                    },
-                )
-                gif_chroma_to_transparent(tmp_gif, save_path, bg_rgb=chroma_bg_rgb)
 
     return fig, ax, ani
 
@@ -0,0 +1,6 @@
+from ._driver import run_batch
+from ._driver import PIPELINES
+
+__all__ = ['run_batch',
+           'PIPELINES',
+           ]
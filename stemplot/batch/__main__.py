@@ -0,0 +1,3 @@
+from ._driver import main
+
+main()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..interactive._autocorrelation import estimate_patch_size
+from ..interactive._autocorrelation import load_image
+from ..interactive._labelling import binary_threshold
+from ..interactive._labelling import gmm_relabel
+
+
+# Each pipeline reads one input file and returns (record, labels). Inputs:
+#   patch_size : a 2D image (.npy or any format read by skimage.io.imread)
+#   gmm        : an .npz with 'X' and seed labels 'lbs'
+#   threshold  : an .npz with 'X', 'ps' and seed labels 'lbs'
+
+def _patch_size(path, seed):
+    img = np.asarray(load_image(path), dtype=np.float32)
+    return {'patch_size': estimate_patch_size(img)}, None
+
+
+def _gmm(path, seed):
+    with np.load(path) as data:
+        lbs = gmm_relabel(data['X'], data['lbs'], random_state=seed)
+    return {'n0': int(np.sum(lbs == 0)), 'n1': int(np.sum(lbs == 1))}, lbs
+
+
+def _threshold(path, seed):
+    with np.load(path) as data:
+        lbs, stats = binary_threshold(data['X'], data['ps'], data['lbs'], random_state=seed)
+    stats.update({'n0': int(np.sum(lbs == 0)), 'n1': int(np.sum(lbs == 1))})
+    return stats, lbs
+
+
+PIPELINES = {'patch_size': _patch_size,
+             'gmm': _gmm,
+             'threshold': _threshold,
+             }
+
+
+def _run_one(pipeline, path, out_dir, seed):
+    t0 = time.perf_counter()
+    record, lbs = PIPELINES[pipeline](path, seed)
+    if lbs is not None:
+        lbs_path = out_dir / f'{path.stem}_lbs.npy'
+        np.save(lbs_path, lbs)
+        record['lbs'] = lbs_path.name
+    record.update({'input': str(path), 'seconds': time.perf_counter() - t0})
+    return record
+
+
+def _expand_inputs(inputs, pattern):
+    paths = []
+    for e in inputs:
+        e = pathlib.Path(e)
+        if e.is_dir():
+            paths.extend(sorted(e.glob(pattern)))
+        else:
+            paths.append(e)
+    return paths
+
+
+def run_batch(pipeline, inputs, out_dir, n_jobs=None, seed=0, pattern='*'):
+    """
+    Apply a headless labelling pipeline to many inputs in parallel.
+
+    Every input is processed in a worker process; label arrays are written to
+    ``<out_dir>/<input stem>_lbs.npy`` and one record per input (thresholds,
+    patch sizes, label counts, timing) is collected into
+    ``<out_dir>/summary.json``.
+
+    Parameters
+    ----------
+    pipeline : {'patch_size', 'gmm', 'threshold'}
+        'patch_size' estimates the patch size of 2D images (see
+        `estimate_patch_size`), 'gmm' applies `gmm_relabel` and 'threshold'
+        applies `binary_threshold` to ``.npz`` files holding ``X``, ``lbs``
+        and, for 'threshold', ``ps``.
+    inputs : sequence of str or pathlib.Path
+        Input files, or directories searched with `pattern`.
+    out_dir : str or pathlib.Path
+        Output directory, created if needed.
+    n_jobs : int, optional
+        Number of worker processes. ``1`` runs in the current process.
+    seed : int, default 0
+        Seed of the Gaussian mixtures, so that reruns give identical labels.
+    pattern : str, default '*'
+        Glob pattern used for directory inputs.
+
+    Returns
+    -------
+    records : list of dict
+        One record per input, in input order.
+    """
+    if pipeline not in PIPELINES:
+        raise ValueError(f"Unknown pipeline '{pipeline}', choose from {sorted(PIPELINES)}.")
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = _expand_inputs(inputs, pattern)
+
+    n = len(paths)
+    args = ([pipeline] * n, paths, [out_dir] * n, [seed] * n)
+    if n_jobs == 1:
+        records = list(map(_run_one, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            records = list(executor.map(_run_one, *args))
+
+    with open(out_dir / 'summary.json', 'w') as f:
+        json.dump({'pipeline': pipeline, 'seed': seed, 'records': records}, f, indent=2)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m stemplot.batch',
+        description='Run patch-size, GMM or threshold labelling headless over many inputs.')
+    parser.add_argument('pipeline', choices=sorted(PIPELINES))
+    parser.add_argument('inputs', nargs='+', help='input files or directories')
+    parser.add_argument('-o', '--out', required=True, help='output directory')
+    parser.add_argument('-j', '--n-jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the Gaussian mixtures')
+    parser.add_argument('--pattern', default='*', help='glob pattern for directory inputs')
+    args = parser.parse_args(argv)
+
+    records = run_batch(args.pipeline, args.inputs, args.out, n_jobs=args.n_jobs,
+                        seed=args.seed, pattern=args.pattern)
+    print(f"{len(records)} inputs processed, results in {args.out}")
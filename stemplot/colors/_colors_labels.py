@@ -139,7 +139,7 @@ def colors_from_lbs(
             cmap_obj = plt.get_cmap('tab20')
             rgba_list = [cmap_obj(i) for i in range(n_pos)]
         else:
-            cmap_obj = cm.get_cmap(cmap)
+            cmap_obj = plt.get_cmap(cmap)
             rgba_list = [cmap_obj(i / (n_pos - 1)) for i in range(n_pos)]
     else:
         if len(colors) < n_pos:
@@ -1,21 +1,45 @@
 #from ._interactive_signals import interactive_signals
-from ._data_explorer import DataExplorer
-from ._data_explorer import interactive_data
-from ._data_slicer import imshow
-from ._data_slicer import plot
-from ._data_slicer import scatter
-from ._interactive_layout import InteractiveCluster
-from ._interactive_layout import interactive_clusters
-from ._interactive_spectra import interactive_spectra
-from ._data_labelling import BinaryDataLabelling
-from ._data_labelling import interactive_binary
-from ._interative_GMM import BinaryGMMLabelling
-from ._interative_GMM import interactive_gmm
-from ._interactive_GMM_single import interactive_gmm1
-from ._interactive_patch_size import interactive_patch_size
-from ._interactive_gmm_oversampling import interactive_gmm2
-from ._interactive_t import interactive_t
-from ._interactive_cursor import Cursor
+import importlib
+
+# Public names and the submodule defining them. They are imported on first
+# access, so that the compute-only modules (_autocorrelation, _labelling) can
+# be imported headless, e.g. by stemplot.batch, without matplotlib.pyplot.
+_LAZY = {
+    'DataExplorer': '._data_explorer',
+    'interactive_data': '._data_explorer',
+    'imshow': '._data_slicer',
+    'plot': '._data_slicer',
+    'scatter': '._data_slicer',
+    'InteractiveCluster': '._interactive_layout',
+    'interactive_clusters': '._interactive_layout',
+    'interactive_spectra': '._interactive_spectra',
+    'BinaryDataLabelling': '._data_labelling',
+    'interactive_binary': '._data_labelling',
+    'BinaryGMMLabelling': '._interative_GMM',
+    'interactive_gmm': '._interative_GMM',
+    'interactive_gmm1': '._interactive_GMM_single',
+    'interactive_patch_size': '._interactive_patch_size',
+    'interactive_gmm2': '._interactive_gmm_oversampling',
+    'interactive_t': '._interactive_t',
+    'Cursor': '._interactive_cursor',
+    'PolarTransformer': '._polar',
+    'estimate_patch_size': '._autocorrelation',
+    'estimate_patch_sizes': '._autocorrelation',
+    'DensityImage': '._density_scatter',
+    'stack_contrast_limits': '._contrast',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 
 __all__ = ['interactive_data',
@@ -33,4 +57,9 @@ __all__ = ['interactive_data',
            'interactive_gmm2',
            'interactive_patch_size',
            'Cursor',
+           'PolarTransformer',
+           'estimate_patch_size',
+           'estimate_patch_sizes',
+           'DensityImage',
+           'stack_contrast_limits',
            ]
\ No newline at end of file
@@ -0,0 +1,221 @@
+import pathlib
+import numpy as np
+from functools import lru_cache
+from scipy import fft
+from scipy import sparse
+from scipy.signal import find_peaks
+
+
+def _standardize(imgs):
+    mean = imgs.mean(axis=(-2, -1), keepdims=True)
+    std = imgs.std(axis=(-2, -1), keepdims=True)
+    if np.any(std == 0):
+        raise ValueError("Standard deviation is zero, can't standardize the image.")
+    return (imgs - mean) / std
+
+
+def autocorrelation_fft(imgs, standardize=True, workers=None):
+    """
+    Autocorrelation of one image or a batch of images from a single real FFT.
+
+    The power spectrum ``|rfft2(img)|**2`` is computed once on a zero-padded
+    grid and its inverse gives the linear autocorrelation, cropped like
+    ``scipy.signal.correlate(img, img, mode='same')``.
+
+    Parameters
+    ----------
+    imgs : array-like, shape (H, W) or (N, H, W)
+        Input image(s). float32 input is processed in float32.
+    standardize : bool, default True
+        Standardize each image to zero mean and unit variance first.
+    workers : int, optional
+        Number of workers passed to ``scipy.fft``.
+
+    Returns
+    -------
+    autocorr : np.ndarray, same shape as `imgs`
+        Autocorrelation with zero lag at ``(H // 2, W // 2)``.
+    """
+    imgs = np.asarray(imgs)
+    if imgs.dtype != np.float32:
+        imgs = imgs.astype(np.float64)
+    if standardize:
+        imgs = _standardize(imgs)
+    h, w = imgs.shape[-2:]
+    s = (fft.next_fast_len(2 * h - 1, real=True), fft.next_fast_len(2 * w - 1, real=True))
+
+    f = fft.rfft2(imgs, s=s, workers=workers)
+    power = f.real ** 2 + f.imag ** 2
+    ac = fft.irfft2(power, s=s, workers=workers)
+
+    # lag k is stored at index k mod s; gather lags -h//2 .. h - h//2 - 1
+    rows = (np.arange(h) - h // 2) % s[0]
+    cols = (np.arange(w) - w // 2) % s[1]
+    return ac[..., rows[:, None], cols[None, :]]
+
+
+@lru_cache(maxsize=32)
+def _radial_bins(shape, center):
+    """
+    Linear-binning weights of every pixel onto integer radii, cached per
+    (shape, center). Pixel weight is split between ``floor(r)`` and
+    ``floor(r) + 1`` so that sparsely populated small radii do not produce
+    spurious peaks.
+    """
+    h, w = shape
+    rr, cc = np.ogrid[0:h, 0:w]
+    r = np.hypot(rr - center[0], cc - center[1]).ravel()
+    r0 = np.floor(r).astype(int)
+    frac = r - r0
+    n_bins = r0.max() + 2
+    norm = np.bincount(r0, 1 - frac, minlength=n_bins) + np.bincount(r0 + 1, frac, minlength=n_bins)
+    # the outermost bin only receives fractional weights from the corners
+    n_bins = n_bins - 1
+    pix = np.arange(r.size)
+    keep = r0 + 1 < n_bins
+    rows = np.concatenate([r0, r0[keep] + 1])
+    cols = np.concatenate([pix, pix[keep]])
+    vals = np.concatenate([1 - frac, frac[keep]]) / norm[rows]
+    matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(n_bins, r.size))
+    return r0, frac, norm[:n_bins], matrix
+
+
+def radial_profile(data, center=None):
+    """
+    Mean over integer-radius annuli of one image or a batch of images.
+
+    Each pixel is linearly binned onto its two nearest integer radii with
+    ``np.bincount``; the binning weights are computed once per (shape, center)
+    and cached, so the profile of a batch is a single sparse product.
+
+    Parameters
+    ----------
+    data : array-like, shape (H, W) or (N, H, W)
+        Input image(s).
+    center : tuple of int, optional
+        (row, col) center. Defaults to ``(H // 2, W // 2)``, the zero-lag
+        position of `autocorrelation_fft`.
+
+    Returns
+    -------
+    profile : np.ndarray, shape (R,) or (N, R)
+    """
+    data = np.asarray(data)
+    if data.dtype != np.float32:
+        data = data.astype(np.float64)
+    h, w = data.shape[-2:]
+    if center is None:
+        center = (h // 2, w // 2)
+    r0, frac, norm, matrix = _radial_bins((h, w), tuple(int(e) for e in center))
+    n_bins = len(norm)
+    if data.ndim == 2:
+        v = data.ravel()
+        profile = (np.bincount(r0, v * (1 - frac), minlength=n_bins + 1)
+                   + np.bincount(r0 + 1, v * frac, minlength=n_bins + 1))[:n_bins] / norm
+    else:
+        flat = data.reshape(-1, h * w)
+        profile = (flat @ matrix.T.astype(flat.dtype)).reshape(*data.shape[:-2], n_bins)
+    return profile.astype(data.dtype, copy=False)
+
+
+def _size_from_profile(line):
+    peaks, _ = find_peaks(line)
+    if len(peaks) == 0:
+        return -1
+    return int(peaks[0] * np.sqrt(2))
+
+
+def estimate_patch_sizes(imgs, standardize=True, chunk_size=64, workers=None):
+    """
+    Estimate the patch size of many images from their autocorrelation.
+
+    The first peak of the radial autocorrelation profile (searched within a
+    quarter of the image size) gives the nearest-neighbour distance ``d`` and
+    the patch size is ``int(d * sqrt(2))``, as in `interactive_patch_size`.
+    Same-shape images are processed in batches of `chunk_size`.
+
+    Parameters
+    ----------
+    imgs : array-like, shape (N, H, W), or sequence of 2D arrays
+        Input images; a sequence may mix shapes.
+    standardize : bool, default True
+        Standardize every image before the autocorrelation.
+    chunk_size : int, default 64
+        Number of same-shape images transformed together.
+    workers : int, optional
+        Number of workers passed to ``scipy.fft``.
+
+    Returns
+    -------
+    sizes : np.ndarray of int, shape (N,)
+        Estimated patch sizes, -1 where no peak was found.
+    """
+    imgs = list(imgs) if not isinstance(imgs, np.ndarray) else imgs
+    sizes = np.full(len(imgs), -1, dtype=int)
+
+    groups = {}
+    for i, img in enumerate(imgs):
+        groups.setdefault(np.shape(img), []).append(i)
+
+    for shape, idx in groups.items():
+        n = shape[0] // 4
+        for k in range(0, len(idx), chunk_size):
+            sel = idx[k:k + chunk_size]
+            batch = np.stack([np.asarray(imgs[i]) for i in sel])
+            lines = radial_profile(autocorrelation_fft(batch, standardize, workers))[:, 0:n]
+            sizes[sel] = [_size_from_profile(line) for line in lines]
+    return sizes
+
+
+def estimate_patch_size(img, standardize=True):
+    """
+    Estimate the patch size of a single image, see `estimate_patch_sizes`.
+    """
+    return int(estimate_patch_sizes(np.asarray(img)[None], standardize)[0])
+
+
+def load_image(path):
+    """
+    Load a 2D image from ``.npy`` (memory-mapped) or any format read by
+    ``skimage.io.imread``.
+    """
+    path = pathlib.Path(path)
+    if path.suffix.lower() == '.npy':
+        return np.load(path, mmap_mode='r')
+    from skimage.io import imread
+    return imread(path)
+
+
+def estimate_patch_sizes_from_folder(folder, pattern='*.npy', dtype=np.float32, chunk_size=64, **kwargs):
+    """
+    Estimate patch sizes for every image in a dataset directory.
+
+    Files are loaded `chunk_size` at a time, so only one chunk of images is
+    held in memory.
+
+    Parameters
+    ----------
+    folder : str or pathlib.Path
+        Directory containing the images.
+    pattern : str, default '*.npy'
+        Glob pattern selecting the image files.
+    dtype : dtype, default np.float32
+        Images are cast to this type before the FFT.
+    chunk_size : int, default 64
+        Number of files loaded and transformed together.
+    **kwargs
+        Passed to `estimate_patch_sizes`.
+
+    Returns
+    -------
+    dict
+        Mapping of file name to estimated patch size (-1 if none was found).
+    """
+    files = sorted(pathlib.Path(folder).glob(pattern))
+    results = {}
+    for k in range(0, len(files), chunk_size):
+        chunk = files[k:k + chunk_size]
+        imgs = [np.asarray(load_image(f), dtype=dtype) for f in chunk]
+        sizes = estimate_patch_sizes(imgs, chunk_size=chunk_size, **kwargs)
+        results.update({f.name: int(e) for f, e in zip(chunk, sizes)})
+    return results
@@ -0,0 +1,123 @@
+import numpy as np
+
+
+CONTRAST_MODES = ('global', 'percentile', 'running')
+
+
+def _frame_histogram(frame, n_bins):
+    a = np.asarray(frame, dtype=np.float32).ravel()
+    finite = np.isfinite(a)
+    if not finite.all():
+        a = a[finite]
+    if a.size == 0:
+        return np.zeros(n_bins, dtype=np.int64), 0., 1.
+    counts, edges = np.histogram(a, bins=n_bins, range=(a.min(), a.max()))
+    return counts, edges[0], edges[-1]
+
+
+def _percentiles_from_cumulative(cum, edges, q):
+    """
+    Interpolated percentiles `q` (in %) from cumulative bin counts.
+
+    `cum` and `edges` have shape (N, n_bins + 1), ``cum[:, 0] == 0``.
+    Returns an array of shape (N, len(q)).
+    """
+    out = np.empty((len(cum), len(q)))
+    rows = np.arange(len(cum))
+    for k, p in enumerate(q):
+        t = p / 100. * cum[:, -1]
+        j = np.clip((cum < t[:, None]).sum(axis=1), 1, cum.shape[1] - 1)
+        c0, c1 = cum[rows, j - 1], cum[rows, j]
+        frac = np.divide(t - c0, c1 - c0, out=np.zeros(len(cum)), where=c1 > c0)
+        out[:, k] = edges[rows, j - 1] + frac * (edges[rows, j] - edges[rows, j - 1])
+    return out
+
+
+def stack_contrast_limits(stack, mode='global', percentiles=(1, 99), window=50, n_bins=1024):
+    """
+    Per-frame display limits of an image stack from one streaming pass.
+
+    Every frame is read once and reduced to a histogram over its own range.
+    Percentiles are interpolated from the cumulative histograms; for the
+    'global' and 'running' modes the frame histograms are first resampled
+    onto one common grid and summed, so no frame has to be held in memory.
+
+    Parameters
+    ----------
+    stack : array-like or sequence, shape (N, H, W)
+        Image stack, read one frame at a time with ``stack[i]``.
+    mode : {'global', 'percentile', 'running'}, default 'global'
+        'global' uses the same limits for all frames, 'percentile' computes
+        limits per frame and 'running' pools a window of frames centered on
+        each frame.
+    percentiles : tuple of float, default (1, 99)
+        Lower and upper percentile, in %.
+    window : int, default 50
+        Number of frames pooled in 'running' mode.
+    n_bins : int, default 1024
+        Histogram bins per frame; limits are accurate to about one bin.
+
+    Returns
+    -------
+    clims : np.ndarray, shape (N, 2)
+        (vmin, vmax) of every frame.
+    """
+    if mode not in CONTRAST_MODES:
+        raise ValueError(f"mode must be one of {CONTRAST_MODES}, got {mode!r}.")
+    n = len(stack)
+    counts = np.empty((n, n_bins), dtype=np.int64)
+    lo = np.empty(n)
+    hi = np.empty(n)
+    for i in range(n):
+        counts[i], lo[i], hi[i] = _frame_histogram(stack[i], n_bins)
+
+    cum = np.zeros((n, n_bins + 1))
+    np.cumsum(counts, axis=1, out=cum[:, 1:])
+    edges = np.linspace(lo, hi, n_bins + 1, axis=1)
+    if mode == 'percentile':
+        return _percentiles_from_cumulative(cum, edges, percentiles)
+
+    # resample every cumulative histogram onto a grid shared by all frames
+    grid = np.linspace(lo.min(), hi.max(), n_bins + 1)
+    shared = np.stack([np.interp(grid, e, c) for e, c in zip(edges, cum)])
+    if mode == 'global':
+        total = shared.sum(axis=0, keepdims=True)
+        clim = _percentiles_from_cumulative(total, grid[None], percentiles)
+        return np.repeat(clim, n, axis=0)
+
+    window = max(1, min(window, n))
+    summed = np.zeros((n + 1, n_bins + 1))
+    np.cumsum(shared, axis=0, out=summed[1:])
+    start = np.clip(np.arange(n) - window // 2, 0, n - window)
+    pooled = summed[start + window] - summed[start]
+    return _percentiles_from_cumulative(pooled, np.broadcast_to(grid, pooled.shape), percentiles)
+
+
+class QuantizedStack:
+    """
+    View of an image stack that returns frames as uint8 scaled by fixed
+    per-frame limits, so they can be shown with ``clim=(0, 255)`` and no
+    float normalization at draw time.
+
+    Parameters
+    ----------
+    stack : array-like or sequence, shape (N, H, W)
+        Image stack.
+    clims : np.ndarray, shape (N, 2)
+        (vmin, vmax) of every frame, e.g. from `stack_contrast_limits`.
+    """
+
+    def __init__(self, stack, clims):
+        self.stack = stack
+        self.clims = np.asarray(clims, dtype=float)
+
+    def __len__(self):
+        return len(self.stack)
+
+    def __getitem__(self, i):
+        vmin, vmax = self.clims[i]
+        scale = 255. / (vmax - vmin) if vmax > vmin else 0.
+        frame = np.asarray(self.stack[i], dtype=np.float32)
+        out = (frame - np.float32(vmin)) * np.float32(scale)
+        np.clip(out, 0, 255, out=out)
+        return out.astype(np.uint8)
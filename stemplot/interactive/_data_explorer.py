@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import LassoSelector
 from matplotlib.path import Path
 from ..colors._colors import colors_from_lbs
+from ._density_scatter import cluster_scatter
 
 
 def _update_data(ax, data, plot_type):
@@ -44,7 +45,7 @@ class DataExplorer:
             self.lbs_ = lbs
         self.colors = colors_from_lbs(self.lbs_)
 
-        self.path_collection = self.ax_cluster.scatter(xy[:, 0], xy[:, 1], c=self.colors, **kwargs)
+        self.path_collection = cluster_scatter(self.ax_cluster, xy, self.colors, **kwargs)
         for e in np.unique(self.lbs_):
             x, y = xy[self.lbs_ == e].mean(axis=0)
             self.ax_cluster.text(x, y, s=e, transform=self.ax_cluster.transData)
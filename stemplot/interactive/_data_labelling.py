@@ -15,6 +15,7 @@ from skimage.transform import rotate, warp_polar
 from sklearn.utils import check_random_state
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.decomposition import PCA
+from ._density_scatter import cluster_scatter
 
 
 def normalize(x, low=0., high=1.):
@@ -51,22 +52,6 @@ def _update_mean_patch(ax, p, cmap, clip=True):
         c = plt.Circle((p.shape[0] / 2 - 0.25, p.shape[1] / 2 - 0.25), radius=p.shape[0] / 2, transform=ax.transData)
         ax.images[0].set_clip_path(c)
 
-def _update_color(ax, colors):
-    """
-    Update scatter plot colors.
-    If colors are numerical values, updates colormap.
-    If colors are valid matplotlib color names or RGB tuples, updates facecolor.
-    Raises a ValueError if no scatter plot is found.
-    """
-    if not ax.collections:
-        raise ValueError("No scatter plot found in the given axis.")
-
-    sc = ax.collections[0]  # Get scatter plot object
-    if isinstance(colors, (list, np.ndarray)) and isinstance(colors[0], (int, float)):
-        sc.set_array(np.array(colors))  # Update colormap values
-    else:
-        sc.set_color(colors)  # Update explicit colors
-
 class BinaryDataLabelling:
 
     def __init__(self, fig, X, img, pts, ps, lbs, clip=True, **kwargs):
@@ -84,7 +69,7 @@ class BinaryDataLabelling:
         # use generate_colors_from_lbs, colors_from_lbs will not work, colors_from_lbs will produce rgba array, np.unique function will make it not working
         self.colors = labels_to_colors(self.lbs_)
 
-        self.path_collection = self.ax_cluster.scatter(xy[:, 0], xy[:, 1], c=self.colors, **kwargs)
+        self.path_collection = cluster_scatter(self.ax_cluster, xy, self.colors, **kwargs)
         self.ax_cluster.axis('equal')
         self.ax_img.imshow(img)
         self.ax_img.axis('off')
@@ -135,7 +120,7 @@ class BinaryDataLabelling:
             if self.ind.any(): # seld.ind is NOT empty
                 self.lbs[self.ind] = string_to_number(event.key)
                 # update colors
-                _update_color(self.ax_cluster, labels_to_colors(self.lbs))
+                self.path_collection.set_color(labels_to_colors(self.lbs))
                 self.fig.canvas.draw_idle()
                 print("One cluster has been selected.")
         elif event.key in ["enter",]:
@@ -156,7 +141,7 @@ class BinaryDataLabelling:
             self.lbs[idx[s1 - s0 > 0.5]] = 1
 
             # update colors
-            _update_color(self.ax_cluster, labels_to_colors(self.lbs))
+            self.path_collection.set_color(labels_to_colors(self.lbs))
             self.fig.canvas.draw_idle()
 
 def interactive_binary(xy, img, pts, ps, lbs=None, clip=True, **kwargs):
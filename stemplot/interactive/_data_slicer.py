@@ -1,13 +1,180 @@
+import os
+import pickle
+import threading
 import numpy as np
 import matplotlib.pyplot as plt
+from pathlib import Path
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from matplotlib.backend_bases import TimerBase
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from ._autocorrelation import load_image
+from ..io._gif import GifWriter
+from ._contrast import QuantizedStack
+from ._contrast import stack_contrast_limits
+from ..utils._tiled_image import TILED_THRESHOLD, ax_add_tiled_image
+
+
+class _FileStack:
+    """
+    Sequence of image files, each loaded only when it is indexed.
+    """
+
+    def __init__(self, paths):
+        self.paths = [os.fspath(p) for p in paths]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, i):
+        return load_image(self.paths[i])
+
+
+def _is_path(e):
+    return isinstance(e, (str, os.PathLike))
+
+
+def _as_source(data):
+    """
+    Wrap `data` so that single slices can be read with ``data[i]``.
+
+    Arrays, memmaps and any object with ``__len__`` and ``__getitem__`` are
+    used as they are; sequences of file paths are loaded per slice and plain
+    iterables are materialized.
+    """
+    if isinstance(data, (list, tuple)) and len(data) > 0 and _is_path(data[0]):
+        return _FileStack(data)
+    if hasattr(data, '__getitem__') and hasattr(data, '__len__'):
+        return data
+    return list(data)
+
+
+class _SliceCache:
+    """
+    LRU cache of slices in front of a lazy source, filled on demand and by a
+    single background prefetch thread.
+    """
+
+    def __init__(self, source, maxsize=32):
+        self.source = source
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='DataSlicer')
+
+    def __len__(self):
+        return len(self.source)
+
+    def _load(self, i):
+        arr = self.source[i]
+        # read memmapped slices here, not at draw time
+        if isinstance(arr, np.memmap):
+            return np.array(arr)
+        return np.asarray(arr)
+
+    def _store(self, i, arr):
+        with self._lock:
+            self._cache[i] = arr
+            self._cache.move_to_end(i)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, i):
+        try:
+            arr = self._load(i)
+            self._store(i, arr)
+            return arr
+        finally:
+            with self._lock:
+                self._pending.pop(i, None)
+
+    def __getitem__(self, i):
+        with self._lock:
+            if i in self._cache:
+                self._cache.move_to_end(i)
+                return self._cache[i]
+            future = self._pending.get(i)
+        if future is not None and not future.cancelled():
+            return future.result()
+        arr = self._load(i)
+        self._store(i, arr)
+        return arr
+
+    def prefetch(self, indices):
+        """Load `indices` in the background, dropping queued requests for other slices."""
+        indices = set(indices)
+        with self._lock:
+            for i, future in list(self._pending.items()):
+                if i not in indices and future.cancel():
+                    del self._pending[i]
+            for i in indices:
+                if i not in self._cache and i not in self._pending:
+                    self._pending[i] = self._executor.submit(self._fetch, i)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 class DataSlicer:
-    def __init__(self, ax, data, **kwargs):
+    """
+    Page through a stack of images, lines or point sets with the left/right
+    arrow keys.
+
+    Slices are read lazily, so `data` can be a memmap, a list of file paths or
+    any object with ``__len__`` and ``__getitem__``. Recently shown slices are
+    kept in an LRU cache and the neighbours of the current slice are
+    prefetched on a background thread. While a key is held only the slice
+    artist is redrawn with blitting; a full redraw follows once paging stops.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    data : array-like or sequence
+        Stack of slices, indexed along the first axis.
+    cache_size : int, default 32
+        Number of slices kept in memory.
+    prefetch : int, default 2
+        Number of slices prefetched on either side of the current one.
+    max_samples : int, default 100
+        Number of evenly spaced slices used to find the axis limits of point
+        stacks.
+    contrast : {'global', 'percentile', 'running'}, optional
+        Fixed color limits for image stacks, computed once with
+        `stack_contrast_limits`: one set of limits for the whole stack,
+        per-frame percentiles or percentiles over a running window of frames.
+        By default the limits of the first frame are kept.
+    percentiles : tuple of float, default (1, 99)
+        Percentiles used by `contrast`.
+    window : int, default 50
+        Number of frames pooled by the 'running' contrast mode.
+    quantize : bool, default False
+        With `contrast`, convert frames to uint8 on the prefetch thread so
+        they are drawn without float normalization. The color limits are then
+        (0, 255).
+    **kwargs
+        Passed to the plotting function (``imshow``, ``plot`` or ``scatter``).
+    """
+
+    def __init__(self, ax, data, cache_size=32, prefetch=2, max_samples=100,
+                 contrast=None, percentiles=(1, 99), window=50, quantize=False, **kwargs):
         self.ax = ax
-        self.data = data
+        source = _as_source(data)
+        self.clims = None
+        self.quantize = quantize and contrast is not None
+        if contrast is not None:
+            self.clims = stack_contrast_limits(source, contrast, percentiles, window)
+            if self.quantize:
+                source = QuantizedStack(source, self.clims)
+        self.data = _SliceCache(source, maxsize=cache_size)
         self.kwargs = kwargs
         self.ind = 0
+        self.n_prefetch = prefetch
+        self.max_samples = max_samples
+        self.num_slices = len(self.data)
 
         self.plot_type = self._get_plot_type()
 
@@ -18,9 +185,17 @@ class DataSlicer:
         elif self.plot_type == 'images':
             self._init_images()
 
-        self.num_slices = len(self.data)
         self._update_xlabel()
-        self.cid = self.ax.figure.canvas.mpl_connect('key_press_event', self.press_key)
+
+        canvas = self.ax.figure.canvas
+        self._background = None
+        self._settle_timer = canvas.new_timer(interval=200)
+        self._settle_timer.single_shot = True
+        self._settle_timer.add_callback(self._stop_blitting)
+        self.cid = canvas.mpl_connect('key_press_event', self.press_key)
+        self._cids = [canvas.mpl_connect('draw_event', self._on_draw),
+                      canvas.mpl_connect('close_event', self._on_close)]
+        self._prefetch()
 
     def _get_plot_type(self):
         if self.data[0].ndim == 2 and self.data[0].shape[1] == 2:
@@ -39,17 +214,35 @@ class DataSlicer:
 
     def _init_images(self):
         self.artist = self.ax.imshow(self.data[0], **self.kwargs)
+        if self.quantize:
+            self.artist.set_clim(0, 255)
+        elif self.clims is not None:
+            self.artist.set_clim(*self.clims[0])
+
+    def _sample_indices(self):
+        if self.num_slices <= self.max_samples:
+            return range(self.num_slices)
+        return np.unique(np.linspace(0, self.num_slices - 1, self.max_samples).astype(int))
 
     def _set_limits(self):
-        points_stack = np.vstack(self.data)
-        vmin, vmax = points_stack.min(), points_stack.max()
-        margin = points_stack.ptp() * 0.05
+        # running min/max over (a sample of) the slices instead of stacking them
+        vmin, vmax = np.inf, -np.inf
+        for i in self._sample_indices():
+            points = self.data[i]
+            vmin = min(vmin, points.min())
+            vmax = max(vmax, points.max())
+        margin = (vmax - vmin) * 0.05
         self.ax.set_xlim(vmin - margin, vmax + margin)
         self.ax.set_ylim(vmin - margin, vmax + margin)
 
     def _update_xlabel(self):
         self.ax.set_xlabel(f'slice {self.ind}', fontsize=14)
 
+    def _prefetch(self):
+        n = self.n_prefetch
+        indices = [(self.ind + k) % self.num_slices for k in range(-n, n + 1) if k != 0]
+        self.data.prefetch(indices)
+
     def press_key(self, event):
         if event.key == 'right':
             self.ind = (self.ind + 1) % self.num_slices
@@ -60,32 +253,242 @@ class DataSlicer:
 
         self._update_data()
         self._update_xlabel()
-        self.ax.figure.canvas.draw()
+        self._prefetch()
+        self._blit()
+
+    def _clim(self, i):
+        if self.clims is None or self.quantize:
+            return None
+        return self.clims[i]
 
     def _update_data(self):
-        if self.plot_type == 'images':
-            self.artist.set_data(self.data[self.ind])
-        elif self.plot_type == 'lines':
-            self.artist.set_data(range(len(self.data[self.ind])), self.data[self.ind])
-        elif self.plot_type == 'points':
-            self.artist.set_offsets(self.data[self.ind])
+        _set_slice(self.artist, self.plot_type, self.data[self.ind], self._clim(self.ind))
+
+    def export(self, path, fps=10, n_jobs=None, dpi=None):
+        """
+        Save all slices as an animated GIF or a PNG sequence.
+
+        Frames are rendered in worker processes with the Agg backend; every
+        worker unpickles one copy of the figure and only swaps the slice data
+        and label per frame. Slices are read and frames are written in order
+        with a bounded number of frames in flight, so the stack is never held
+        in memory.
+
+        Parameters
+        ----------
+        path : str or Path
+            '.gif' writes an animated GIF through Pillow; '.png' writes one
+            file per slice named ``<stem>_00000.png`` next to `path`.
+        fps : float, default 10
+            Frame rate of the GIF.
+        n_jobs : int, optional
+            Number of worker processes. Defaults to the number of CPUs; 1
+            renders in the calling process.
+        dpi : float, optional
+            Resolution of the frames. Defaults to the figure dpi.
+
+        Returns
+        -------
+        list of Path
+            Written files.
+        """
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix not in ('.gif', '.png'):
+            raise ValueError(f"Unsupported export format {path.suffix!r}, use '.gif' or '.png'.")
+        n_jobs = n_jobs or os.cpu_count() or 1
+
+        if self.artist.get_animated():
+            self._settle_timer.stop()
+            self._stop_blitting()
+        fig = self.ax.figure
+        children = {'images': self.ax.images, 'lines': self.ax.lines, 'points': self.ax.collections}
+        spec = {'fig': pickle.dumps(fig),
+                'ax_index': fig.axes.index(self.ax),
+                'artist_index': children[self.plot_type].index(self.artist),
+                'plot_type': self.plot_type,
+                'dpi': dpi}
+
+        if suffix == '.gif':
+            targets = [None] * self.num_slices
+            outputs = [path]
+        else:
+            targets = [path.with_name(f'{path.stem}_{i:05d}.png') for i in range(self.num_slices)]
+            outputs = targets
+        tasks = ((i, self.data.source[i], self._clim(i), targets[i]) for i in range(self.num_slices))
+
+        writer = GifWriter(path, duration=int(round(1000 / fps))) if suffix == '.gif' else None
+        try:
+            if n_jobs == 1:
+                _init_export_worker(spec)
+                for task in tasks:
+                    frame = _render_slice(task)
+                    if writer is not None:
+                        writer.append(frame)
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_export_worker,
+                                         initargs=(spec,)) as executor:
+                    pending = deque()
+                    for task in tasks:
+                        pending.append(executor.submit(_render_slice, task))
+                        if len(pending) >= 2 * n_jobs:
+                            frame = pending.popleft().result()
+                            if writer is not None:
+                                writer.append(frame)
+                    while pending:
+                        frame = pending.popleft().result()
+                        if writer is not None:
+                            writer.append(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+        return outputs
+
+    # blitting: while paging, the slice artist and the slice label are left
+    # out of full draws and redrawn on top of a cached background
+    def _overlays(self):
+        z = self.artist.get_zorder()
+        children = [*self.ax.lines, *self.ax.collections, *self.ax.patches, *self.ax.texts,
+                    *self.ax.spines.values()]
+        return [a for a in children if a is not self.artist and a.get_visible() and a.get_zorder() > z]
+
+    def _draw_animated(self):
+        fig = self.ax.figure
+        fig.draw_artist(self.artist)
+        for a in self._overlays():
+            fig.draw_artist(a)
+        label = self.ax.xaxis.label
+        label.set_visible(True)
+        fig.draw_artist(label)
+        label.set_visible(False)
+
+    def _on_draw(self, event):
+        canvas = self.ax.figure.canvas
+        if not self.artist.get_animated() or event.canvas is not canvas:
+            return
+        self._background = canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._draw_animated()
+
+    def _can_blit(self):
+        # blitting is undone by the settle timer, which needs an event loop:
+        # the plain TimerBase of Agg and other non-interactive canvases never
+        # fires, and would leave the artist animated and the label hidden
+        return self.ax.figure.canvas.supports_blit and type(self._settle_timer) is not TimerBase
+
+    def _blit(self):
+        canvas = self.ax.figure.canvas
+        if not self._can_blit():
+            canvas.draw_idle()
+            return
+        if not self.artist.get_animated():
+            self.artist.set_animated(True)
+            self.ax.xaxis.label.set_visible(False)
+            canvas.draw()  # caches the background through _on_draw
+        else:
+            canvas.restore_region(self._background)
+            self._draw_animated()
+        canvas.blit(self.ax.figure.bbox)
+        self._settle_timer.stop()
+        self._settle_timer.start()
+
+    def _stop_blitting(self):
+        self.artist.set_animated(False)
+        self.ax.xaxis.label.set_visible(True)
+        self._background = None
+        self.ax.figure.canvas.draw_idle()
+
+    def _on_close(self, event):
+        self._settle_timer.stop()
+        self.data.close()
+
+
+def _set_slice(artist, plot_type, data, clim=None):
+    if plot_type == 'images':
+        artist.set_data(data)
+        if clim is not None:
+            artist.set_clim(*clim)
+    elif plot_type == 'lines':
+        artist.set_data(range(len(data)), data)
+    elif plot_type == 'points':
+        artist.set_offsets(data)
+
+
+# per-process state of the export workers
+_EXPORT = {}
+
+
+def _init_export_worker(spec):
+    fig = pickle.loads(spec['fig'])
+    canvas = FigureCanvasAgg(fig)
+    if spec['dpi'] is not None:
+        fig.set_dpi(spec['dpi'])
+    ax = fig.axes[spec['ax_index']]
+    plot_type = spec['plot_type']
+    children = {'images': ax.images, 'lines': ax.lines, 'points': ax.collections}
+    artist = children[plot_type][spec['artist_index']]
+    # the figure may have been pickled while DataSlicer was blitting
+    artist.set_animated(False)
+    ax.xaxis.label.set_visible(True)
+    _EXPORT.update(canvas=canvas, ax=ax, artist=artist, plot_type=plot_type)
+
+
+def _render_slice(task):
+    i, data, clim, target = task
+    _set_slice(_EXPORT['artist'], _EXPORT['plot_type'], np.asarray(data), clim)
+    _EXPORT['ax'].set_xlabel(f'slice {i}', fontsize=14)
+    canvas = _EXPORT['canvas']
+    canvas.draw()
+    frame = np.asarray(canvas.buffer_rgba())[..., :3].copy()
+    if target is None:
+        return frame
+    Image.fromarray(frame).save(target, compress_level=1)
+    return None
+
+
+def _stack_shape(imgs):
+    """
+    Shape of `imgs` reading at most its first element, or None if it is not
+    known without loading it (file paths, iterables without a length).
+    """
+    if hasattr(imgs, 'shape'):
+        return tuple(imgs.shape)
+    if isinstance(imgs, (list, tuple)) and len(imgs) > 0 and _is_path(imgs[0]):
+        return None
+    if hasattr(imgs, '__len__') and hasattr(imgs, '__getitem__'):
+        if len(imgs) == 0:
+            return (0,)
+        return (len(imgs),) + np.shape(imgs[0])
+    if hasattr(imgs, '__iter__'):
+        return None
+    raise TypeError(f"Expected an array, a sequence of images or of file paths, got {type(imgs).__name__}.")
 
 
 def imshow(imgs, ax=None, **kwargs):
     ax = ax or plt.subplots(figsize=(7.2, 7.2))[1]
-    imgs = np.asarray(imgs)
 
     # Extract custom kwargs before passing to matplotlib
     hvlines = kwargs.pop('hvlines', False)
 
-    shape = imgs.shape
-    if len(shape) == 3 and shape[2] != 3:
+    # memmaps, path lists and other lazy stacks are paged through without
+    # converting the whole stack to an array; generators are collected by
+    # DataSlicer
+    shape = _stack_shape(imgs)
+    if shape is None or (len(shape) == 3 and shape[2] != 3):
         im = DataSlicer(ax, imgs, **kwargs)
+        if shape is None:
+            shape = im.data[0].shape
+        else:
+            shape = shape[1:]
+    elif len(shape) >= 2 and shape[0] * shape[1] > TILED_THRESHOLD:
+        # a single gigapixel image (e.g. a stitched montage) is drawn in tiles
+        im = ax_add_tiled_image(ax, imgs, **kwargs)
     else:
+        imgs = np.asarray(imgs)
+        shape = imgs.shape
         im = ax.imshow(imgs.squeeze(), **kwargs)
 
     if hvlines:
-        h, w = imgs.shape[:2]
+        h, w = shape[:2]
         ax.axhline(h / 2, color='r')
         ax.axvline(w / 2, color='r')
 
@@ -103,4 +506,4 @@ def scatter(points, ax=None, **kwargs):
     ax = ax or plt.subplots(figsize=(7.2, 7.2))[1]
     points = np.asarray(points)  # Consistency with imshow
     sc = DataSlicer(ax, points, **kwargs)
-    return sc
\ No newline at end of file
+    return sc
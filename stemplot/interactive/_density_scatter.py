@@ -0,0 +1,196 @@
+import numpy as np
+import matplotlib.colors as mc
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox, TransformedBbox
+
+
+# Above this number of points the explorers render the cluster panel as a
+# density image instead of one marker per point.
+DENSITY_THRESHOLD = 200_000
+
+
+def _color_codes(colors, n):
+    """
+    Split per-point colors into (codes, rgba) with one RGBA row per unique color.
+    """
+    if isinstance(colors, str) or (np.ndim(colors) == 1 and len(colors) != n
+                                   and mc.is_color_like(tuple(colors))):
+        return np.zeros(n, dtype=np.intp), np.atleast_2d(mc.to_rgba(colors))
+    colors = np.asarray(colors)
+    if colors.dtype.kind in 'UOS':
+        uniq, codes = np.unique(colors, return_inverse=True)
+    else:
+        uniq, codes = np.unique(colors, axis=0, return_inverse=True)
+    rgba = np.array([mc.to_rgba(c) for c in uniq])
+    return codes.ravel().astype(np.intp), rgba
+
+
+class DensityImage(AxesImage):
+    """
+    Image artist that rasterizes a large point set at the axes' pixel resolution.
+
+    Points are binned per color (the equivalent of one ``np.histogram2d`` per
+    label, done with a single ``np.bincount`` on a combined (label, pixel)
+    index) and the per-label counts are blended into one RGBA image. Changing
+    the view limits marks the image as stale and it is re-rasterized for the
+    new view on the next draw, so zooming reveals full detail.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    xy : np.ndarray, shape (N, 2)
+        Point coordinates.
+    colors : color or sequence of colors
+        A single color or one color per point.
+    spread : int, default 0
+        Grow every occupied pixel by this many pixels, like a marker size.
+    min_alpha : float, default 0.3
+        Opacity of pixels holding a single point; opacity grows
+        logarithmically with the count up to 1.
+    **kwargs
+        Passed to `matplotlib.image.AxesImage` (e.g. zorder, alpha).
+    """
+
+    def __init__(self, ax, xy, colors, spread=0, min_alpha=0.3, **kwargs):
+        kwargs.setdefault('interpolation', 'nearest')
+        kwargs.setdefault('origin', 'lower')
+        super().__init__(ax, **kwargs)
+        self.xy = np.asarray(xy, dtype=float)
+        self.spread = spread
+        self.min_alpha = min_alpha
+        self._codes, self._rgba = _color_codes(colors, len(self.xy))
+        self._view = None
+        self._dirty = True
+
+        x0, y0 = self.xy.min(axis=0)
+        x1, y1 = self.xy.max(axis=0)
+        self._data_extent = self._view_extent = (x0, x1, y0, y1)
+        self.set_data(np.zeros((1, 1, 4), dtype=np.float32))
+
+        self._cids = [ax.callbacks.connect('xlim_changed', self._on_lims_changed),
+                      ax.callbacks.connect('ylim_changed', self._on_lims_changed)]
+
+    def get_extent(self):
+        # all the points, whatever view was rasterized, so that ax.relim()
+        # and autoscaling do not shrink the data limits to a zoomed window
+        return self._data_extent
+
+    def make_image(self, renderer, magnification=1.0, unsampled=False):
+        # the raster covers the view it was made for
+        x0, x1, y0, y1 = self._view_extent
+        bbox = Bbox.from_extents(x0, y0, x1, y1)
+        clip = ((self.get_clip_box() or self.axes.bbox) if self.get_clip_on()
+                else self.get_figure(root=True).bbox)
+        return self._make_image(self._A, bbox, TransformedBbox(bbox, self.get_transform()), clip,
+                                magnification, unsampled=unsampled)
+
+    def _on_lims_changed(self, ax):
+        self._dirty = True
+        self.stale = True
+
+    def set_color(self, colors):
+        """Recolor the points; same call signature as PathCollection.set_color."""
+        self._codes, self._rgba = _color_codes(colors, len(self.xy))
+        self._dirty = True
+        self.stale = True
+
+    set_facecolor = set_color
+    set_facecolors = set_color
+
+    def rasterize(self):
+        """Rebuild the RGBA image for the current view and axes size."""
+        ax = self.axes
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        w = max(1, int(round(ax.bbox.width)))
+        h = max(1, int(round(ax.bbox.height)))
+
+        fx = (self.xy[:, 0] - x0) / (x1 - x0)
+        fy = (self.xy[:, 1] - y0) / (y1 - y0)
+        inside = (fx >= 0) & (fx < 1) & (fy >= 0) & (fy < 1)
+        ix = (fx[inside] * w).astype(np.intp)
+        iy = (fy[inside] * h).astype(np.intp)
+        n_labels = len(self._rgba)
+        idx = self._codes[inside] * (h * w) + iy * w + ix
+        counts = np.bincount(idx, minlength=n_labels * h * w).reshape(n_labels, h, w).astype(np.float32)
+
+        if self.spread > 0:
+            from scipy.ndimage import maximum_filter
+            size = (1, 2 * self.spread + 1, 2 * self.spread + 1)
+            counts = maximum_filter(counts, size=size)
+
+        total = counts.sum(axis=0)
+        occupied = total > 0
+        rgba = np.zeros((h, w, 4), dtype=np.float32)
+        # count-weighted mean color of all labels falling in each pixel
+        blended = np.tensordot(counts, self._rgba.astype(np.float32), axes=(0, 0))
+        rgba[occupied] = blended[occupied] / total[occupied, None]
+        if occupied.any():
+            scale = np.log1p(total[occupied]) / np.log1p(total.max())
+            rgba[occupied, 3] *= self.min_alpha + (1 - self.min_alpha) * scale
+
+        self._view_extent = (x0, x1, y0, y1)
+        self._view = (x0, x1, y0, y1, w, h)
+        self.set_data(rgba)
+        self._dirty = False
+
+    def draw(self, renderer):
+        ax = self.axes
+        view = (*ax.get_xlim(), *ax.get_ylim(),
+                max(1, int(round(ax.bbox.width))), max(1, int(round(ax.bbox.height))))
+        if self._dirty or view != self._view:
+            self.rasterize()
+        super().draw(renderer)
+
+    def remove(self):
+        for cid in self._cids:
+            self.axes.callbacks.disconnect(cid)
+        super().remove()
+
+
+def ax_add_density_scatter(ax, xy, colors, **kwargs):
+    """
+    Add a `DensityImage` of the points `xy` to `ax` and fit the data limits.
+    """
+    im = DensityImage(ax, xy, colors, **kwargs)
+    ax.add_image(im)
+    x0, x1, y0, y1 = im.get_extent()
+    ax.update_datalim([(x0, y0), (x1, y1)])
+    ax.autoscale_view()
+    return im
+
+
+def cluster_scatter(ax, xy, c, density=None, threshold=DENSITY_THRESHOLD, **kwargs):
+    """
+    Scatter the points of a cluster panel, switching to density rendering for
+    large point sets.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    xy : np.ndarray, shape (N, 2)
+        Point coordinates.
+    c : color or sequence of colors
+        A single color or one color per point.
+    density : bool, optional
+        Force (True) or disable (False) density rendering. By default density
+        rendering is used when there are more than `threshold` points.
+    threshold : int, default DENSITY_THRESHOLD
+        Point count above which density rendering is used.
+    **kwargs
+        Passed to ``ax.scatter``. In density mode only 'alpha' and 'zorder'
+        are used.
+
+    Returns
+    -------
+    PathCollection or DensityImage
+        Both support ``set_color(colors)`` for recoloring.
+    """
+    if density is None:
+        density = len(xy) > threshold
+    if not density:
+        return ax.scatter(xy[:, 0], xy[:, 1], c=c, **kwargs)
+    image_kwargs = {k: kwargs[k] for k in ('alpha', 'zorder') if k in kwargs}
+    return ax_add_density_scatter(ax, xy, c, **image_kwargs)
@@ -12,14 +12,17 @@ from ..colors._colormaps import color_palette
 
 #from skimage.feature import register_translation
 from skimage.registration import phase_cross_correlation
-from skimage.morphology import disk
-from skimage.transform import rotate, warp_polar
+from skimage.transform import rotate
 from sklearn.utils import check_random_state
 
+from ._polar import get_polar_transformer
+from ._registration import register_imgs_batch
+from ._density_scatter import cluster_scatter
+
 def get_angle(img1, img2):
-    mask = disk(img1.shape[0]//2)
-    img1_rot = warp_polar(img1*mask)
-    img2_rot = warp_polar(img2*mask)
+    # cached polar weights, masked like warp_polar(img * disk(img.shape[0]//2))
+    pt = get_polar_transformer(img1.shape, mask_radius=img1.shape[0]//2)
+    img1_rot, img2_rot = pt.transform(np.stack([img1, img2]))
     shifts, error, phasediff = phase_cross_correlation(img1_rot, img2_rot, upsample_factor=20)
     return shifts[0]
 
@@ -31,12 +34,35 @@ def _register_imgs(imgs):
         ref = (ref*(i+1) + img_rot)/(i+2)
     return ref
 
-def register_imgs(imgs, max_samples=15, seed=48):
+def register_imgs(imgs, max_samples=200, seed=48, method='batch', n_jobs=None):
+    """
+    Rotationally register patches and return their mean.
+
+    Parameters
+    ----------
+    imgs : np.ndarray, shape (N, H, W)
+        Patches to register.
+    max_samples : int, default 200
+        Patches are randomly subsampled to at most this number.
+    seed : int, default 48
+        Seed of the subsampling.
+    method : {'batch', 'sequential'}, default 'batch'
+        'batch' aligns all patches at once with `register_imgs_batch`;
+        'sequential' aligns them one by one against a running mean with
+        ``phase_cross_correlation`` (slow, only practical for ~15 patches).
+    n_jobs : int, optional
+        Number of threads used by the batch method.
+    """
     if len(imgs) > max_samples:
         rng = check_random_state(seed=seed)
         mask = rng.choice(len(imgs), max_samples, replace=False)
         imgs = imgs[mask]
-    return _register_imgs(imgs)
+    if method == 'batch':
+        return register_imgs_batch(imgs, n_jobs=n_jobs)
+    elif method == 'sequential':
+        return _register_imgs(imgs)
+    else:
+        raise ValueError("method must be 'batch' or 'sequential'.")
 
 
 def _update_pts(ax, pts, **kwargs):
@@ -59,7 +85,7 @@ def _update_mean_patch(ax, p, cmap, clip=True):
 
 class InteractiveCluster:
 
-    def __init__(self, fig, X, img, pts, ps, lbs, clip=True, max_samples=15, rotate=False, **kwargs):
+    def __init__(self, fig, X, img, pts, ps, lbs, clip=True, max_samples=200, rotate=False, **kwargs):
         self.fig = fig
         self.ax_img = fig.axes[0]
         self.ax_cluster = fig.axes[1]
@@ -74,7 +100,7 @@ class InteractiveCluster:
         # convert to hex color
         self.colors = to_hex(colors)
 
-        self.path_collection = self.ax_cluster.scatter(X[:, 0], X[:, 1], c=self.colors, **kwargs)
+        self.path_collection = cluster_scatter(self.ax_cluster, X, self.colors, **kwargs)
         for e in np.unique(self.lbs_):
             x, y = X[self.lbs_ == e].mean(axis=0)
             self.ax_cluster.text(x, y, s=e, transform=self.ax_cluster.transData)
@@ -134,7 +160,7 @@ class InteractiveCluster:
                 print("One cluster has been selected.")
 
 
-def interactive_clusters(X, img, pts, ps, lbs=None, clip=True, max_samples=15, rotate=False, **kwargs):
+def interactive_clusters(X, img, pts, ps, lbs=None, clip=True, max_samples=200, rotate=False, **kwargs):
     fig, ax = plt.subplots(1, 3, figsize=(12, 4))
     app = InteractiveCluster(fig, X, img, pts, ps, lbs, clip, max_samples, rotate, **kwargs)
     return app
@@ -1,45 +1,15 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.signal import correlate, find_peaks
-from skimage.transform import warp_polar
+from scipy.signal import find_peaks
 from skimage.filters import gaussian
 from skimage.feature import peak_local_max
 
+from ._autocorrelation import autocorrelation_fft
+from ._autocorrelation import radial_profile
 
-def standardize_image(image):
-    """
-    Standardize the image to have mean 0 and standard deviation 1.
-
-    Parameters:
-    image : numpy array
-        The input 2D image.
-
-    Returns:
-    standardized_image : numpy array
-        The standardized 2D image.
-    """
-    mean = np.mean(image)
-    std = np.std(image)
-
-    if std == 0:
-        raise ValueError("Standard deviation is zero, can't standardize the image.")
-
-    standardized_image = (image - mean) / std
-    return standardized_image
-
-def autocorrelation(image, mode='same', method='fft', standardize=True):
-    # standardize the image
-    if standardize is True:
-        image = standardize_image(image)
-    return correlate(image, image, mode=mode, method=method)
-
-def radial_profile(data):
-    i, j = np.unravel_index(np.argmax(data), shape=data.shape)
-    line = warp_polar(data, center=(i, j)).mean(axis=0)[0:i]
-    return line
 
 def get_profile(image, standardize=True):
-    autocorr = autocorrelation(image=image, standardize=standardize)
+    autocorr = autocorrelation_fft(image, standardize=standardize)
     line_profile = radial_profile(autocorr)
     return line_profile
 
@@ -68,8 +38,9 @@ class InteractivePatchSize:
         self.img = img
         imgf = gaussian(img, sigma=3)
         x, y = locate_one_point(imgf)
-        self.img_corr = autocorrelation(img)
-        self.line = get_profile(img)[0:len(img)//4]
+        # one FFT for both the displayed autocorrelation and its radial profile
+        self.img_corr = autocorrelation_fft(img)
+        self.line = radial_profile(self.img_corr)[0:len(img)//4]
 
         peaks, _ = find_peaks(self.line)
 
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import LassoSelector
 from matplotlib.path import Path
 from ..colors._colors import colors_from_lbs
+from ._density_scatter import cluster_scatter
 
 
 def _update_data(ax, data):
@@ -43,7 +44,7 @@ class SpectraExplorer:
 
         self.ax_img.imshow(self.img)
 
-        self.path_collection = self.ax_xy.scatter(self.xy[:, 0], self.xy[:, 1], c=self.colors, **kwargs)
+        self.path_collection = cluster_scatter(self.ax_xy, self.xy, self.colors, **kwargs)
         for e in np.unique(self.lbs_):
             x, y = self.xy[self.lbs_ == e].mean(axis=0)
             self.ax_xy.text(x, y, s=e, transform=self.ax_xy.transData)
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 from sklearn.decomposition import PCA
+from ._density_scatter import cluster_scatter
 
 def pca(data, n_components=2):
     aa = PCA(n_components=n_components)
@@ -31,10 +32,10 @@ class InteractiveThreshold:
         self.lbs   = self.data > self.t   # Boolean mask: True → class1, False → class0
 
         # 5) scatter colored by initial lbs
-        scatter_colors = ['C1' if flag else 'C0' for flag in self.lbs]
-        self.scatter = self.ax_cluster.scatter(
-            self.xy[:, 0], self.xy[:, 1],
-            c=scatter_colors,
+        scatter_colors = np.where(self.lbs, 'C1', 'C0')
+        self.scatter = cluster_scatter(
+            self.ax_cluster, self.xy,
+            scatter_colors,
             s=5,
             edgecolor='none',
             **kwargs
@@ -123,7 +124,7 @@ class InteractiveThreshold:
         self.vline.set_xdata([self.t])
 
         # 3) recolor scatter
-        new_colors = ['C1' if flag else 'C0' for flag in self.lbs]
+        new_colors = np.where(self.lbs, 'C1', 'C0')
         self.scatter.set_facecolors(new_colors)
 
         # 4) redraw class-mean images
@@ -17,6 +17,9 @@ from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.decomposition import PCA
 from sklearn.mixture import GaussianMixture
 
+from ._labelling import gmm_relabel
+from ._density_scatter import cluster_scatter
+
 def normalize(x, low=0., high=1.):
     return (x - x.min())/(x.max() - x.min())
 def string_to_number(input_str):
@@ -51,22 +54,6 @@ def _update_mean_patch(ax, p, cmap, clip=True):
         c = plt.Circle((p.shape[0] / 2 - 0.25, p.shape[1] / 2 - 0.25), radius=p.shape[0] / 2, transform=ax.transData)
         ax.images[0].set_clip_path(c)
 
-def _update_color(ax, colors):
-    """
-    Update scatter plot colors.
-    If colors are numerical values, updates colormap.
-    If colors are valid matplotlib color names or RGB tuples, updates facecolor.
-    Raises a ValueError if no scatter plot is found.
-    """
-    if not ax.collections:
-        raise ValueError("No scatter plot found in the given axis.")
-
-    sc = ax.collections[0]  # Get scatter plot object
-    if isinstance(colors, (list, np.ndarray)) and isinstance(colors[0], (int, float)):
-        sc.set_array(np.array(colors))  # Update colormap values
-    else:
-        sc.set_color(colors)  # Update explicit colors
-
 class BinaryGMMLabelling:
 
     def __init__(self, fig, X, img, pts, ps, lbs, clip=True, **kwargs):
@@ -84,7 +71,7 @@ class BinaryGMMLabelling:
         # use generate_colors_from_lbs, colors_from_lbs will not work, colors_from_lbs will produce rgba array, np.unique function will make it not working
         self.colors = labels_to_colors(self.lbs_)
 
-        self.path_collection = self.ax_cluster.scatter(xy[:, 0], xy[:, 1], c=self.colors, **kwargs)
+        self.path_collection = cluster_scatter(self.ax_cluster, xy, self.colors, **kwargs)
         self.ax_cluster.axis('equal')
         self.ax_img.imshow(img)
         self.ax_img.axis('off')
@@ -138,22 +125,11 @@ class BinaryGMMLabelling:
             if self.ind.size != 0: # seld.ind is NOT empty
                 self.lbs[self.ind] = string_to_number(event.key)
                 # update colors
-                _update_color(self.ax_cluster, labels_to_colors(self.lbs))
+                self.path_collection.set_color(labels_to_colors(self.lbs))
                 self.fig.canvas.draw_idle()
                 print("One cluster has been selected.")
         elif event.key in ["enter",]:
-
-            mask0 = self.lbs == 0
-            mask1 = self.lbs == 1
-
-            X0 = self.X[mask0]
-            X1 = self.X[mask1]
-            gmm0 = GaussianMixture(n_components=1, random_state=None).fit(X0)
-            gmm1 = GaussianMixture(n_components=1, random_state=None).fit(X1)
-            log_prob_0 = gmm0.score_samples(self.X)
-            log_prob_1 = gmm1.score_samples(self.X)
-            self.lbs[log_prob_0 >= log_prob_1] = 0
-            self.lbs[log_prob_0 < log_prob_1] = 1
+            self.lbs = gmm_relabel(self.X, self.lbs)
 
 
 def interactive_gmm(X, img, pts, ps, lbs=None, clip=True, **kwargs):
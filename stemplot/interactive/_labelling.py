@@ -0,0 +1,108 @@
+import numpy as np
+from sklearn.mixture import GaussianMixture
+
+
+# Pure compute versions of the decisions taken by the interactive labelling
+# tools. Nothing here depends on matplotlib, so the same results can be
+# reproduced headless (see stemplot.batch).
+
+
+def gmm_relabel(X, lbs, random_state=None):
+    """
+    Relabel all samples with two single-component Gaussian mixtures.
+
+    One Gaussian is fitted to the samples labelled 0 and one to the samples
+    labelled 1; every sample then gets the label of the more likely Gaussian.
+    This is what pressing Enter does in `interactive_gmm`.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (n_samples, n_features)
+        Features.
+    lbs : array-like, shape (n_samples,)
+        Seed labels, 0 and 1 for the two classes, -1 for unlabelled samples.
+    random_state : int, optional
+        Seed of the Gaussian mixtures.
+
+    Returns
+    -------
+    lbs : np.ndarray, shape (n_samples,)
+        New labels (0 or 1 for every sample).
+    """
+    X = np.asarray(X)
+    lbs = np.array(lbs)
+    mask0 = lbs == 0
+    mask1 = lbs == 1
+    if not mask0.any() or not mask1.any():
+        raise ValueError("Both classes 0 and 1 need at least one labelled sample.")
+
+    gmm0 = GaussianMixture(n_components=1, random_state=random_state).fit(X[mask0])
+    gmm1 = GaussianMixture(n_components=1, random_state=random_state).fit(X[mask1])
+    log_prob_0 = gmm0.score_samples(X)
+    log_prob_1 = gmm1.score_samples(X)
+    lbs[log_prob_0 >= log_prob_1] = 0
+    lbs[log_prob_0 < log_prob_1] = 1
+    return lbs
+
+
+def binary_threshold(X, ps, lbs, random_state=None):
+    """
+    Intensity threshold separating two classes of patches.
+
+    The seed labels are first propagated with `gmm_relabel`. The mean
+    intensity of the central 3x3 pixels of every patch is then thresholded at
+    a point weighted by the spread of both classes, and samples are relabelled
+    by that threshold. This is what pressing Enter does in `BinaryThreshold`
+    (`stemplot.interactive._interactive_threshold`).
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (n_samples, n_features)
+        Features used for the GMM step.
+    ps : np.ndarray, shape (n_samples, H, W)
+        Patches.
+    lbs : array-like, shape (n_samples,)
+        Seed labels, 0 and 1 for the two classes, -1 for unlabelled samples.
+    random_state : int, optional
+        Seed of the Gaussian mixtures.
+
+    Returns
+    -------
+    lbs : np.ndarray, shape (n_samples,)
+        Thresholded labels.
+    stats : dict
+        'threshold' (the applied threshold), 'threshold_mean' (unweighted
+        alternative), 'v0_mean', 'v1_mean', 'v0_std' and 'v1_std'.
+    """
+    ps = np.asarray(ps)
+    lbs = np.array(lbs)
+    mask0 = lbs == 0
+    mask1 = lbs == 1
+
+    lbs = gmm_relabel(X, lbs, random_state=random_state)
+
+    ps0 = ps[lbs == 0]
+    ps1 = ps[lbs == 1]
+    size = ps0.shape[1]//2
+    v = ps[:, size-1:size+2, size-1:size+2].mean(axis=(1, 2))
+    v0 = ps0[:, size-1:size+2, size-1:size+2].mean(axis=(1, 2))
+    v1 = ps1[:, size-1:size+2, size-1:size+2].mean(axis=(1, 2))
+    v0_mean = v0.mean()
+    v1_mean = v1.mean()
+    # the spread is measured on the seed labels, before GMM relabelling
+    v0_std = np.std(v[mask0])
+    v1_std = np.std(v[mask1])
+
+    bg = 2*v1_mean - v0_mean
+    t_mean = ((v0_mean - bg) + (v1_mean - bg)) / 2.
+    t = (v1_std * (v0_mean - bg) + v0_std * (v1_mean - bg)) / (v0_std + v1_std)
+    lbs[v > t] = 0
+    lbs[v < t] = 1
+
+    stats = {'threshold': float(t),
+             'threshold_mean': float(t_mean),
+             'v0_mean': float(v0_mean),
+             'v1_mean': float(v1_mean),
+             'v0_std': float(v0_std),
+             'v1_std': float(v1_std)}
+    return lbs, stats
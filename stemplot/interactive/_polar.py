@@ -0,0 +1,130 @@
+import numpy as np
+from functools import lru_cache
+from scipy import sparse
+
+
+class PolarTransformer:
+    """
+    Reusable linear polar transform with precomputed bilinear weights.
+
+    The sampling grid follows ``skimage.transform.warp_polar`` (``order=1``,
+    ``mode='constant'``, ``cval=0``): rows of the output are angles in
+    ``[0, 2*pi)`` and columns are radii in ``[0, radius)``. The coordinates and
+    interpolation weights are computed once and stored as a sparse matrix, so
+    transforming a batch of same-shape images is a single sparse product.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape (H, W) of the input images.
+    center : tuple of float, optional
+        (row, col) center of the transform. Defaults to the image center.
+    radius : float, optional
+        Radius of the transformed disk. Defaults to half the image diagonal.
+    output_shape : tuple of int, optional
+        (n_angles, n_radii) of the output. Defaults to ``(360, ceil(radius))``.
+    mask_radius : float, optional
+        If given, pixels further than `mask_radius` from the image center are
+        treated as zero, like multiplying the input by
+        ``skimage.morphology.disk(mask_radius)`` before warping.
+
+    Examples
+    --------
+    >>> pt = PolarTransformer(ps.shape[1:], mask_radius=ps.shape[1] // 2)
+    >>> polar = pt.transform(ps)   # (N, 360, n_radii)
+    """
+
+    def __init__(self, shape, center=None, radius=None, output_shape=None, mask_radius=None):
+        h, w = shape
+        if center is None:
+            center = (h / 2 - 0.5, w / 2 - 0.5)
+        if radius is None:
+            radius = np.sqrt((h / 2) ** 2 + (w / 2) ** 2)
+        if output_shape is None:
+            output_shape = (360, int(np.ceil(radius)))
+
+        self.shape = (int(h), int(w))
+        self.center = tuple(float(e) for e in center)
+        self.radius = float(radius)
+        self.output_shape = tuple(int(e) for e in output_shape)
+        self.mask_radius = mask_radius
+        self.matrix = self._build_matrix()
+
+    def _build_matrix(self):
+        h, w = self.shape
+        n_angles, n_radii = self.output_shape
+        angle = np.arange(n_angles) * 2 * np.pi / n_angles
+        r = np.arange(n_radii) * self.radius / n_radii
+        rr = (r[None, :] * np.sin(angle)[:, None] + self.center[0]).ravel()
+        cc = (r[None, :] * np.cos(angle)[:, None] + self.center[1]).ravel()
+
+        r0 = np.floor(rr).astype(int)
+        c0 = np.floor(cc).astype(int)
+        fr = rr - r0
+        fc = cc - c0
+        out_idx = np.arange(rr.size)
+
+        rows, cols, weights = [], [], []
+        for dr, dc, wgt in ((0, 0, (1 - fr) * (1 - fc)),
+                            (0, 1, (1 - fr) * fc),
+                            (1, 0, fr * (1 - fc)),
+                            (1, 1, fr * fc)):
+            ri = r0 + dr
+            ci = c0 + dc
+            valid = (ri >= 0) & (ri < h) & (ci >= 0) & (ci < w) & (wgt > 0)
+            if self.mask_radius is not None:
+                valid &= ((ri - (h - 1) / 2) ** 2 + (ci - (w - 1) / 2) ** 2) <= self.mask_radius ** 2
+            rows.append(out_idx[valid])
+            cols.append(ri[valid] * w + ci[valid])
+            weights.append(wgt[valid])
+
+        matrix = sparse.csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+                                   shape=(rr.size, h * w))
+        return matrix
+
+    def transform(self, imgs):
+        """
+        Polar-warp a single image (H, W) or a batch (N, H, W).
+
+        float32 input stays float32, everything else is computed in float64.
+        """
+        imgs = np.asarray(imgs)
+        if imgs.shape[-2:] != self.shape:
+            raise ValueError(f"Expected images of shape {self.shape}, got {imgs.shape[-2:]}.")
+        dtype = np.float32 if imgs.dtype == np.float32 else np.float64
+        flat = imgs.reshape(-1, self.shape[0] * self.shape[1]).astype(dtype, copy=False)
+        out = (flat @ self.matrix.T.astype(dtype)).reshape(-1, *self.output_shape)
+        if imgs.ndim == 2:
+            return out[0]
+        return out
+
+    __call__ = transform
+
+
+@lru_cache(maxsize=32)
+def _cached_transformer(shape, center, radius, output_shape, mask_radius):
+    return PolarTransformer(shape, center, radius, output_shape, mask_radius)
+
+
+def get_polar_transformer(shape, center=None, radius=None, output_shape=None, mask_radius=None):
+    """
+    Return a cached `PolarTransformer` for the given geometry.
+
+    Transformers are keyed on (shape, center, radius, output_shape,
+    mask_radius), so repeated calls on same-shape inputs reuse the same
+    precomputed weights.
+    """
+    if center is not None:
+        center = tuple(float(e) for e in center)
+    if output_shape is not None:
+        output_shape = tuple(int(e) for e in output_shape)
+    return _cached_transformer(tuple(int(e) for e in shape), center, radius, output_shape, mask_radius)
+
+
+def warp_polar(img, center=None, radius=None, output_shape=None, mask_radius=None):
+    """
+    Drop-in replacement for ``skimage.transform.warp_polar`` on 2D images that
+    reuses cached sampling weights.
+    """
+    pt = get_polar_transformer(np.shape(img)[-2:], center, radius, output_shape, mask_radius)
+    return pt.transform(img)
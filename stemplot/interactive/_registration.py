@@ -0,0 +1,182 @@
+import numpy as np
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from scipy import ndimage as ndi
+
+from ._polar import get_polar_transformer
+
+
+@lru_cache(maxsize=16)
+def _rotation_grid(shape):
+    """
+    Pixel offsets from the patch center, cached per patch shape.
+    """
+    h, w = shape
+    rr, cc = np.mgrid[0:h, 0:w].astype(float)
+    rr -= (h - 1) / 2
+    cc -= (w - 1) / 2
+    grid = np.stack([rr.ravel(), cc.ravel()])
+    grid.setflags(write=False)
+    return grid
+
+
+def _map_chunks(func, chunks, n_jobs):
+    if n_jobs == 1 or len(chunks) == 1:
+        return [func(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(func, chunks))
+
+
+def _chunk_slices(n, n_jobs):
+    n_chunks = max(1, min(n, n_jobs if n_jobs is not None else 4))
+    bounds = np.linspace(0, n, n_chunks + 1).astype(int)
+    return [slice(i, j) for i, j in zip(bounds[:-1], bounds[1:]) if j > i]
+
+
+def warp_polar_batch(imgs, n_angles=360, n_radii=None, n_jobs=None):
+    """
+    Polar-warp a stack of equally sized patches in one go.
+
+    Parameters
+    ----------
+    imgs : array-like, shape (N, H, W)
+        Stack of patches.
+    n_angles : int, default 360
+        Number of angular samples (rows of each polar image).
+    n_radii : int, optional
+        Number of radial samples. Defaults to ``H // 2``.
+    n_jobs : int, optional
+        Number of threads used for the interpolation.
+
+    Returns
+    -------
+    polar : np.ndarray, shape (N, n_angles, n_radii)
+        Bilinearly interpolated polar images of the disk-masked patches.
+    """
+    imgs = np.asarray(imgs, dtype=float)
+    n, h, w = imgs.shape
+    if n_radii is None:
+        n_radii = max(1, h // 2)
+    # the disk mask matches skimage.morphology.disk(h // 2) used by get_angle
+    pt = get_polar_transformer((h, w), radius=h // 2, output_shape=(n_angles, n_radii), mask_radius=h // 2)
+    return np.concatenate(_map_chunks(lambda s: pt.transform(imgs[s]), _chunk_slices(n, n_jobs), n_jobs))
+
+
+def angular_shifts(polar, polar_ref):
+    """
+    Estimate the rotation of every polar image relative to a reference.
+
+    The angular cross-correlation is computed with a 1D FFT along the angle
+    axis for the whole batch and accumulated over all radii. The integer peak
+    is refined with a parabolic fit on its circular neighbours.
+
+    Parameters
+    ----------
+    polar : np.ndarray, shape (N, n_angles, n_radii)
+        Polar images, e.g. from `warp_polar_batch`.
+    polar_ref : np.ndarray, shape (n_angles, n_radii)
+        Polar image of the reference.
+
+    Returns
+    -------
+    angles : np.ndarray, shape (N,)
+        Rotation angles in degrees that align each image with the reference
+        when passed to `rotate_batch`.
+    """
+    n_angles = polar.shape[1]
+    # remove the per-radius mean so the DC term does not dominate the peak
+    polar = polar - polar.mean(axis=1, keepdims=True)
+    polar_ref = polar_ref - polar_ref.mean(axis=0, keepdims=True)
+    f = np.fft.rfft(polar, axis=1)
+    f_ref = np.fft.rfft(polar_ref, axis=0)
+    cross = (f * np.conj(f_ref)[None]).sum(axis=2)
+    corr = np.fft.irfft(cross, n=n_angles, axis=1)
+
+    k = np.argmax(corr, axis=1)
+    idx = np.arange(len(corr))
+    c0 = corr[idx, k]
+    cm = corr[idx, (k - 1) % n_angles]
+    cp = corr[idx, (k + 1) % n_angles]
+    denom = cm - 2 * c0 + cp
+    valid = np.abs(denom) > 1e-12
+    delta = np.zeros_like(c0)
+    delta[valid] = 0.5 * (cm[valid] - cp[valid]) / denom[valid]
+
+    shift = k + delta
+    shift = np.where(shift > n_angles / 2, shift - n_angles, shift)
+    return shift * 360. / n_angles
+
+
+def rotate_batch(imgs, angles, n_jobs=None):
+    """
+    Rotate a stack of patches about their centers with bilinear interpolation.
+
+    Equivalent to calling ``skimage.transform.rotate(img, angle, order=1)`` per
+    patch, but the centered pixel grid is cached per shape and the work is
+    split across a thread pool.
+
+    Parameters
+    ----------
+    imgs : array-like, shape (N, H, W)
+        Stack of patches.
+    angles : array-like, shape (N,)
+        Counter-clockwise rotation angles in degrees.
+    n_jobs : int, optional
+        Number of threads.
+
+    Returns
+    -------
+    rotated : np.ndarray, shape (N, H, W)
+    """
+    imgs = np.asarray(imgs, dtype=float)
+    angles = np.deg2rad(np.asarray(angles, dtype=float))
+    n, h, w = imgs.shape
+    grid = _rotation_grid((h, w))
+    cos, sin = np.cos(angles), np.sin(angles)
+
+    def _rotate(s):
+        out = np.empty((s.stop - s.start, h * w))
+        for i, (img, c, si) in enumerate(zip(imgs[s], cos[s], sin[s])):
+            rr = c * grid[0] + si * grid[1] + (h - 1) / 2
+            cc = -si * grid[0] + c * grid[1] + (w - 1) / 2
+            out[i] = ndi.map_coordinates(img, [rr, cc], order=1, mode='constant', cval=0.)
+        return out
+
+    rotated = np.concatenate(_map_chunks(_rotate, _chunk_slices(n, n_jobs), n_jobs))
+    return rotated.reshape(n, h, w)
+
+
+def register_imgs_batch(imgs, n_iter=2, n_angles=360, n_jobs=None):
+    """
+    Rotationally register a stack of patches and return their mean.
+
+    All patches are polar-warped once. Each iteration aligns the whole batch
+    against the current mean with a single FFT-based angular correlation and
+    then rotates every patch in parallel; the rotated mean becomes the next
+    reference.
+
+    Parameters
+    ----------
+    imgs : array-like, shape (N, H, W)
+        Stack of patches. The first patch is the initial reference.
+    n_iter : int, default 2
+        Number of align-and-average passes.
+    n_angles : int, default 360
+        Angular sampling of the polar transform.
+    n_jobs : int, optional
+        Number of threads used for warping and rotation.
+
+    Returns
+    -------
+    mean : np.ndarray, shape (H, W)
+        Rotationally registered mean patch.
+    """
+    imgs = np.asarray(imgs, dtype=float)
+    polar = warp_polar_batch(imgs, n_angles=n_angles, n_jobs=n_jobs)
+    ref = imgs[0]
+    polar_ref = polar[0]
+    for _ in range(max(1, n_iter)):
+        angles = angular_shifts(polar, polar_ref)
+        ref = rotate_batch(imgs, angles, n_jobs=n_jobs).mean(axis=0)
+        polar_ref = warp_polar_batch(ref[None], n_angles=n_angles)[0]
+    return ref
@@ -1,7 +1,9 @@
 from ._files import get_cwd
 from ._files import find_folders
+from ._gif import GifWriter
 
 
 __all__ = ['get_cwd',
            'find_folders',
+           'GifWriter',
            ]
\ No newline at end of file
@@ -0,0 +1,129 @@
+import numpy as np
+from pathlib import Path
+from PIL import Image
+from PIL import GifImagePlugin
+
+
+class GifWriter:
+    """
+    Write an animated GIF one frame at a time.
+
+    The palette is fitted to the first frame and reused for every later
+    frame, so each frame is quantized and written to disk as soon as it is
+    appended; no frame is kept in memory. `append_indexed` writes palette
+    images unchanged with their own palette, skipping quantization.
+
+    Parameters
+    ----------
+    path : str or Path
+        Output file.
+    duration : int, default 100
+        Frame duration in milliseconds.
+    loop : int, default 0
+        Number of loops, 0 loops forever.
+    transparent : bool, default False
+        Reserve palette index 255 for transparency. Pixels of RGBA frames with
+        zero alpha are written transparent and every frame is cleared before
+        the next one is drawn.
+
+    Examples
+    --------
+    >>> with GifWriter('stack.gif', duration=50) as writer:
+    ...     for frame in frames:
+    ...         writer.append(frame)
+    """
+
+    def __init__(self, path, duration=100, loop=0, transparent=False):
+        self.path = Path(path)
+        self.duration = duration
+        self.loop = loop
+        self.transparent = transparent
+        self._fp = open(self.path, 'wb')
+        self._palette = None
+        self.n_frames = 0
+
+    def _to_palette(self, frame):
+        if isinstance(frame, Image.Image):
+            frame = np.asarray(frame.convert('RGBA'))
+        frame = np.asarray(frame, dtype=np.uint8)
+        if frame.ndim == 2:
+            frame = np.repeat(frame[..., None], 3, axis=2)
+        rgb = Image.fromarray(np.ascontiguousarray(frame[..., :3]))
+        n_colors = 255 if self.transparent else 256
+        if self._palette is None:
+            im = rgb.quantize(colors=n_colors, method=Image.Quantize.MEDIANCUT)
+            palette = im.getpalette()[:3 * n_colors]
+            palette += [0] * (768 - len(palette))
+            self._palette = Image.new('P', (1, 1))
+            self._palette.putpalette(palette)
+        else:
+            im = rgb.quantize(palette=self._palette, dither=Image.Dither.NONE)
+        if self.transparent and frame.shape[-1] == 4:
+            idx = np.asarray(im).copy()
+            idx[frame[..., 3] == 0] = 255
+            im = Image.fromarray(idx, mode='P')
+            im.putpalette(self._palette.getpalette())
+        return im
+
+    def append(self, frame, duration=None):
+        """
+        Quantize and write one frame.
+
+        Parameters
+        ----------
+        frame : PIL.Image.Image or np.ndarray
+            RGB or RGBA image, uint8 arrays of shape (H, W, 3) or (H, W, 4).
+        duration : int, optional
+            Duration of this frame in milliseconds, defaults to `duration`.
+        """
+        im = self._to_palette(frame)
+        self._write(im, 255 if self.transparent else None, duration)
+
+    def append_indexed(self, im, transparency=None, duration=None):
+        """
+        Write a P-mode frame as is, with its own palette.
+
+        Parameters
+        ----------
+        im : PIL.Image.Image
+            Palette image. Its palette is written as the local color table
+            of the frame (the first frame's palette becomes the global one).
+        transparency : int, optional
+            Palette index drawn transparent in this frame.
+        duration : int, optional
+            Duration of this frame in milliseconds, defaults to `duration`.
+        """
+        if im.mode != 'P':
+            raise ValueError(f"Expected a P-mode image, got mode {im.mode!r}.")
+        self._write(im, transparency, duration, local_palette=True)
+
+    def _write(self, im, transparency=None, duration=None, local_palette=False):
+        params = {'duration': self.duration if duration is None else duration}
+        if transparency is not None:
+            params['transparency'] = transparency
+        if self.transparent:
+            params['disposal'] = 2
+        if self.n_frames == 0:
+            info = {'loop': self.loop, 'duration': params['duration']}
+            if self.transparent:
+                info['transparency'] = 255 if transparency is None else transparency
+            header, _ = GifImagePlugin.getheader(im, info=info)
+            for block in header:
+                self._fp.write(block)
+        elif local_palette:
+            params['include_color_table'] = True
+        for block in GifImagePlugin.getdata(im, **params):
+            self._fp.write(block)
+        self.n_frames += 1
+
+    def close(self):
+        if self._fp.closed:
+            return
+        self._fp.write(b';')
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,6 +3,8 @@ from ._polygon import create_hollow_ellipse
 from ._polygon import create_hollow_ellipse_half
 from ._polygon import create_beam
 from ._polygon import plot_beam
+from ._gradient import GradientImage
+from ._gradient import ax_add_gradient_polygons
 
 from ._fancybox import fig_add_fancybox
 from ._fancybox import ax_add_fancybox
@@ -13,6 +15,8 @@ __all__ = ['ax_add_gradient_polygon',
            'create_hollow_ellipse_half',
            'create_beam',
            'plot_beam',
+           'GradientImage',
+           'ax_add_gradient_polygons',
            'fig_add_fancybox',
            'ax_add_fancybox',
            'ax2fancybox',
@@ -0,0 +1,227 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from functools import lru_cache
+from matplotlib.image import AxesImage
+from matplotlib.path import Path
+
+
+@lru_cache(maxsize=64)
+def _unit_ramp(resolution, angle):
+    """
+    Linear gradient over the unit square sampled on a `resolution` x `resolution`
+    grid (row 0 at the bottom), normalized to [0, 1]. Cached and read-only.
+    """
+    t = np.linspace(0, 1, resolution, dtype=np.float32)
+    angle_rad = np.deg2rad(angle)
+    c, s = np.float32(np.cos(angle_rad)), np.float32(np.sin(angle_rad))
+    ramp = c * t[None, :] + s * t[:, None]
+    lo, hi = ramp.min(), ramp.max()
+    ramp = (ramp - lo) / (hi - lo) if hi > lo else np.zeros_like(ramp)
+    ramp.setflags(write=False)
+    return ramp
+
+
+def _alpha_from_ramp(ramp, alpha):
+    """Alpha channel for `ramp`: 1, a constant, or a (start, end) ramp."""
+    if alpha is None:
+        return np.float32(1)
+    if isinstance(alpha, (list, tuple, np.ndarray)) and len(alpha) == 2:
+        a0, a1 = np.float32(alpha[0]), np.float32(alpha[1])
+        return a0 + (a1 - a0) * ramp
+    return np.float32(alpha)
+
+
+def _closed_vertices(vertices):
+    vertices = np.asarray(vertices, dtype=float)
+    if not np.array_equal(vertices[0], vertices[-1]):
+        vertices = np.vstack([vertices, vertices[0]])
+    return vertices
+
+
+class GradientImage(AxesImage):
+    """
+    One image artist holding the gradient fills of many polygons.
+
+    Each polygon's linear gradient is sampled from a cached unit ramp into a
+    shared float32 RGBA raster that covers the visible part of all polygons
+    at the axes' pixel resolution; the raster is clipped by the compound path
+    of all polygons. Overlapping polygons are alpha-composited in the order
+    they were added. The raster is rebuilt when polygons are added or the
+    view changes.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    **kwargs
+        Passed to `matplotlib.image.AxesImage` (e.g. zorder).
+    """
+
+    def __init__(self, ax, **kwargs):
+        kwargs.setdefault('origin', 'lower')
+        super().__init__(ax, **kwargs)
+        self._shapes = []
+        self._bounds = None
+        self._view = None
+        self._view_extent = (0, 1, 0, 1)
+        self.set_data(np.zeros((1, 1, 4), dtype=np.float32))
+
+    def get_extent(self):
+        return self._view_extent
+
+    def add_polygon(self, vertices, angle, cmap, resolution=100, alpha=None):
+        """
+        Add a gradient-filled polygon.
+
+        Parameters
+        ----------
+        vertices : array-like, shape (N, 2)
+            Polygon vertices in data coordinates.
+        angle : float
+            Angle of the gradient in degrees.
+        cmap : str or Colormap
+            Colormap of the gradient.
+        resolution : int, default 100
+            Resolution of the gradient ramp across the polygon's bounding box.
+        alpha : None, float or (start, end), optional
+            Constant opacity or an opacity ramp following the gradient.
+        """
+        vertices = _closed_vertices(vertices)
+        (x0, y0), (x1, y1) = vertices.min(axis=0), vertices.max(axis=0)
+        codes = [Path.MOVETO] + [Path.LINETO] * (len(vertices) - 2) + [Path.CLOSEPOLY]
+        self._shapes.append((Path(vertices, codes), (x0, x1, y0, y1), angle,
+                             plt.get_cmap(cmap), int(resolution), alpha))
+
+        b = self._bounds
+        self._bounds = (x0, x1, y0, y1) if b is None else \
+            (min(b[0], x0), max(b[1], x1), min(b[2], y0), max(b[3], y1))
+        self._view = None
+        self.set_clip_path(Path.make_compound_path(*[s[0] for s in self._shapes]),
+                           transform=self.axes.transData)
+        self.stale = True
+
+    @property
+    def bounds(self):
+        """(xmin, xmax, ymin, ymax) of all polygons."""
+        return self._bounds
+
+    def rasterize(self, view):
+        """Rebuild the RGBA raster for `view` = (x0, x1, y0, y1, width, height)."""
+        vx0, vx1, vy0, vy1, w, h = view
+        xs = vx0 + (np.arange(w, dtype=np.float32) + 0.5) * np.float32((vx1 - vx0) / w)
+        ys = vy0 + (np.arange(h, dtype=np.float32) + 0.5) * np.float32((vy1 - vy0) / h)
+        # premultiplied colors, composited shape after shape
+        rgba = np.zeros((h, w, 4), dtype=np.float32)
+
+        for path, (x0, x1, y0, y1), angle, cmap, res, alpha in self._shapes:
+            if x1 <= x0 or y1 <= y0:
+                continue
+            cols = np.flatnonzero((xs >= x0) & (xs <= x1))
+            rows = np.flatnonzero((ys >= y0) & (ys <= y1))
+            if len(cols) == 0 or len(rows) == 0:
+                continue
+            ramp = _unit_ramp(res, angle)
+            j = np.minimum(((xs[cols] - x0) / (x1 - x0) * res).astype(np.intp), res - 1)
+            i = np.minimum(((ys[rows] - y0) / (y1 - y0) * res).astype(np.intp), res - 1)
+            values = ramp[np.ix_(i, j)]
+            src = cmap(values).astype(np.float32)
+            src[..., 3] *= _alpha_from_ramp(values, alpha)
+            src[..., :3] *= src[..., 3:]
+
+            gx, gy = np.meshgrid(xs[cols], ys[rows])
+            inside = path.contains_points(np.column_stack([gx.ravel(), gy.ravel()])).reshape(gx.shape)
+            block = rgba[np.ix_(rows, cols)]
+            # pixels straddling the polygon edge only show through the
+            # antialiased clip path; give them the color of the polygon
+            fringe = ~inside & (block[..., 3] == 0)
+            block[inside] = src[inside] + block[inside] * (1 - src[inside, 3:])
+            block[fringe] = src[fringe]
+            rgba[np.ix_(rows, cols)] = block
+
+        a = rgba[..., 3:]
+        np.divide(rgba[..., :3], a, out=rgba[..., :3], where=a > 0)
+        self._view_extent = (vx0, vx1, vy0, vy1)
+        self._view = view
+        self.set_data(rgba)
+
+    def _current_view(self):
+        ax = self.axes
+        bx0, bx1, by0, by1 = self._bounds
+        xlim, ylim = sorted(ax.get_xlim()), sorted(ax.get_ylim())
+        x0, x1 = max(bx0, xlim[0]), min(bx1, xlim[1])
+        y0, y1 = max(by0, ylim[0]), min(by1, ylim[1])
+        if x1 <= x0 or y1 <= y0:
+            return None
+        w = max(1, int(np.ceil(ax.bbox.width * (x1 - x0) / (xlim[1] - xlim[0]))))
+        h = max(1, int(np.ceil(ax.bbox.height * (y1 - y0) / (ylim[1] - ylim[0]))))
+        return x0, x1, y0, y1, w, h
+
+    def draw(self, renderer):
+        if self._bounds is None:
+            return
+        view = self._current_view()
+        if view is None:
+            return
+        if view != self._view:
+            self.rasterize(view)
+        super().draw(renderer)
+
+
+def ax_gradient_image(ax, **kwargs):
+    """
+    Return the shared `GradientImage` of `ax`, adding one if needed.
+
+    `kwargs` are only used when the image is created. They must be image
+    properties: the polygons of the shared image have no patch of their own,
+    so patch properties such as edgecolor raise a ValueError.
+    """
+    unknown = [k for k in kwargs if not hasattr(GradientImage, f'set_{k}')]
+    if unknown:
+        raise ValueError(f"The shared GradientImage does not accept {', '.join(map(repr, unknown))}; "
+                         f"pass image properties such as zorder.")
+    for im in ax.images:
+        if isinstance(im, GradientImage):
+            return im
+    im = GradientImage(ax, **kwargs)
+    ax.add_image(im)
+    return im
+
+
+def ax_add_gradient_polygons(ax, polygons, angle=90, cmap='viridis', resolution=100, alpha=None, **kwargs):
+    """
+    Add many gradient-filled polygons to `ax`, drawn as a single image.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    polygons : sequence of array-like, shape (N_i, 2)
+        Polygon vertices.
+    angle : float or sequence of float, default 90
+        Gradient angle in degrees, one value or one per polygon.
+    cmap : str, Colormap or sequence of them, default 'viridis'
+        Colormap, one or one per polygon.
+    resolution : int, default 100
+        Resolution of the gradient ramps.
+    alpha : None, float or (start, end), optional
+        Opacity of all polygons, see `GradientImage.add_polygon`.
+    **kwargs
+        Passed to `GradientImage` when the shared image is created.
+
+    Returns
+    -------
+    GradientImage
+    """
+    n = len(polygons)
+    angles = np.broadcast_to(angle, (n,))
+    cmaps = [cmap] * n if isinstance(cmap, str) or not np.iterable(cmap) else list(cmap)
+    if len(cmaps) != n:
+        raise ValueError(f"Expected 1 or {n} colormaps, got {len(cmaps)}.")
+
+    im = ax_gradient_image(ax, **kwargs)
+    for vertices, a, c in zip(polygons, angles, cmaps):
+        im.add_polygon(vertices, a, c, resolution=resolution, alpha=alpha)
+    x0, x1, y0, y1 = im.bounds
+    ax.update_datalim([(x0, y0), (x1, y1)])
+    ax.autoscale_view()
+    return im
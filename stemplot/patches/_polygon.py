@@ -2,8 +2,10 @@ import numpy as np
 import matplotlib.patches as patches
 from matplotlib.path import Path
 
+from ._gradient import _unit_ramp, _alpha_from_ramp, _closed_vertices, ax_add_gradient_polygons
 
-def ax_add_gradient_polygon(ax, vertices, angle, cmap, resolution=100, alpha=None, **kwargs):
+
+def ax_add_gradient_polygon(ax, vertices, angle, cmap, resolution=100, alpha=None, shared=False, **kwargs):
     """
     Add a gradient-filled polygon to a Matplotlib axis with an optional alpha gradient that follows the gradient angle.
 
@@ -14,39 +16,26 @@ def ax_add_gradient_polygon(ax, vertices, angle, cmap, resolution=100, alpha=Non
     - cmap: The colormap of the gradient.
     - resolution: The resolution of the gradient meshgrid.
     - alpha: None, float in [0, 1], or array-like with two values for alpha gradient.
+    - shared: If True, draw the polygon into the axes' shared GradientImage, so many
+      polygons render as one image; **kwargs are then only used if that image is created,
+      and must be image properties (e.g. zorder): patch properties such as edgecolor
+      raise a ValueError.
     - **kwargs: Additional keyword arguments for patch customization.
     """
+    if shared:
+        return ax_add_gradient_polygons(ax, [vertices], angle=angle, cmap=cmap, resolution=resolution,
+                                        alpha=alpha, **kwargs)
+
     # Ensure vertices form a closed loop by appending the first vertex if necessary.
-    vertices = np.vstack([vertices, vertices[0]]) if not np.array_equal(vertices[0], vertices[-1]) else vertices
+    vertices = _closed_vertices(vertices)
 
     # Determine the bounding box of the vertices.
     min_x, min_y = np.min(vertices, axis=0)
     max_x, max_y = np.max(vertices, axis=0)
 
-    # Create a meshgrid for the gradient.
-    x = np.linspace(min_x, max_x, resolution)
-    y = np.linspace(min_y, max_y, resolution)
-    X, Y = np.meshgrid(x, y)
-
-    # Calculate the gradient.
-    angle_rad = np.deg2rad(angle)
-    gradient = np.cos(angle_rad) * (X - min_x) / (max_x - min_x) + np.sin(angle_rad) * (Y - min_y) / (max_y - min_y)
-
-    # Normalize the gradient to [0, 1].
-    gradient = (gradient - gradient.min()) / (gradient.max() - gradient.min())
-
-    if alpha is None:
-        alpha = 1  # Default alpha value.
-    elif isinstance(alpha, (list, tuple, np.ndarray)) and len(alpha) == 2:
-        # Create an alpha gradient that follows the specified angle.
-        # Calculate the alpha values across the gradient direction.
-        alpha_values = np.linspace(alpha[0], alpha[1], resolution)
-        alpha_gradient = np.cos(angle_rad) * (X - min_x) / (max_x - min_x) + np.sin(angle_rad) * (Y - min_y) / (
-                    max_y - min_y)
-        alpha_gradient = (alpha_gradient - alpha_gradient.min()) / (alpha_gradient.max() - alpha_gradient.min())
-        alpha = np.interp(alpha_gradient, (alpha_gradient.min(), alpha_gradient.max()), (alpha[0], alpha[1]))
-    # Ensure alpha is applied as intended.
-    kwargs['alpha'] = alpha
+    # The gradient over the bounding box, normalized to [0, 1]; the alpha ramp follows it.
+    gradient = _unit_ramp(resolution, angle)
+    kwargs['alpha'] = _alpha_from_ramp(gradient, alpha)
 
     # Create a Path for the polygon.
     codes = [Path.MOVETO] + [Path.LINETO] * (len(vertices) - 2) + [Path.CLOSEPOLY]
@@ -57,8 +46,9 @@ def ax_add_gradient_polygon(ax, vertices, angle, cmap, resolution=100, alpha=Non
     ax.add_patch(patch)
 
     # Display the gradient and clip it with the polygon.
-    ax.imshow(gradient, extent=(min_x, max_x, min_y, max_y), cmap=cmap, origin='lower', **kwargs)
-    ax.images[-1].set_clip_path(patch)
+    im = ax.imshow(gradient, extent=(min_x, max_x, min_y, max_y), cmap=cmap, origin='lower', **kwargs)
+    im.set_clip_path(patch)
+    return im
 
 
 def create_hollow_ellipse_half(center, width, height, ratio=0.5, half='upper', **kwargs):
@@ -211,4 +201,4 @@ def plot_beam(ax, p1, p2, p3, cmap, **kwargs):
     # create pathpatch for beam
     patch = create_beam(p1, p2, p3)
     vertices = patch._path.vertices
-    ax_add_gradient_polygon(ax, vertices=vertices, angle=90, cmap=cmap, **kwargs)
\ No newline at end of file
+    return ax_add_gradient_polygon(ax, vertices=vertices, angle=90, cmap=cmap, **kwargs)
\ No newline at end of file
@@ -1,6 +1,79 @@
 import numpy as np
 
 
+# quadratic Bezier weights of the 20 samples used for every rounded corner
+_BEZIER_T = np.linspace(0, 1, 20)
+_BEZIER_W = np.stack([(1 - _BEZIER_T) ** 2, 2 * (1 - _BEZIER_T) * _BEZIER_T, _BEZIER_T ** 2])
+
+
+def _add_rounded_corners_batch(points, offsets, radius, closed=False):
+    """
+    Round the corners of many polylines at once.
+
+    The polylines are stored back to back in one vertex buffer; polyline
+    ``i`` is ``points[offsets[i]:offsets[i + 1]]``. Corner tangents, clamped
+    radii and Bezier samples are computed for all vertices together.
+
+    Parameters
+    ----------
+    points : array-like, shape (N, 2)
+        Vertices of all polylines.
+    offsets : array-like of int, shape (n_lines + 1,)
+        Start of every polyline in `points`, followed by N.
+    radius : float or array-like, shape (n_lines,)
+        Corner rounding radius, one value or one per polyline.
+    closed : bool, optional
+        If True, treat every polyline as a closed polygon. If False (default),
+        start and end points are preserved unchanged.
+
+    Returns
+    -------
+    points : np.ndarray, shape (M, 2)
+        Vertices of the rounded polylines.
+    offsets : np.ndarray of int, shape (n_lines + 1,)
+        Start of every rounded polyline in the returned `points`.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    lengths = np.diff(offsets)
+    n_lines = len(lengths)
+    line_id = np.repeat(np.arange(n_lines), lengths)
+    start = offsets[:-1][line_id]
+    size = lengths[line_id]
+    local = np.arange(len(points)) - start
+
+    prev_p = points[start + (local - 1) % size]
+    next_p = points[start + (local + 1) % size]
+    vec_in = points - prev_p
+    vec_out = next_p - points
+    len_in = np.hypot(vec_in[:, 0], vec_in[:, 1])
+    len_out = np.hypot(vec_out[:, 0], vec_out[:, 1])
+
+    r = np.broadcast_to(np.asarray(radius, dtype=float), (n_lines,))[line_id]
+    valid_radius = np.minimum(r, np.minimum(len_in, len_out) / 2)
+    rounded = valid_radius >= 1e-3
+    if not closed:
+        rounded &= (local > 0) & (local < size - 1)
+
+    # every vertex becomes a block of 20 samples; sharp vertices keep only the first
+    blocks = np.repeat(points[:, None, :], len(_BEZIER_T), axis=1)
+    if rounded.any():
+        p = points[rounded]
+        vr = valid_radius[rounded, None]
+        tan_in = p - vec_in[rounded] / len_in[rounded, None] * vr
+        tan_out = p + vec_out[rounded] / len_out[rounded, None] * vr
+        blocks[rounded] = (_BEZIER_W[0][None, :, None] * tan_in[:, None]
+                           + _BEZIER_W[1][None, :, None] * p[:, None]
+                           + _BEZIER_W[2][None, :, None] * tan_out[:, None])
+    keep = np.zeros(blocks.shape[:2], dtype=bool)
+    keep[:, 0] = True
+    keep[rounded] = True
+
+    counts = np.bincount(line_id, weights=keep.sum(axis=1), minlength=n_lines).astype(np.intp)
+    new_offsets = np.concatenate([[0], np.cumsum(counts)])
+    return blocks[keep], new_offsets
+
+
 def _add_rounded_corners(x_coords, y_coords, radius, closed=False):
     """
     Round corners of a polyline using quadratic Bezier curves.
@@ -17,57 +90,5 @@ def _add_rounded_corners(x_coords, y_coords, radius, closed=False):
         (start and end points are preserved unchanged).
     """
     points = np.column_stack([x_coords, y_coords])
-    n = len(points)
-    new_points = []
-
-    if closed:
-        for i in range(n):
-            prev_p = points[(i - 1) % n]
-            curr_p = points[i]
-            next_p = points[(i + 1) % n]
-
-            vec_in  = curr_p - prev_p
-            vec_out = next_p - curr_p
-            len_in  = np.linalg.norm(vec_in)
-            len_out = np.linalg.norm(vec_out)
-
-            valid_radius = min(radius, len_in / 2, len_out / 2)
-
-            if valid_radius < 1e-3:
-                new_points.append(curr_p)
-                continue
-
-            tan_in  = curr_p - (vec_in  / len_in)  * valid_radius
-            tan_out = curr_p + (vec_out / len_out) * valid_radius
-
-            t = np.linspace(0, 1, 20).reshape(-1, 1)
-            curve = (1-t)**2 * tan_in + 2*(1-t)*t * curr_p + t**2 * tan_out
-            new_points.extend(curve)
-    else:
-        new_points.append(points[0])
-        for i in range(1, n - 1):
-            prev_p = points[i - 1]
-            curr_p = points[i]
-            next_p = points[i + 1]
-
-            vec_in  = curr_p - prev_p
-            vec_out = next_p - curr_p
-            len_in  = np.linalg.norm(vec_in)
-            len_out = np.linalg.norm(vec_out)
-
-            valid_radius = min(radius, len_in / 2, len_out / 2)
-
-            if valid_radius < 1e-3:
-                new_points.append(curr_p)
-                continue
-
-            tan_in  = curr_p - (vec_in  / len_in)  * valid_radius
-            tan_out = curr_p + (vec_out / len_out) * valid_radius
-
-            t = np.linspace(0, 1, 20).reshape(-1, 1)
-            curve = (1-t)**2 * tan_in + 2*(1-t)*t * curr_p + t**2 * tan_out
-            new_points.extend(curve)
-        new_points.append(points[-1])
-
-    result = np.array(new_points)
+    result, _ = _add_rounded_corners_batch(points, [0, len(points)], radius, closed=closed)
     return result[:, 0], result[:, 1]
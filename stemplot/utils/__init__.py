@@ -4,12 +4,22 @@ from ._plot_image import plot_image
 from ._heatmap import plot_heatmap
 from ._heatmap import annotate_heatmap
 from ._heatmap import plot_big_heatmap
+from ._cell_labels import CellLabels
+from ._heatmap_pyramid import HeatmapPyramid
+from ._heatmap_pyramid import PyramidImage
+from ._tiled_image import TilePyramid
+from ._tiled_image import TiledImage
 from ._plot_compare import plot_compare
 from ._plot_bar import plot_bar
 from ._plot_bar import plot_gradient_bar
 from ._save_fig import save_fig
+from ._save_fig import save_figs
+from ._export_cache import figure_hash
 from ._plot_confusion_matrix import plot_confusion_matrix
 from ._plot_radar import plot_radar
+from ._binned_kde import binned_kde
+from ._density_accumulator import DensityAccumulator
+from ._density_by_label import plot_density_by_label
 
 __all__ = ['plot_density',
            'plot_pca',
@@ -17,10 +27,20 @@ __all__ = ['plot_density',
            'plot_heatmap',
            'plot_big_heatmap',
            'annotate_heatmap',
+           'CellLabels',
+           'HeatmapPyramid',
+           'PyramidImage',
+           'TilePyramid',
+           'TiledImage',
            'plot_compare',
            'plot_bar',
            'plot_gradient_bar',
            'save_fig',
+           'save_figs',
+           'figure_hash',
            'plot_confusion_matrix',
            'plot_radar',
+           'binned_kde',
+           'DensityAccumulator',
+           'plot_density_by_label',
            ]
\ No newline at end of file
@@ -0,0 +1,142 @@
+import numpy as np
+import matplotlib.colors as mc
+from matplotlib import rcParams
+from matplotlib.artist import Artist
+from matplotlib.font_manager import FontProperties
+
+
+_FONT_ALIASES = {'fontsize': 'size', 'fontweight': 'weight', 'fontfamily': 'family',
+                 'fontstyle': 'style', 'fontstretch': 'stretch', 'fontvariant': 'variant'}
+
+
+def _font_properties(fontkw):
+    kw = {_FONT_ALIASES.get(k, k): v for k, v in fontkw.items()}
+    unknown = set(kw) - {'size', 'weight', 'family', 'style', 'stretch', 'variant'}
+    if unknown:
+        raise TypeError(f"Unsupported text properties for batched labels: {sorted(unknown)}.")
+    return FontProperties(**kw)
+
+
+class CellLabels(Artist):
+    """
+    Centered text labels of the cells of a regular grid, drawn as one artist.
+
+    Instead of one `Text` artist per cell, the labels are rendered in a single
+    loop over the cells in view, and only when a cell is large enough on
+    screen to hold its label (level of detail): zoomed out, a large matrix
+    draws no text at all; zooming in reveals the labels of the visible
+    cells. Values are formatted lazily, only for cells that are drawn.
+
+    Parameters
+    ----------
+    values : np.ndarray, shape (M, N)
+        Cell values.
+    xs : np.ndarray, shape (N,)
+        Data x coordinate of the center of every column.
+    ys : np.ndarray, shape (M,)
+        Data y coordinate of the center of every row.
+    formatter : callable, default str
+        Turns a value into its label.
+    colors : color or np.ndarray, shape (M, N, 4)
+        Text color, one for all labels or one RGBA row per cell.
+    min_fill : float, default 0.9
+        Largest fraction of the cell width and height a label may take.
+    **fontkw
+        Font properties: size, weight, family, style, stretch, variant (or
+        their ``font*`` aliases).
+    """
+
+    def __init__(self, values, xs, ys, formatter=str, colors='black', min_fill=0.9, **fontkw):
+        super().__init__()
+        self.values = np.asarray(values)
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        if self.values.shape != (len(self.ys), len(self.xs)):
+            raise ValueError(f"values of shape {self.values.shape} do not match "
+                             f"{len(self.ys)} rows and {len(self.xs)} columns.")
+        self.formatter = formatter
+        if isinstance(colors, np.ndarray) and colors.ndim == 3:
+            self.colors = colors
+        else:
+            self.colors = np.asarray(mc.to_rgba(colors))
+        self.min_fill = min_fill
+        fontkw.setdefault('size', fontkw.pop('fontsize', rcParams['font.size']))
+        self.prop = _font_properties(fontkw)
+        self.set_zorder(3)
+        self._texts = {}
+
+    def _cell_text(self, i, j):
+        key = (i, j)
+        label = self._texts.get(key)
+        if label is None:
+            label = self._texts[key] = self.formatter(self.values[i, j])
+        return label
+
+    def _cell_size(self):
+        """On-screen width and height of a cell in pixels."""
+        step_x = self.xs[1] - self.xs[0] if len(self.xs) > 1 else 1.
+        step_y = self.ys[1] - self.ys[0] if len(self.ys) > 1 else 1.
+        p0, p1 = self.axes.transData.transform([(self.xs[0], self.ys[0]),
+                                                (self.xs[0] + step_x, self.ys[0] + step_y)])
+        return np.abs(p1 - p0)
+
+    def visible_cells(self):
+        """
+        Row and column indices of the cells that get a label in the current
+        view, or two empty arrays when the cells are too small.
+        """
+        empty = np.empty(0, dtype=np.intp)
+        if len(self.xs) == 0 or len(self.ys) == 0:
+            return empty, empty
+        cell_w, cell_h = self._cell_size()
+        size_px = self.prop.get_size_in_points() * self.figure.dpi / 72.
+        if min(cell_w, cell_h) * self.min_fill < size_px:
+            return empty, empty
+        (x0, x1), (y0, y1) = sorted(self.axes.get_xlim()), sorted(self.axes.get_ylim())
+        cols = np.flatnonzero((self.xs >= x0) & (self.xs <= x1))
+        rows = np.flatnonzero((self.ys >= y0) & (self.ys <= y1))
+        return rows, cols
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        rows, cols = self.visible_cells()
+        if len(rows) == 0 or len(cols) == 0:
+            self.stale = False
+            return
+
+        ax = self.axes
+        gx, gy = np.meshgrid(self.xs[cols], self.ys[rows])
+        centers = ax.transData.transform(np.column_stack([gx.ravel(), gy.ravel()]))
+        ii = np.repeat(rows, len(cols))
+        jj = np.tile(cols, len(rows))
+        per_cell = self.colors.ndim == 3
+        max_w = self._cell_size()[0] * self.min_fill
+
+        renderer.open_group('cell_labels', gid=self.get_gid())
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(ax.bbox)
+        gc.set_alpha(self.get_alpha())
+        if not per_cell:
+            gc.set_foreground(self.colors, isRGBA=True)
+        flip_height = self.figure.bbox.height if renderer.flipy() else None
+        extents = {}
+        for (cx, cy), i, j in zip(centers, ii, jj):
+            label = self._cell_text(i, j)
+            ext = extents.get(label)
+            if ext is None:
+                ext = extents[label] = renderer.get_text_width_height_descent(label, self.prop, ismath=False)
+            w, h, d = ext
+            if w > max_w:
+                continue
+            if per_cell:
+                gc.set_foreground(self.colors[i, j], isRGBA=True)
+            # draw_text takes the left end of the baseline, measured from the
+            # top on backends that flip y, as in Text.draw
+            y = cy - h / 2 + d
+            if flip_height is not None:
+                y = flip_height - y
+            renderer.draw_text(gc, cx - w / 2, y, label, self.prop, 0)
+        gc.restore()
+        renderer.close_group('cell_labels')
+        self.stale = False
@@ -0,0 +1,152 @@
+import numpy as np
+
+from ._binned_kde import linear_binning, _as_pair, _bandwidth_factor, _gaussian_kernel, _smooth
+
+
+class DensityAccumulator:
+    """
+    Fixed-grid point histogram that is filled chunk by chunk.
+
+    Points are linearly binned onto the grid nodes as they arrive, together
+    with running weighted moments for the bandwidth rules, so the full point
+    set never has to be in memory. Accumulators over the same grid can be
+    built in separate processes and merged (their histograms add up); the
+    binned-KDE smoothing is only applied when the density is requested.
+
+    Parameters
+    ----------
+    xlim, ylim : tuple of float
+        Grid limits. Points outside them are not binned but still count
+        towards the normalization and the moments.
+    grid_size : int or (int, int), default 200
+        Number of grid nodes along x and y.
+
+    Examples
+    --------
+    >>> acc = DensityAccumulator((0, 512), (0, 512), grid_size=512)
+    >>> for path in frame_files:
+    ...     acc.update(np.load(path))
+    >>> plot_density(accumulator=acc)
+    """
+
+    def __init__(self, xlim, ylim, grid_size=200):
+        self.xlim = tuple(float(v) for v in xlim)
+        self.ylim = tuple(float(v) for v in ylim)
+        self.grid_size = tuple(int(n) for n in np.broadcast_to(grid_size, (2,)))
+        if min(self.grid_size) < 2:
+            raise ValueError(f"grid_size must be at least 2, got {grid_size}.")
+        if self.xlim[1] <= self.xlim[0] or self.ylim[1] <= self.ylim[0]:
+            raise ValueError(f"Empty limits {self.xlim}, {self.ylim}.")
+        nx, ny = self.grid_size
+        self.grid = np.zeros((ny, nx))
+        # total weight, total squared weight, weighted mean and sum of squared deviations
+        self.weight = 0.
+        self.weight_sq = 0.
+        self.mean = np.zeros(2)
+        self.m2 = np.zeros(2)
+
+    def _same_grid(self, other):
+        return (self.xlim, self.ylim, self.grid_size) == (other.xlim, other.ylim, other.grid_size)
+
+    def _add_moments(self, weight, weight_sq, mean, m2):
+        # parallel update of the weighted mean and variance (Chan et al.)
+        total = self.weight + weight
+        if total == 0:
+            return
+        delta = mean - self.mean
+        self.m2 = self.m2 + m2 + delta ** 2 * self.weight * weight / total
+        self.mean = self.mean + delta * weight / total
+        self.weight = total
+        self.weight_sq += weight_sq
+
+    def update(self, points, weights=None):
+        """
+        Add a chunk of points.
+
+        Parameters
+        ----------
+        points : array-like, shape (N, 2)
+            Point coordinates.
+        weights : array-like, shape (N,), optional
+            Point weights.
+
+        Returns
+        -------
+        DensityAccumulator
+            self, for chaining.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(points) == 0:
+            return self
+        if weights is None:
+            w, w_sq = float(len(points)), float(len(points))
+            mean = points.mean(axis=0)
+            m2 = ((points - mean) ** 2).sum(axis=0)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != (len(points),):
+                raise ValueError(f"weights must have shape ({len(points)},), got {weights.shape}.")
+            w, w_sq = weights.sum(), (weights ** 2).sum()
+            if w == 0:
+                return self
+            mean = weights @ points / w
+            m2 = weights @ (points - mean) ** 2
+        self.grid += linear_binning(points, self.xlim, self.ylim, self.grid_size, weights)
+        self._add_moments(w, w_sq, mean, m2)
+        return self
+
+    def merge(self, other):
+        """
+        Add the histogram and moments of another accumulator over the same grid.
+
+        Returns
+        -------
+        DensityAccumulator
+            self, for chaining.
+        """
+        if not self._same_grid(other):
+            raise ValueError("Cannot merge accumulators over different grids.")
+        self.grid += other.grid
+        self._add_moments(other.weight, other.weight_sq, other.mean, other.m2)
+        return self
+
+    def bandwidth(self, method='scott'):
+        """
+        Per-axis bandwidth of the accumulated points, see `kde_bandwidth`.
+        """
+        if self.weight == 0:
+            raise ValueError("The accumulator is empty.")
+        # unit weights use the unbiased variance, like np.std(ddof=1)
+        ddof = 1 if self.weight == self.weight_sq else 0
+        std = np.sqrt(self.m2 / (self.weight - ddof))
+        return _bandwidth_factor(self.weight ** 2 / self.weight_sq, method) * std
+
+    def density(self, bandwidth='scott', truncate=4.0):
+        """
+        Smoothed density on the grid.
+
+        Parameters
+        ----------
+        bandwidth : {'scott', 'silverman'}, float or (float, float), default 'scott'
+            Kernel standard deviation in data units, or a rule of thumb
+            applied to the accumulated moments.
+        truncate : float, default 4.0
+            Truncate the kernel at this many standard deviations.
+
+        Returns
+        -------
+        X, Y, Z : np.ndarray, shape (ny, nx)
+            Grid coordinates and density, as returned by `binned_kde`.
+        """
+        if isinstance(bandwidth, str):
+            bw = self.bandwidth(bandwidth)
+        else:
+            bw = _as_pair(bandwidth, 'bandwidth').astype(float)
+        nx, ny = self.grid_size
+        dx = (self.xlim[1] - self.xlim[0]) / (nx - 1)
+        dy = (self.ylim[1] - self.ylim[0]) / (ny - 1)
+        kx = _gaussian_kernel(bw[0] / dx, nx, truncate)
+        ky = _gaussian_kernel(bw[1] / dy, ny, truncate)
+        Z = _smooth(self.grid, kx, ky, max(self.weight, 1e-300) * dx * dy)
+        X, Y = np.meshgrid(np.linspace(*self.xlim, nx), np.linspace(*self.ylim, ny))
+        return X, Y, Z
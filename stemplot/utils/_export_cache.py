@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.colors import Colormap
+from matplotlib.font_manager import FontProperties
+from matplotlib.axis import Axis
+from matplotlib.path import Path
+from matplotlib.text import Text
+from matplotlib.transforms import Transform
+
+
+# sidecar index written next to the exported files
+INDEX_NAME = '.stemplot_export_cache.json'
+
+# rcParams that change the output without being visible on the artists
+_RC_PREFIXES = ('font.', 'text.', 'mathtext.', 'path.', 'image.', 'savefig.', 'svg.', 'pdf.', 'ps.',
+                'agg.', 'hatch.')
+
+# cheap getters whose values, over all artists of a figure, determine what is drawn
+_GETTERS = ('get_xydata', 'get_offsets', 'get_paths', 'get_path', 'get_patch_transform', 'get_transforms',
+            'get_offset_transform', 'get_sizes', 'get_array', 'get_text', 'get_position', 'get_rotation',
+            'get_fontproperties', 'get_horizontalalignment', 'get_verticalalignment', 'get_multialignment',
+            'get_linespacing', 'get_wrap', 'get_usetex', 'get_color', 'get_facecolor', 'get_edgecolor',
+            'get_linewidth', 'get_linestyle', 'get_capstyle', 'get_joinstyle', 'get_antialiased',
+            'get_marker', 'get_markersize', 'get_markerfacecolor', 'get_markerfacecoloralt',
+            'get_markeredgecolor', 'get_markeredgewidth', 'get_fillstyle', 'get_markevery', 'get_drawstyle',
+            'get_dash_capstyle', 'get_solid_capstyle', 'get_dash_joinstyle', 'get_solid_joinstyle',
+            'get_boxstyle', 'get_hatch', 'get_alpha', 'get_visible', 'get_zorder', 'get_cmap', 'get_clim',
+            'get_extent', 'get_interpolation', 'get_xlim', 'get_ylim', 'get_xscale', 'get_yscale',
+            'get_aspect', 'get_size_inches', 'get_dpi', 'get_clip_on')
+
+# attributes without a getter, hashed the same way
+_ATTRIBUTES = ('norm',)
+
+# plain attribute values hashed for objects without a meaningful repr
+_PLAIN = (bool, int, float, str, type(None))
+
+
+def _update(h, value):
+    if isinstance(value, np.ndarray):
+        if np.ma.isMaskedArray(value):
+            _update(h, np.ma.getmaskarray(value))
+            value = value.data
+        if value.dtype == object:
+            h.update(repr(value.tolist()).encode())
+            return
+        h.update(f'{value.dtype.str}{value.shape}'.encode())
+        h.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, Path):
+        _update(h, value.vertices)
+        _update(h, value.codes)
+    elif isinstance(value, Transform):
+        _update(h, value.get_matrix())
+    elif isinstance(value, Colormap):
+        h.update(value.name.encode())
+        _update(h, value(np.linspace(0, 1, 16)))
+    elif isinstance(value, FontProperties):
+        _update(h, (value.get_family(), value.get_style(), value.get_variant(), value.get_weight(),
+                    value.get_stretch(), value.get_size_in_points(), value.get_file(),
+                    value.get_math_fontfamily()))
+    elif isinstance(value, (list, tuple)):
+        h.update(f'[{len(value)}'.encode())
+        for v in value:
+            _update(h, v)
+    else:
+        text = repr(value)
+        if ' at 0x' not in text:
+            h.update(text.encode())
+            return
+        # default reprs hold the object address, which changes between runs;
+        # hash the type and the plain attributes (e.g. the pad of a BoxStyle,
+        # the limits of a norm) instead
+        h.update(type(value).__name__.encode())
+        attrs = getattr(value, '__dict__', {})
+        _update(h, sorted((k, v) for k, v in attrs.items() if isinstance(v, _PLAIN)))
+
+
+def _memmap_root(a):
+    while isinstance(a, np.memmap) and isinstance(a.base, np.memmap):
+        a = a.base
+    return a if isinstance(a, np.memmap) and a.filename is not None else None
+
+
+def _update_array_source(h, a):
+    """
+    Hash an array that may be too large to read: a memmap by its file
+    (path, size and modification time) and the position of the view in it,
+    anything else by its content.
+    """
+    root = _memmap_root(a)
+    if root is None:
+        _update(h, np.asarray(a))
+        return
+    stat = os.stat(root.filename)
+    _update(h, (os.path.abspath(root.filename), stat.st_size, stat.st_mtime_ns, root.offset,
+                a.ctypes.data - root.ctypes.data, a.shape, a.strides, a.dtype.str))
+
+
+def _artists(artist):
+    """
+    `artist` and its descendants, like ``findobj`` but without the ticks of
+    an axis, which are created on demand and hashed through the axis, and
+    with the bounding box patches of texts.
+    """
+    yield artist
+    children = [artist.label, artist.offsetText] if isinstance(artist, Axis) else artist.get_children()
+    if isinstance(artist, Text) and artist.get_bbox_patch() is not None:
+        # the box drawn behind a text is not one of its children
+        children = [*children, artist.get_bbox_patch()]
+    for child in children:
+        yield from _artists(child)
+
+
+def figure_hash(fig, **save_params):
+    """
+    Hash of what a figure draws and how it is saved.
+
+    The hash covers the data and style of every artist (array buffers,
+    paths, texts, colors, limits, ...) read through their getters, the
+    rcParams that affect rendering and `save_params`. It is meant to detect
+    unchanged figures much faster than drawing them, not to be exhaustive:
+    e.g. custom transforms and callbacks are not looked at.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to hash.
+    **save_params
+        Save options to include, e.g. dpi and format.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _update(h, sorted((k, v) for k, v in rcParams.items() if k.startswith(_RC_PREFIXES)))
+    _update(h, sorted(save_params.items()))
+    for artist in _artists(fig):
+        h.update(type(artist).__name__.encode())
+        for name in _GETTERS:
+            getter = getattr(artist, name, None)
+            if getter is None:
+                continue
+            try:
+                value = getter()
+            except Exception:
+                # getters that need arguments, or geometry that only some
+                # artists of a class support (e.g. the patch transform of a
+                # colorbar outline spine, whose path is still hashed)
+                continue
+            h.update(name.encode())
+            _update(h, value)
+        for name in _ATTRIBUTES:
+            value = getattr(artist, name, None)
+            if value is not None:
+                h.update(name.encode())
+                _update(h, value)
+        pyramid = getattr(artist, 'pyramid', None)
+        if pyramid is not None:
+            # images drawn from a pyramid only hold the window in view
+            _update_array_source(h, pyramid.levels[0] if hasattr(pyramid, 'levels') else pyramid.img)
+        if isinstance(artist, Axis):
+            for which in ('major', 'minor'):
+                ticker = getattr(artist, which)
+                locs = np.asarray(ticker.locator())
+                _update(h, locs)
+                _update(h, ticker.formatter.format_ticks(locs))
+                _update(h, sorted(artist.get_tick_params(which=which).items()))
+    return h.hexdigest()
+
+
+def index_path(filepath, cache):
+    """Sidecar index of `filepath`: `cache` itself if it is a path, else next to the file."""
+    if cache is True:
+        return os.path.join(os.path.dirname(os.path.abspath(filepath)), INDEX_NAME)
+    return os.fspath(cache)
+
+
+def _file_stat(filepath):
+    stat = os.stat(filepath)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _key(index_file, filepath):
+    return os.path.relpath(os.path.abspath(filepath), os.path.dirname(os.path.abspath(index_file)))
+
+
+def load_index(index_file):
+    try:
+        with open(index_file) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def is_current(index, index_file, filepath, digest):
+    """Whether `filepath` exists and was written by us for `digest`, unchanged since."""
+    entry = index.get(_key(index_file, filepath))
+    if entry is None or entry['hash'] != digest or not os.path.exists(filepath):
+        return False
+    return {k: entry[k] for k in ('size', 'mtime_ns')} == _file_stat(filepath)
+
+
+def index_entries(index_file, filepaths, digest):
+    return {_key(index_file, p): dict(_file_stat(p), hash=digest) for p in filepaths}
+
+
+def update_index(index_file, entries):
+    """Merge `entries` into the index file, replacing it atomically."""
+    if not entries:
+        return
+    index = load_index(index_file)
+    index.update(entries)
+    tmp = f'{index_file}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, index_file)
@@ -1,7 +1,16 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import matplotlib.colors as mc
 from matplotlib import ticker
 
+from ._cell_labels import CellLabels
+from ._heatmap_pyramid import HeatmapPyramid, LOD_THRESHOLD, ax_add_pyramid_image
+
+
+# annotate_heatmap draws one CellLabels artist instead of Text artists above
+# this number of cells
+BATCH_THRESHOLD = 1000
+
 
 def plot_heatmap(data, ax=None, xlabels=None, ylabels=None, xtick='bottom',
                  xrotate=-30, cbar_kw=None, cbarlabel="", **kwargs):
@@ -67,9 +76,21 @@ def plot_heatmap(data, ax=None, xlabels=None, ylabels=None, xtick='bottom',
     return im, cbar
 
 
+def _cell_centers(im, shape):
+    """Data coordinates of the pixel centres of an image of `shape`."""
+    left, right, bottom, top = im.get_extent()
+    n_rows, n_cols = shape
+    xs = left + (np.arange(n_cols) + 0.5) * (right - left) / n_cols
+    if im.origin == 'upper':
+        ys = top + (np.arange(n_rows) + 0.5) * (bottom - top) / n_rows
+    else:
+        ys = bottom + (np.arange(n_rows) + 0.5) * (top - bottom) / n_rows
+    return xs, ys
+
+
 def annotate_heatmap(im, data=None, valfmt="{x:.2f}",
                      textcolors=("black", "white"),
-                     threshold=None, **textkw):
+                     threshold=None, batched=None, **textkw):
     """
     A function to annotate a heatmap.
 
@@ -90,13 +111,23 @@ def annotate_heatmap(im, data=None, valfmt="{x:.2f}",
         Value in data units according to which the colors from textcolors are
         applied.  If None (the default) uses the middle of the colormap as
         separation.  Optional.
+    batched
+        If True, draw all annotations as one `CellLabels` artist that only
+        labels cells large enough on screen; if False, create one `Text` per
+        cell.  By default batching is used above BATCH_THRESHOLD cells.
+        Optional.
     **kwargs
         All other arguments are forwarded to each call to `text` used to create
-        the text labels.
+        the text labels (font properties only when batched).
+
+    Returns
+    -------
+    list of Text or CellLabels
     """
 
     if not isinstance(data, (list, np.ndarray)):
         data = im.get_array()
+    data = np.asarray(data)
 
     # Normalize the threshold to the images color range.
     if threshold is not None:
@@ -104,35 +135,56 @@ def annotate_heatmap(im, data=None, valfmt="{x:.2f}",
     else:
         threshold = im.norm(data.max()) / 2.
 
+    # Get the formatter in case a string is supplied
+    if isinstance(valfmt, str):
+        valfmt = ticker.StrMethodFormatter(valfmt)
+
+    # Text color of every cell from one vectorized norm call.
+    above = np.asarray(im.norm(data) > threshold).astype(np.intp)
+    xs, ys = _cell_centers(im, data.shape)
+
+    if batched is None:
+        batched = data.size > BATCH_THRESHOLD
+    if batched:
+        rgba = np.array([mc.to_rgba(c) for c in textcolors[:2]])
+        labels = CellLabels(data, xs, ys, formatter=lambda x: valfmt(x, None), colors=rgba[above], **textkw)
+        im.axes.add_artist(labels)
+        return labels
+
     # Set default alignment to center, but allow it to be
     # overwritten by textkw.
     kw = dict(horizontalalignment="center",
               verticalalignment="center")
     kw.update(textkw)
 
-    # Get the formatter in case a string is supplied
-    if isinstance(valfmt, str):
-        valfmt = ticker.StrMethodFormatter(valfmt)
-
     # Loop over the data and create a `Text` for each "pixel".
     # Change the text's color depending on the data.
     texts = []
     for i in range(data.shape[0]):
         for j in range(data.shape[1]):
-            kw.update(color=textcolors[int(im.norm(data[i, j]) > threshold)])
-            text = im.axes.text(j, i, valfmt(data[i, j], None), **kw)
+            kw.update(color=textcolors[above[i, j]])
+            text = im.axes.text(xs[j], ys[i], valfmt(data[i, j], None), **kw)
             texts.append(text)
 
     return texts
 
 
-def plot_big_heatmap(data, ax=None, **kwargs):
+def plot_big_heatmap(data, ax=None, lod=None, reduce='mean', directory=None, **kwargs):
     """
     Plots a heatmap of the given 2D array using matplotlib.
 
+    Arrays larger than `LOD_THRESHOLD` elements are drawn through a
+    `HeatmapPyramid`: only the pyramid level matching the zoom and only the
+    tiles in view are resampled at each draw, and the colorbar uses the global
+    range collected while the pyramid is built.
+
     Parameters:
-    - data (ndarray): A 2D NumPy array to visualize.
+    - data (ndarray or HeatmapPyramid): A 2D NumPy array (or memmap) to visualize, or a prebuilt pyramid.
     - ax (matplotlib.axes.Axes, optional): Axis to plot on. Creates one if not provided.
+    - lod (bool, optional): Force level-of-detail rendering on or off. Decided from the array size by default;
+      with False a prebuilt pyramid is drawn from its full resolution level.
+    - reduce ({'mean', 'max'}): Block reduction of the pyramid levels.
+    - directory (str, optional): Keep the pyramid levels as memmaps in this directory.
     - **kwargs: Additional keyword arguments passed to imshow (e.g., vmin, vmax, cmap).
     """
     if ax is None:
@@ -141,10 +193,20 @@ def plot_big_heatmap(data, ax=None, **kwargs):
     if 'cmap' not in kwargs:
         kwargs['cmap'] = 'viridis'
 
-    im = ax.imshow(data, aspect='equal', **kwargs)
+    if lod is None:
+        lod = isinstance(data, HeatmapPyramid) or np.size(data) > LOD_THRESHOLD
+    if lod:
+        if not isinstance(data, HeatmapPyramid):
+            data = HeatmapPyramid(data, reduce=reduce, directory=directory)
+        im = ax_add_pyramid_image(ax, data, **kwargs)
+        ax.set_aspect('equal')
+    else:
+        if isinstance(data, HeatmapPyramid):
+            # the full resolution level is the array itself
+            data = data.levels[0]
+        im = ax.imshow(data, aspect='equal', **kwargs)
     ax.set_xticks([])
     ax.set_yticks([])
     plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
 
     return ax
-
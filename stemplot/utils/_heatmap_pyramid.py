@@ -0,0 +1,237 @@
+import numpy as np
+from pathlib import Path
+from matplotlib.colors import Normalize
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox
+
+
+# arrays with more elements than this are drawn through a pyramid by
+# plot_big_heatmap
+LOD_THRESHOLD = 4096 * 4096
+
+REDUCTIONS = ('mean', 'max')
+
+
+def _block_reduce(a, reduce):
+    """
+    Reduce 2x2 blocks of the first two axes of `a`; odd trailing rows and
+    columns form smaller blocks. Further axes (e.g. RGB channels) are kept.
+    """
+    h, w = a.shape[:2]
+    h2, w2 = (h + 1) // 2, (w + 1) // 2
+    pad = ((0, 2 * h2 - h), (0, 2 * w2 - w)) + ((0, 0),) * (a.ndim - 2)
+    blocks = (h2, 2, w2, 2) + a.shape[2:]
+    if reduce == 'max':
+        # replicating the edge does not change a maximum
+        return np.pad(a, pad, mode='edge').reshape(blocks).max(axis=(1, 3))
+    s = np.pad(a.astype(np.float64), pad).reshape(blocks).sum(axis=(1, 3))
+    rows = np.full(h2, 2.)
+    cols = np.full(w2, 2.)
+    rows[-1] -= 2 * h2 - h
+    cols[-1] -= 2 * w2 - w
+    counts = np.outer(rows, cols).reshape((h2, w2) + (1,) * (a.ndim - 2))
+    return (s / counts).astype(np.float32)
+
+
+class HeatmapPyramid:
+    """
+    Mipmap pyramid of a 2D array for level-of-detail display.
+
+    Level 0 is the array itself (which may be a ``np.memmap``); every next
+    level reduces 2x2 blocks of the previous one by their mean or maximum,
+    until the largest side is at most `min_size`. Levels are computed in
+    bands of rows so that the full array is never loaded at once, and can be
+    written to disk as ``.npy`` memmaps. The global minimum and maximum are
+    collected on the way for a view-independent color scale.
+
+    Parameters
+    ----------
+    data : np.ndarray, shape (M, N)
+        Array to display.
+    reduce : {'mean', 'max'}, default 'mean'
+        Block reduction. 'max' keeps isolated peaks visible when zoomed out.
+    directory : str or Path, optional
+        Write the reduced levels as ``level_<k>.npy`` memmaps in this
+        directory instead of keeping them in memory.
+    min_size : int, default 1024
+        Stop once the largest side of a level is at most this.
+    band_rows : int, default 2048
+        Rows of the previous level processed at once.
+
+    Attributes
+    ----------
+    levels : list of np.ndarray
+        The pyramid, full resolution first.
+    vmin, vmax : float
+        Global finite minimum and maximum of `data`.
+    """
+
+    def __init__(self, data, reduce='mean', directory=None, min_size=1024, band_rows=2048):
+        if reduce not in REDUCTIONS:
+            raise ValueError(f"reduce must be one of {REDUCTIONS}, got {reduce!r}.")
+        if np.ndim(data) != 2:
+            raise ValueError(f"Expected a 2D array, got shape {np.shape(data)}.")
+        self.reduce = reduce
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        band_rows += band_rows % 2
+
+        self.levels = [data]
+        self.vmin, self.vmax = np.inf, -np.inf
+        while max(self.levels[-1].shape) > min_size:
+            self.levels.append(self._reduce_level(self.levels[-1], len(self.levels), band_rows))
+        if len(self.levels) == 1:
+            self._update_stats(data)
+
+    @property
+    def shape(self):
+        return self.levels[0].shape
+
+    @property
+    def n_levels(self):
+        return len(self.levels)
+
+    def level_shape(self, level):
+        return self.levels[level].shape[:2]
+
+    def read(self, level, r0, r1, c0, c1):
+        """Rows ``r0:r1`` and columns ``c0:c1`` of a level as an array."""
+        return np.asarray(self.levels[level][r0:r1, c0:c1])
+
+    def _update_stats(self, band):
+        finite = np.isfinite(band)
+        if finite.any():
+            self.vmin = min(self.vmin, float(band[finite].min()))
+            self.vmax = max(self.vmax, float(band[finite].max()))
+
+    def _reduce_level(self, src, k, band_rows):
+        h, w = src.shape
+        shape = ((h + 1) // 2, (w + 1) // 2)
+        dtype = src.dtype if self.reduce == 'max' else np.float32
+        if self.directory is None:
+            dst = np.empty(shape, dtype=dtype)
+        else:
+            dst = np.lib.format.open_memmap(self.directory / f'level_{k}.npy', mode='w+',
+                                            dtype=dtype, shape=shape)
+        for r in range(0, h, band_rows):
+            band = np.asarray(src[r:r + band_rows])
+            if k == 1:
+                self._update_stats(band)
+            dst[r // 2:(r + len(band) + 1) // 2] = _block_reduce(band, self.reduce)
+        if isinstance(dst, np.memmap):
+            dst.flush()
+        return dst
+
+    def level_for(self, cells_per_pixel):
+        """Coarsest level that still has at least one cell per screen pixel."""
+        if cells_per_pixel <= 1:
+            return 0
+        return int(min(np.floor(np.log2(cells_per_pixel)), self.n_levels - 1))
+
+
+class PyramidImage(AxesImage):
+    """
+    Image artist that draws a pyramid at the level matching the view.
+
+    On every draw the pyramid level is chosen from the number of array cells
+    per screen pixel in the current view, and only the part of that level in
+    view (extended to whole tiles, so small pans reuse it) is read and
+    handed to matplotlib for resampling. The color scale defaults to the
+    global range of the data when the pyramid knows it.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    pyramid : HeatmapPyramid or TilePyramid
+        Data to display.
+    tile_size : int, default 256
+        Granularity, in cells of the displayed level, of the loaded window.
+    **kwargs
+        Passed to `matplotlib.image.AxesImage` (e.g. cmap, norm, interpolation).
+    """
+
+    def __init__(self, ax, pyramid, tile_size=256, **kwargs):
+        # AxesImage takes no vmin/vmax, they go into the norm; a limit that is
+        # neither given nor known to the pyramid is autoscaled on the first draw
+        vmin = kwargs.pop('vmin', None)
+        vmax = kwargs.pop('vmax', None)
+        if 'norm' not in kwargs:
+            kwargs['norm'] = Normalize(pyramid.vmin if vmin is None else vmin,
+                                       pyramid.vmax if vmax is None else vmax)
+        elif vmin is not None or vmax is not None:
+            raise ValueError("Passing a norm together with vmin/vmax is not supported.")
+        super().__init__(ax, **kwargs)
+        self.pyramid = pyramid
+        self.tile_size = tile_size
+        self._window = None
+        self._window_extent = self.full_extent
+        self.set_data(np.zeros((1, 1), dtype=np.float32))
+
+    @property
+    def full_extent(self):
+        h, w = self.pyramid.shape[:2]
+        return (-0.5, w - 0.5, h - 0.5, -0.5)
+
+    @property
+    def level(self):
+        """Pyramid level of the last draw."""
+        return None if self._window is None else self._window[0]
+
+    def get_extent(self):
+        return self._window_extent
+
+    def get_window_extent(self, renderer=None):
+        # the whole array, whatever window is loaded
+        x0, x1, y0, y1 = self.full_extent
+        return Bbox.from_extents(x0, y0, x1, y1).transformed(self.get_transform())
+
+    def _view_window(self):
+        ax = self.axes
+        h, w = self.pyramid.shape[:2]
+        (x0, x1), (y0, y1) = sorted(ax.get_xlim()), sorted(ax.get_ylim())
+        c0, c1 = max(0, int(np.floor(x0 + 0.5))), min(w, int(np.ceil(x1 + 0.5)))
+        r0, r1 = max(0, int(np.floor(y0 + 0.5))), min(h, int(np.ceil(y1 + 0.5)))
+        if c1 <= c0 or r1 <= r0:
+            return None
+        cells_per_pixel = max((c1 - c0) / max(ax.bbox.width, 1), (r1 - r0) / max(ax.bbox.height, 1))
+        level = self.pyramid.level_for(cells_per_pixel)
+
+        # in cells of the chosen level, snapped to whole tiles
+        lh, lw = self.pyramid.level_shape(level)
+        t, s = self.tile_size, 2 ** level
+        lc0, lr0 = (c0 // s) // t * t, (r0 // s) // t * t
+        lc1, lr1 = -(-c1 // s), -(-r1 // s)
+        lc1, lr1 = min(lw, -(-lc1 // t) * t), min(lh, -(-lr1 // t) * t)
+        return level, lr0, lr1, lc0, lc1
+
+    def load_window(self, window):
+        level, r0, r1, c0, c1 = window
+        s = 2 ** level
+        self.set_data(self.pyramid.read(level, r0, r1, c0, c1))
+        # the last block of a level may extend past the array; its cell keeps full size
+        self._window_extent = (c0 * s - 0.5, c1 * s - 0.5, r1 * s - 0.5, r0 * s - 0.5)
+        self._window = window
+
+    def draw(self, renderer):
+        window = self._view_window()
+        if window is None:
+            return
+        if window != self._window:
+            self.load_window(window)
+        super().draw(renderer)
+
+
+def ax_add_pyramid_image(ax, pyramid, **kwargs):
+    """
+    Add a `PyramidImage` of `pyramid` to `ax` and frame the full array, like
+    ``ax.imshow`` does.
+    """
+    im = PyramidImage(ax, pyramid, **kwargs)
+    ax.add_image(im)
+    x0, x1, y0, y1 = im.full_extent
+    ax.update_datalim([(x0, y1), (x1, y0)])
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
+    return im
@@ -1,19 +1,26 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import gaussian_kde
-from scipy.ndimage import gaussian_filter
 
-def fast_kde(xy, bins=30, sigma=2, xlim=None, ylim=None):
+from ._binned_kde import binned_kde, kde_bandwidth
+
+
+def fast_kde(xy, bins=30, sigma=2, xlim=None, ylim=None, weights=None):
     """
-    Generate a smooth 2D density plot by combining 2D histogram and KDE.
+    Generate a smooth 2D density on the bin centres of a regular grid.
+
+    The points are linearly binned onto the bin centres and convolved by FFT
+    with a Gaussian whose variance is Scott's bandwidth plus `sigma` bins of
+    extra smoothing, see `binned_kde`.
 
     Parameters:
     - xy: A two-dimensional array where the first column is x and the second column is y.
     - bins: The number of bins for the histogram in both dimensions (can be a scalar or [bins_x, bins_y]).
-    - sigma: The standard deviation for the Gaussian filter for initial smoothing (applied to histogram).
+    - sigma: Extra smoothing in bins, added in quadrature to the Scott bandwidth.
     - xlim: The limits for the x-axis as a tuple (xmin, xmax). Estimated from data if None.
     - ylim: The limits for the y-axis as a tuple (ymin, ymax). Estimated from data if None.
+    - weights: Optional weight of every point.
     """
+    xy = np.asarray(xy, dtype=float)
     x = xy[:, 0]
     y = xy[:, 1]
 
@@ -23,26 +30,17 @@ def fast_kde(xy, bins=30, sigma=2, xlim=None, ylim=None):
     if ylim is None:
         ylim = (np.min(y) - 1, np.max(y) + 1)
 
-    # Compute the 2D histogram
-    h, xedges, yedges = np.histogram2d(x, y, bins=bins, range=[xlim, ylim], density=True)
-
-    # Apply Gaussian filter to smooth the histogram slightly
-    h_smooth = gaussian_filter(h, sigma=sigma)
-
-    # Calculate bin centers
-    xcenters = (xedges[:-1] + xedges[1:]) / 2
-    ycenters = (yedges[:-1] + yedges[1:]) / 2
-    X, Y = np.meshgrid(xcenters, ycenters)
-
-    # Flatten the grid and create a new array with the positions to evaluate the KDE
-    positions = np.vstack([X.ravel(), Y.ravel()])
+    nx, ny = (int(n) for n in np.broadcast_to(bins, (2,)))
+    dx = (xlim[1] - xlim[0]) / nx
+    dy = (ylim[1] - ylim[0]) / ny
 
-    # Evaluate the KDE on the positions
-    # Use the flattened, smoothed histogram as weights for KDE fitting
-    kernel = gaussian_kde(positions, weights=h_smooth.ravel())
-    Z = np.reshape(kernel(positions).T, X.shape)
+    # Scott bandwidth of the points widened by the requested smoothing
+    bandwidth = np.hypot(kde_bandwidth(xy, 'scott', weights), np.array([dx, dy]) * sigma)
 
-    return X, Y, Z
+    # Evaluate on the bin centres
+    return binned_kde(xy, grid_size=(nx, ny), bandwidth=bandwidth,
+                      xlim=(xlim[0] + dx / 2, xlim[1] - dx / 2),
+                      ylim=(ylim[0] + dy / 2, ylim[1] - dy / 2), weights=weights)
 
 
 def plot_density(points, ax=None, bins=30, sigma=2, xlim=None, ylim=None, **kwargs):
@@ -50,7 +48,7 @@ def plot_density(points, ax=None, bins=30, sigma=2, xlim=None, ylim=None, **kwar
     if ax is None:
         fig, ax = plt.subplots(figsize=(7.2, 7.2))
 
-    X, Y, Z = fast_kde(points, bins=bins)
+    X, Y, Z = fast_kde(points, bins=bins, sigma=sigma, xlim=xlim, ylim=ylim)
 
     # Set default kwargs for contourf
     contourf_defaults = {'levels': np.linspace(0, Z.max(), 25), 'cmap': 'Greys', 'alpha': 0.8}
@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.colors import Normalize
+from matplotlib.collections import PolyCollection
+
+from stemplot.patches._gradient import ax_add_gradient_polygons
 import numpy as np
 
 def plot_bar(
@@ -91,21 +93,22 @@ def plot_bar(
 
 
 def plot_gradient_bar(ax, heights, width=0.7, cmap='viridis'):
+    """
+    Bar chart whose bars are filled with a vertical gradient of `cmap`.
+
+    All bars are drawn as one shared gradient image and their outlines as
+    one collection.
+    """
+    heights = np.asarray(heights, dtype=float)
     x = np.arange(len(heights))
-    grad = np.linspace(0, 1, 256).reshape(-1, 1)
-    for xi, hi in zip(x, heights):
-        ax.imshow(
-            grad,
-            extent=(xi - width/2, xi + width/2, 0, hi),
-            origin='lower',
-            aspect='auto',
-            cmap=plt.get_cmap(cmap),
-            norm=Normalize(0, 1),
-            clip_on=True,
-        )
-        ax.add_patch(plt.Rectangle(
-            (xi - width/2, 0), width, hi,
-            fill=False, edgecolor='black', linewidth=0.5
-        ))
+    rects = np.stack([np.column_stack([x - width/2, np.zeros_like(heights)]),
+                      np.column_stack([x + width/2, np.zeros_like(heights)]),
+                      np.column_stack([x + width/2, heights]),
+                      np.column_stack([x - width/2, heights])], axis=1)
+    # the gradient runs from the base to the top of every bar
+    angles = np.where(heights < 0, 270, 90)
+    im = ax_add_gradient_polygons(ax, rects, angle=angles, cmap=cmap, resolution=256)
+    ax.add_collection(PolyCollection(rects, facecolors='none', edgecolors='black', linewidths=0.5))
     ax.set_xlim(-width, len(heights)-1 + width)
-    ax.set_ylim(0, max(heights) * 1.05)
\ No newline at end of file
+    ax.set_ylim(0, max(heights) * 1.05)
+    return im
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+import matplotlib.colors as mc
+from matplotlib.collections import LineCollection
+
+from ._cell_labels import CellLabels
 
 def plot_confusion_matrix(mat, ax,
                           class_names=None,
@@ -11,10 +14,14 @@ def plot_confusion_matrix(mat, ax,
                           edge_color='white',
                           lw=1.0):
     """
-    Plot a confusion matrix on a given Axes using square patches—
+    Plot a confusion matrix on a given Axes using square cells—
     one color for diagonal cells and another for off-diagonal cells.
     X-axis labels are drawn on the top. Minor and major ticks are suppressed.
 
+    The cells are one image, their borders one line collection and the
+    numbers one `CellLabels` artist, which only labels cells that are large
+    enough on screen, so large matrices stay fast to draw.
+
     Parameters
     ----------
     mat : array-like, shape (N, N)
@@ -51,20 +58,18 @@ def plot_confusion_matrix(mat, ax,
     ax.set_xlim(0, n)
     ax.set_ylim(n, 0)  # invert y-axis so row 0 is at the top
 
-    # draw squares and numbers
-    for i in range(n):
-        for j in range(n):
-            color = diag_color if i == j else off_diag_color
-            rect = Rectangle((j, i), 1, 1,
-                             facecolor=color,
-                             edgecolor=edge_color,
-                             linewidth=lw)
-            ax.add_patch(rect)
-            ax.text(j + 0.5, i + 0.5,
-                    str(mat[i, j]),
-                    ha='center', va='center',
-                    color=text_color,
-                    fontsize=fontsize)
+    # cell colors as one image, borders as one collection, numbers as one artist
+    colors = np.array([mc.to_rgba(off_diag_color), mc.to_rgba(diag_color)])
+    ax.imshow(colors[np.eye(n, dtype=np.intp)], extent=(0, n, n, 0), origin='upper',
+              interpolation='nearest', aspect='equal')
+    edges = np.arange(n + 1)
+    lines = np.concatenate([np.stack([np.column_stack([edges, np.zeros(n + 1)]),
+                                      np.column_stack([edges, np.full(n + 1, n)])], axis=1),
+                            np.stack([np.column_stack([np.zeros(n + 1), edges]),
+                                      np.column_stack([np.full(n + 1, n), edges])], axis=1)])
+    ax.add_collection(LineCollection(lines, colors=edge_color, linewidths=lw, capstyle='projecting'))
+    ax.add_artist(CellLabels(mat, edges[:-1] + 0.5, edges[:-1] + 0.5, formatter=str,
+                             colors=text_color, size=fontsize))
 
     # configure ticks
     ticks = np.arange(n) + 0.5
@@ -1,44 +1,44 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.neighbors import KernelDensity
-from sklearn.model_selection import GridSearchCV
-from sklearn.model_selection import LeaveOneOut
 
+from ._binned_kde import binned_kde
+from ._scalable_kde import stratified_subsample, select_bandwidth, evaluate_kde
 
 
-
-
-
-
-
-def perform_kde(points, sample_fraction=0.1, bandwidth=1.0):
+def perform_kde(points, sample_fraction=0.1, bandwidth=1.0, max_samples=10000, random_state=0, strata=None, cv=5):
     """
     Perform kernel density estimation on a set of 2D points.
 
     Parameters:
     - points: numpy array of shape (n_samples, 2) representing the 2D points.
-    - sample_fraction: fraction of the points to sample if n_samples is large.
-    - bandwidth: the bandwidth of the kernel.
+    - sample_fraction: fraction of the points kept when subsampling.
+    - bandwidth: the bandwidth of the kernel; None or 'cv' selects it by K-fold
+      cross-validation, 'scott' or 'silverman' by the rule of thumb.
+    - max_samples: datasets with more points are subsampled to
+      max(max_samples, sample_fraction * n_samples) points.
+    - random_state: seed of the subsample and of the cross-validation folds.
+    - strata: optional stratum (e.g. label) of every point; the subsample keeps
+      the proportions of every stratum. Defaults to cells of a 16x16 grid.
+    - cv: number of folds of the bandwidth search.
 
     Returns:
     - kde: the kernel density estimate model.
     """
+    points = np.asarray(points, dtype=float)
     n_samples = len(points)
 
-    # Sample the points if the dataset is large
-    if n_samples > 10000:  # threshold for what we consider "large"
-        sample_size = int(n_samples * sample_fraction)
-        sampled_indices = np.random.choice(n_samples, size=sample_size, replace=False)
-        sampled_points = points[sampled_indices]
+    # Subsample large datasets, keeping the proportions of every stratum
+    if n_samples > max_samples:
+        sample_size = max(max_samples, int(n_samples * sample_fraction))
+        sampled_points = points[stratified_subsample(points, sample_size, random_state, strata=strata)]
     else:
         sampled_points = points
 
-    # Perform grid search to find the best bandwidth if not specified
-    if bandwidth is None:
-        params = {'bandwidth': np.logspace(-1, 1, 20)}
-        grid = GridSearchCV(KernelDensity(), params, cv=LeaveOneOut())
-        grid.fit(sampled_points)
-        best_bandwidth = grid.best_estimator_.bandwidth
+    # Search the best bandwidth if not specified
+    if bandwidth is None or isinstance(bandwidth, str):
+        best_bandwidth = select_bandwidth(sampled_points, method=bandwidth or 'cv', cv=cv,
+                                          random_state=random_state)
     else:
         best_bandwidth = bandwidth
 
@@ -49,7 +49,37 @@ def perform_kde(points, sample_fraction=0.1, bandwidth=1.0):
     return kde
 
 
-def plot_density(points, kde=None, ax=None, grid_size=100, xlim=None, ylim=None, **kwargs):
+def _evaluate_on_grid(points, kde, grid_size, xlim, ylim, method, n_jobs):
+    if kde is None:
+        kde = perform_kde(points)
+
+    if xlim is None:
+        xlim = (points[:, 0].min() - 1, points[:, 0].max() + 1)
+    if ylim is None:
+        ylim = (points[:, 1].min() - 1, points[:, 1].max() + 1)
+
+    if method == 'binned' and kde.kernel == 'gaussian':
+        # Same grid and density as score_samples, from the model's training points
+        weights = getattr(kde.tree_, 'sample_weight', None)
+        X, Y, Z = binned_kde(np.asarray(kde.tree_.data), grid_size=grid_size, bandwidth=kde.bandwidth_,
+                             xlim=xlim, ylim=ylim, weights=None if weights is None else np.asarray(weights))
+    elif method in ('binned', 'tree'):
+        # Create grid
+        xgrid = np.linspace(xlim[0], xlim[1], grid_size)
+        ygrid = np.linspace(ylim[0], ylim[1], grid_size)
+        X, Y = np.meshgrid(xgrid, ygrid)
+        xy_sample = np.vstack([X.ravel(), Y.ravel()]).T
+
+        # Evaluate KDE on grid
+        Z = np.exp(evaluate_kde(kde, xy_sample, n_jobs=n_jobs))  # log density
+        Z = Z.reshape(X.shape)
+    else:
+        raise ValueError(f"method must be 'binned' or 'tree', got {method!r}.")
+    return X, Y, Z, xlim, ylim
+
+
+def plot_density(points=None, kde=None, ax=None, grid_size=100, xlim=None, ylim=None, method='binned', n_jobs=1,
+                 accumulator=None, **kwargs):
     """
     Visualize the kernel density estimation.
 
@@ -60,28 +90,25 @@ def plot_density(points, kde=None, ax=None, grid_size=100, xlim=None, ylim=None,
     - grid_size: size of the grid on which to evaluate the KDE.
     - xlim: tuple (min, max), limits for the x-axis.
     - ylim: tuple (min, max), limits for the y-axis.
+    - method: 'binned' evaluates a Gaussian KDE on the grid by binned FFT convolution
+      of its training points; 'tree' calls kde.score_samples on every grid point.
+    - n_jobs: number of processes for the 'tree' evaluation.
+    - accumulator: a DensityAccumulator to draw instead of `points`; smoothed with the
+      bandwidth of `kde` if given, else Scott's rule on the accumulated moments.
     - **kwargs: additional keyword arguments to pass to the plt.contourf function.
     """
     if ax is None:
         fig, ax = plt.subplots(figsize=(7.2, 7.2))
 
-    if kde is None:
-        kde = perform_kde(points)
-
-    if xlim is None:
-        xlim = (points[:, 0].min() - 1, points[:, 0].max() + 1)
-    if ylim is None:
-        ylim = (points[:, 1].min() - 1, points[:, 1].max() + 1)
-
-    # Create grid
-    xgrid = np.linspace(xlim[0], xlim[1], grid_size)
-    ygrid = np.linspace(ylim[0], ylim[1], grid_size)
-    X, Y = np.meshgrid(xgrid, ygrid)
-    xy_sample = np.vstack([X.ravel(), Y.ravel()]).T
-
-    # Evaluate KDE on grid
-    Z = np.exp(kde.score_samples(xy_sample))  # log density
-    Z = Z.reshape(X.shape)
+    if accumulator is not None:
+        # Smooth the accumulated histogram on its own grid
+        X, Y, Z = accumulator.density(bandwidth='scott' if kde is None else kde.bandwidth_)
+        xlim = accumulator.xlim if xlim is None else xlim
+        ylim = accumulator.ylim if ylim is None else ylim
+    else:
+        if points is None:
+            raise ValueError("Either points or accumulator must be given.")
+        X, Y, Z, xlim, ylim = _evaluate_on_grid(points, kde, grid_size, xlim, ylim, method, n_jobs)
 
     # Set default kwargs for contourf
     contourf_defaults = {'levels': np.linspace(0, Z.max(), 25), 'cmap': 'Reds', 'alpha': 0.5}
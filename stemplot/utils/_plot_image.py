@@ -1,11 +1,26 @@
 import numpy as np
 from matplotlib.patches import Circle
 
-def plot_image(ax, img=None, clip=False, keep_spine=True, **kwargs):
+from ._tiled_image import TILED_THRESHOLD, TilePyramid, ax_add_tiled_image
+
+def plot_image(ax, img=None, clip=False, keep_spine=True, tiled=None, tile_size=256, cache_mb=256, **kwargs):
+    """
+    Show an image without ticks, optionally clipped to the inscribed circle.
+
+    Images above `TILED_THRESHOLD` pixels (or a `TilePyramid`) are shown as a
+    `TiledImage` that only draws the visible tiles at the resolution of the
+    current zoom; `tiled` forces this on or off. `tile_size` and `cache_mb`
+    configure its pyramid, see `TilePyramid`.
+    """
     if img is None:
         img = np.random.random((32, 32))
     h, w = img.shape[0:2]
-    im = ax.imshow(img, **kwargs)
+    if tiled is None:
+        tiled = isinstance(img, TilePyramid) or h * w > TILED_THRESHOLD
+    if tiled:
+        im = ax_add_tiled_image(ax, img, tile_size=tile_size, cache_mb=cache_mb, **kwargs)
+    else:
+        im = ax.imshow(img, **kwargs)
 
     ax.set_xticks([])
     ax.set_yticks([])
@@ -16,4 +31,5 @@ def plot_image(ax, img=None, clip=False, keep_spine=True, **kwargs):
 
     if clip == True:
         patch = Circle((0.5, 0.5), radius=0.5, transform=ax.transAxes)
-        im.set_clip_path(patch)
\ No newline at end of file
+        im.set_clip_path(patch)
+    return im
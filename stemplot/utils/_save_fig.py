@@ -1,7 +1,130 @@
 import warnings
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
 
-def save_fig(fig, filepath='fig.png', dpi=300, transparent=None, format=None, **savefig_kwargs):
+from ._export_cache import figure_hash, index_path, load_index, is_current, index_entries, update_index
+
+
+def _tight_layout(fig):
+    # Suppress tight_layout warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        try:
+            fig.tight_layout(pad=0)
+        except Exception:
+            pass
+
+
+def _tight_bbox(fig, dpi, pad_inches, bbox_extra_artists=None):
+    """
+    Tight bounding box of `fig` in inches, padded, from one draw pass
+    without rendering. Passing it as ``bbox_inches`` to `savefig` skips the
+    measurement draw that ``bbox_inches='tight'`` does on every save.
+    `bbox_extra_artists` are included as `savefig` would.
+    """
+    # text extents depend slightly on the dpi, measure at the saved one
+    fig_dpi = fig.dpi
+    fig.dpi = dpi
+    try:
+        fig.draw_without_rendering()
+        return fig.get_tightbbox(bbox_extra_artists=bbox_extra_artists).padded(pad_inches)
+    finally:
+        fig.dpi = fig_dpi
+
+
+def _export(fig, filepaths, dpi=300, transparent=None, format=None, layout=True, layout_entry=None, cache=None,
+            **savefig_kwargs):
+    """
+    Save `fig` to every path of `filepaths` with one layout and one tight-bbox
+    measurement, and return the timings.
+
+    `layout_entry`, the 'layout_cache' entry returned for an identical figure, restores
+    the axes positions and the bounding box instead of computing them.
+
+    With `cache`, nothing is saved when the export index says that all files
+    were written from a figure with the same hash; otherwise the index
+    entries of the written files are returned under 'cache_entries', for
+    the caller to store.
+    """
+    timings = {'layout': 0., 'measure': 0., 'render': {}, 'cached': False}
+    start = time.perf_counter()
+    pad_inches = savefig_kwargs.pop('pad_inches', 0.05)
+    bbox = savefig_kwargs.pop('bbox_inches', 'tight')
+
+    if cache:
+        # hashed before the layout pass changes the axes positions
+        index_file = index_path(filepaths[0], cache)
+        digest = figure_hash(fig, files=[os.path.basename(p) for p in filepaths], dpi=dpi,
+                             transparent=transparent, format=format, layout=layout, bbox_inches=bbox,
+                             pad_inches=pad_inches, **savefig_kwargs)
+        index = load_index(index_file)
+        if all(is_current(index, index_file, p, digest) for p in filepaths):
+            timings['cached'] = True
+            timings['total'] = time.perf_counter() - start
+            return timings
+    if isinstance(bbox, str) and bbox == 'tight':
+        if layout_entry is not None and len(layout_entry['positions']) == len(fig.axes):
+            for ax, position in zip(fig.axes, layout_entry['positions']):
+                ax.set_position(position)
+            bbox = Bbox.from_extents(*layout_entry['bbox'])
+        else:
+            if layout:
+                _tight_layout(fig)
+            t = time.perf_counter()
+            timings['layout'] = t - start
+            bbox = _tight_bbox(fig, dpi, pad_inches, savefig_kwargs.pop('bbox_extra_artists', None))
+            timings['measure'] = time.perf_counter() - t
+
+    for filepath in filepaths:
+        t = time.perf_counter()
+        # Determine output format
+        out_format = (format or os.path.splitext(filepath)[1].lstrip('.')).lower()
+
+        # Set transparency default: True for PNG, SVG, and PDF; False otherwise, unless explicitly provided
+        if transparent is None:
+            transparent_flag = True if out_format in ('png', 'svg', 'pdf') else False
+        else:
+            transparent_flag = transparent
+
+        # Build save parameters
+        save_params = {
+            'dpi': dpi,
+            'transparent': transparent_flag,
+            'bbox_inches': bbox,
+            'pad_inches': pad_inches,
+        }
+
+        if format:
+            save_params['format'] = format
+
+        # Merge any additional kwargs
+        save_params.update(savefig_kwargs)
+
+        # Save the figure
+        fig.savefig(filepath, **save_params)
+        timings['render'][filepath] = time.perf_counter() - t
+
+    if isinstance(bbox, Bbox):
+        timings['layout_cache'] = {'bbox': [float(v) for v in bbox.extents],
+                                   'positions': [[float(v) for v in ax.get_position().bounds] for ax in fig.axes]}
+    if cache:
+        timings['cache_entries'] = (index_file, index_entries(index_file, filepaths, digest))
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+
+def _output_paths(path, formats):
+    if formats is None:
+        return [os.fspath(path)]
+    stem = os.path.splitext(os.fspath(path))[0]
+    return [f'{stem}.{fmt.lstrip(".")}' for fmt in formats]
+
+
+def save_fig(fig, filepath='fig.png', dpi=300, transparent=None, format=None, formats=None, cache=False,
+             **savefig_kwargs):
     """
     Save a Matplotlib Figure with trimmed whitespace, supporting multiple formats.
     Defaults to transparent background for PNG, SVG, and PDF if not specified.
@@ -19,6 +142,16 @@ def save_fig(fig, filepath='fig.png', dpi=300, transparent=None, format=None, **
         If None, PNG, SVG, and PDF outputs default to True; other formats default to False.
     format : str or None, optional
         Explicit format string (e.g., 'png', 'pdf'). If None, inferred from `filepath` extension.
+    formats : sequence of str, optional
+        Save one file per format, e.g. ``('png', 'pdf', 'svg')``, replacing the extension
+        of `filepath`. The layout and the tight bounding box are computed once and reused
+        by every format, instead of once per file.
+    cache : bool or str, optional
+        Skip saving when the files were already written from an identical figure. The figure
+        content (artist data and properties, relevant rcParams) and the save options are hashed
+        and compared with a sidecar index, by default ``.stemplot_export_cache.json`` next to
+        the files, or the index file given. Files modified since they were written are saved
+        again.
     **savefig_kwargs
         Any additional keyword arguments passed directly to `fig.savefig`.
 
@@ -28,38 +161,111 @@ def save_fig(fig, filepath='fig.png', dpi=300, transparent=None, format=None, **
     >>> save_fig(fig, 'figure.svg')
     >>> save_fig(fig, 'figure.pdf', dpi=600)
     >>> save_fig(fig, 'figure.eps', transparent=False)
+    >>> save_fig(fig, 'figure', formats=('png', 'pdf', 'svg'))
+    >>> save_fig(fig, 'figure.png', cache=True)
     """
-    # Suppress tight_layout warnings
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", UserWarning)
-        try:
-            fig.tight_layout(pad=0)
-        except Exception:
-            pass
+    if formats is not None and format is not None:
+        raise ValueError("Pass either format or formats, not both.")
+    timings = _export(fig, _output_paths(filepath, formats), dpi=dpi, transparent=transparent, format=format,
+                      cache=cache, **savefig_kwargs)
+    if 'cache_entries' in timings:
+        update_index(*timings['cache_entries'])
 
-    # Determine output format
-    out_format = (format or os.path.splitext(filepath)[1].lstrip('.')).lower()
 
-    # Set transparency default: True for PNG, SVG, and PDF; False otherwise, unless explicitly provided
-    if transparent is None:
-        transparent_flag = True if out_format in ('png', 'svg', 'pdf') else False
-    else:
-        transparent_flag = transparent
+def _init_save_worker():
+    import matplotlib.pyplot as plt
+    plt.switch_backend('agg')
+
+
+def _save_one(task):
+    fig, filepaths, layout_entry, close, kwargs = task
+    import matplotlib.pyplot as plt
+    t = time.perf_counter()
+    if not isinstance(fig, Figure):
+        fig, close = fig(), True
+    build = time.perf_counter() - t
+    try:
+        timings = _export(fig, filepaths, layout_entry=layout_entry, **kwargs)
+    finally:
+        if close:
+            plt.close(fig)
+    timings['build'] = build
+    timings['total'] += build
+    timings['files'] = filepaths
+    return timings
+
+
+def save_figs(figs_or_factories, paths, formats=None, n_jobs=None, dpi=300, transparent=None,
+              layout=True, layout_cache=None, cache=False, **savefig_kwargs):
+    """
+    Save many figures, each to one or more formats, in parallel processes.
+
+    Figures are rendered with the Agg backend in a process pool. For every
+    figure the layout and the tight bounding box are computed once and the
+    fixed box is reused by all its formats, so a figure saved as PNG, PDF and
+    SVG costs one measurement pass and three renders instead of three of each.
 
-    # Build save parameters
-    save_params = {
-        'dpi': dpi,
-        'transparent': transparent_flag,
-        'bbox_inches': 'tight',
-        'pad_inches': 0.05,
-    }
+    Parameters
+    ----------
+    figs_or_factories : sequence of Figure or callable
+        Figures, or picklable callables (e.g. module-level functions or
+        ``functools.partial``) that build a figure in the worker, which
+        avoids pickling the figures.
+    paths : sequence of str
+        One output path per figure. With `formats`, the extension is replaced
+        by each format.
+    formats : sequence of str, optional
+        Output formats, e.g. ``('png', 'pdf', 'svg')``.
+    n_jobs : int, optional
+        Number of worker processes. Defaults to the number of CPUs; 1 saves
+        in the calling process.
+    dpi, transparent, **savefig_kwargs
+        See `save_fig`.
+    layout : bool, default True
+        Call ``fig.tight_layout(pad=0)`` before measuring, as `save_fig` does.
+    layout_cache : dict, optional
+        Maps a path of `paths` to the axes positions and the padded tight
+        bounding box measured for it. Figures with an entry get these
+        restored and skip the layout and measurement passes; the layouts
+        measured by this call are added to it, so the dict (e.g. stored as
+        JSON) can be passed to later runs that regenerate the same figures.
+    cache : bool or str, optional
+        Skip figures whose files were already written from identical figures,
+        see `save_fig`. Factories are still called to hash their figure. The
+        index is updated by the calling process only.
 
-    if format:
-        save_params['format'] = format
+    Returns
+    -------
+    list of dict
+        Per figure timings in seconds, in the order of `paths`: 'build'
+        (unpickling or calling the factory), 'layout', 'measure', 'render'
+        (per written file) and 'total', plus the written 'files', whether it
+        was skipped as 'cached' and the 'layout_cache' entry of the figure.
+    """
+    if len(figs_or_factories) != len(paths):
+        raise ValueError(f"Got {len(figs_or_factories)} figures but {len(paths)} paths.")
+    n_jobs = n_jobs or os.cpu_count() or 1
+    kwargs = dict(savefig_kwargs, dpi=dpi, transparent=transparent, layout=layout, cache=cache)
+    layouts = {} if layout_cache is None else layout_cache
 
-    # Merge any additional kwargs
-    save_params.update(savefig_kwargs)
+    # figures sent to workers are copies, closed once saved
+    tasks = [(fig, _output_paths(path, formats), layouts.get(os.fspath(path)), n_jobs > 1, kwargs)
+             for fig, path in zip(figs_or_factories, paths)]
+    if n_jobs == 1:
+        results = [_save_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_save_worker) as executor:
+            results = list(executor.map(_save_one, tasks))
 
-    # Save the figure
-    fig.savefig(filepath, **save_params)
+    for path, timings in zip(paths, results):
+        if 'layout_cache' in timings:
+            layouts.setdefault(os.fspath(path), timings['layout_cache'])
 
+    entries = {}
+    for timings in results:
+        if 'cache_entries' in timings:
+            index_file, written = timings['cache_entries']
+            entries.setdefault(index_file, {}).update(written)
+    for index_file, written in entries.items():
+        update_index(index_file, written)
+    return results
@@ -0,0 +1,175 @@
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.ndimage import map_coordinates
+from scipy.signal import fftconvolve
+
+from ._binned_kde import kde_bandwidth, linear_binning, _gaussian_kernel
+
+
+def stratified_subsample(points, n_samples, random_state=0, strata=None, n_cells=16):
+    """
+    Indices of a seeded subsample that keeps the proportions of every stratum.
+
+    Each stratum contributes ``n_samples * size / len(points)`` points, with
+    the leftover quota going to the strata with the largest remainders, and
+    the points within a stratum are drawn at random. By default the strata
+    are the cells of an ``n_cells`` x ``n_cells`` grid over the bounding box
+    of the points, so sparse regions stay represented.
+
+    Parameters
+    ----------
+    points : np.ndarray, shape (N, 2)
+        Points to subsample.
+    n_samples : int
+        Size of the subsample.
+    random_state : int or np.random.Generator, default 0
+        Seed of the draw.
+    strata : np.ndarray, shape (N,), optional
+        Stratum (e.g. class label) of every point.
+    n_cells : int, default 16
+        Grid cells per axis of the default spatial strata.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices into `points`.
+    """
+    n = len(points)
+    if n_samples >= n:
+        return np.arange(n)
+    rng = np.random.default_rng(random_state)
+    if strata is None:
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        cells = ((points - lo) / np.where(hi > lo, hi - lo, 1) * n_cells).astype(np.intp)
+        cells = np.minimum(cells, n_cells - 1)
+        strata = cells[:, 0] * n_cells + cells[:, 1]
+    _, codes, counts = np.unique(strata, return_inverse=True, return_counts=True)
+    codes = codes.ravel()
+
+    quota = counts * (n_samples / n)
+    take = np.floor(quota).astype(np.intp)
+    leftover = n_samples - take.sum()
+    take[np.argsort(take - quota)[:leftover]] += 1
+
+    # random order within every stratum, then keep the first `take` of each
+    order = rng.permutation(n)
+    order = order[np.argsort(codes[order], kind='stable')]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(n) - np.repeat(starts, counts)
+    return np.sort(order[rank < np.repeat(take, counts)])
+
+
+def _cv_log_likelihood(points, bandwidths, folds, grid_size):
+    """
+    Held-out log-likelihood of isotropic Gaussian KDEs, one per bandwidth,
+    with every training fold evaluated by binned FFT convolution.
+
+    Bandwidths that a grid of at most `grid_size` cells per axis cannot
+    resolve score -inf: binned on a grid coarser than half the bandwidth, their
+    likelihood would be biased.
+    """
+    scores = np.full(len(bandwidths), -np.inf)
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    for k, bw in enumerate(bandwidths):
+        # grid fine enough to resolve the kernel and wide enough to hold it
+        xlim = (lo[0] - 4 * bw, hi[0] + 4 * bw)
+        ylim = (lo[1] - 4 * bw, hi[1] + 4 * bw)
+        nx = int(np.ceil((xlim[1] - xlim[0]) / (bw / 2))) + 1
+        ny = int(np.ceil((ylim[1] - ylim[0]) / (bw / 2))) + 1
+        if max(nx, ny) > grid_size:
+            continue
+        nx, ny = max(nx, 32), max(ny, 32)
+        scores[k] = 0
+        dx = (xlim[1] - xlim[0]) / (nx - 1)
+        dy = (ylim[1] - ylim[0]) / (ny - 1)
+        kernel = np.outer(_gaussian_kernel(bw / dy, ny, 4.0), _gaussian_kernel(bw / dx, nx, 4.0))
+        for train, test in folds:
+            grid = linear_binning(points[train], xlim, ylim, (nx, ny))
+            Z = fftconvolve(grid, kernel, mode='same') / (len(train) * dx * dy)
+            coords = [(points[test, 1] - ylim[0]) / dy, (points[test, 0] - xlim[0]) / dx]
+            density = map_coordinates(Z, coords, order=1)
+            scores[k] += np.log(np.maximum(density, 1e-300)).sum()
+    return scores
+
+
+def select_bandwidth(points, method='cv', bandwidths=None, cv=5, random_state=0, grid_size=512):
+    """
+    Bandwidth of an isotropic Gaussian KDE of 2D points.
+
+    Parameters
+    ----------
+    points : np.ndarray, shape (N, 2)
+        Points.
+    method : {'cv', 'scott', 'silverman'}, default 'cv'
+        'cv' maximizes the K-fold held-out log-likelihood over `bandwidths`,
+        evaluating every fold by binned FFT convolution instead of one tree
+        query per held-out point. 'scott' and 'silverman' are the rules of
+        thumb, using the geometric mean of the per-axis bandwidths.
+    bandwidths : array-like, optional
+        Candidates for 'cv', ``np.logspace(-1, 1, 20)`` by default.
+    cv : int, default 5
+        Number of folds.
+    random_state : int, default 0
+        Seed of the fold shuffling.
+    grid_size : int, default 512
+        Largest grid used to evaluate a fold. Candidates below about
+        ``2 * range / grid_size`` need a finer grid; they are skipped with a
+        warning.
+
+    Returns
+    -------
+    float
+    """
+    points = np.asarray(points, dtype=float)
+    if method in ('scott', 'silverman'):
+        return float(np.sqrt(np.prod(kde_bandwidth(points, method))))
+    if method != 'cv':
+        raise ValueError(f"method must be 'cv', 'scott' or 'silverman', got {method!r}.")
+    if bandwidths is None:
+        bandwidths = np.logspace(-1, 1, 20)
+    bandwidths = np.asarray(bandwidths, dtype=float)
+
+    fold_of = np.random.default_rng(random_state).permutation(len(points)) % cv
+    folds = [(np.flatnonzero(fold_of != k), np.flatnonzero(fold_of == k)) for k in range(cv)]
+    scores = _cv_log_likelihood(points, bandwidths, folds, grid_size)
+    skipped = np.isneginf(scores)
+    if skipped.all():
+        raise ValueError(f"No bandwidth candidate can be resolved with grid_size={grid_size}; "
+                         f"raise grid_size or pass larger bandwidths.")
+    if skipped.any():
+        warnings.warn(f"Skipped bandwidths {bandwidths[skipped].tolist()}: resolving them needs a grid "
+                      f"larger than grid_size={grid_size}.", RuntimeWarning)
+    return float(bandwidths[np.argmax(scores)])
+
+
+_KDE = None
+
+
+def _init_kde_worker(kde):
+    global _KDE
+    _KDE = kde
+
+
+def _score_chunk(xy):
+    return _KDE.score_samples(xy)
+
+
+def evaluate_kde(kde, xy, n_jobs=1, chunk_size=100_000):
+    """
+    Log density of a fitted ``sklearn.neighbors.KernelDensity`` at `xy`.
+
+    The points are scored in chunks of `chunk_size`; with ``n_jobs > 1`` the
+    chunks are spread over worker processes, each receiving the fitted model
+    once.
+
+    Returns
+    -------
+    np.ndarray, shape (N,)
+    """
+    xy = np.asarray(xy, dtype=float)
+    chunks = [xy[i:i + chunk_size] for i in range(0, len(xy), chunk_size)]
+    if n_jobs == 1 or len(chunks) <= 1:
+        return np.concatenate([kde.score_samples(c) for c in chunks]) if chunks else np.empty(0)
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_kde_worker, initargs=(kde,)) as executor:
+        return np.concatenate(list(executor.map(_score_chunk, chunks)))
@@ -0,0 +1,260 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from matplotlib import rcParams
+
+from ._heatmap_pyramid import PyramidImage, _block_reduce
+
+
+# images with more pixels than this are shown as a TiledImage by plot_image
+# and interactive.imshow
+TILED_THRESHOLD = 4096 * 4096
+
+TILE_REDUCTIONS = ('mean', 'max', 'nearest')
+
+
+class TilePyramid:
+    """
+    Lazily built, tiled multi-resolution pyramid of an image.
+
+    The image (2D, or RGB(A) with channels last; a ``np.memmap`` works) is
+    cut into square tiles of `tile_size` pixels at every level, level k
+    being downsampled by ``2**k``. A tile is only computed when it is first
+    requested, from the four tiles below it ('mean', 'max') or by striding
+    through the image ('nearest'), and kept in an LRU cache bounded in
+    megabytes. Tiles can be computed ahead of time by a background thread
+    with `prefetch`.
+
+    Parameters
+    ----------
+    img : np.ndarray, shape (M, N) or (M, N, C)
+        Image to display.
+    tile_size : int, default 256
+        Side of a tile in pixels.
+    reduce : {'mean', 'max', 'nearest'}, default 'mean'
+        Downsampling of the coarser levels.
+    cache_mb : float, default 256
+        Memory bound of the tile cache. Evicted tiles are recomputed when
+        needed again.
+    """
+
+    vmin = vmax = None
+
+    def __init__(self, img, tile_size=256, reduce='mean', cache_mb=256):
+        if reduce not in TILE_REDUCTIONS:
+            raise ValueError(f"reduce must be one of {TILE_REDUCTIONS}, got {reduce!r}.")
+        if np.ndim(img) not in (2, 3):
+            raise ValueError(f"Expected a 2D or RGB(A) image, got shape {np.shape(img)}.")
+        self.img = img
+        self.tile_size = int(tile_size)
+        self.reduce = reduce
+        self.cache_bytes = int(cache_mb * 2 ** 20)
+        self.n_levels = 1
+        while max(self.level_shape(self.n_levels - 1)) > self.tile_size:
+            self.n_levels += 1
+
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def shape(self):
+        return self.img.shape
+
+    @property
+    def cached_bytes(self):
+        return self._cached_bytes
+
+    def level_shape(self, level):
+        h, w = self.img.shape[:2]
+        s = 2 ** level
+        return -(-h // s), -(-w // s)
+
+    def level_for(self, cells_per_pixel):
+        """Coarsest level that still has at least one cell per screen pixel."""
+        if cells_per_pixel <= 1:
+            return 0
+        return int(min(np.floor(np.log2(cells_per_pixel)), self.n_levels - 1))
+
+    def tiles_in(self, level, r0, r1, c0, c1):
+        """Keys ``(level, i, j)`` of the tiles covering rows r0:r1, columns c0:c1 of a level."""
+        t = self.tile_size
+        rows = range(r0 // t, -(-r1 // t))
+        cols = range(c0 // t, -(-c1 // t))
+        return [(level, i, j) for i in rows for j in cols]
+
+    def _cached(self, key):
+        with self._lock:
+            tile = self._cache.get(key)
+            if tile is not None:
+                self._cache.move_to_end(key)
+            return tile
+
+    def _store(self, key, tile):
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = tile
+            self._cached_bytes += tile.nbytes
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, old = self._cache.popitem(last=False)
+                self._cached_bytes -= old.nbytes
+
+    def _compute(self, key):
+        tile = self._cached(key)
+        if tile is not None:
+            return tile
+        level, i, j = key
+        t = self.tile_size
+        if level == 0:
+            tile = np.asarray(self.img[i * t:(i + 1) * t, j * t:(j + 1) * t])
+        elif self.reduce == 'nearest':
+            s = 2 ** level
+            tile = np.asarray(self.img[i * t * s:(i + 1) * t * s:s, j * t * s:(j + 1) * t * s:s])
+        else:
+            # the four tiles of the level below; missing ones are off the image
+            h, w = self.level_shape(level - 1)
+            rows = [r for r in (2 * i, 2 * i + 1) if r * t < h]
+            cols = [c for c in (2 * j, 2 * j + 1) if c * t < w]
+            children = np.concatenate([np.concatenate([self._compute((level - 1, r, c)) for c in cols], axis=1)
+                                       for r in rows], axis=0)
+            tile = _block_reduce(children, self.reduce)
+            if self.reduce == 'mean' and np.issubdtype(self.img.dtype, np.integer):
+                # keep e.g. uint8 RGB in its value range for imshow
+                tile = np.rint(tile).astype(self.img.dtype)
+        self._store(key, tile)
+        return tile
+
+    def tile(self, key):
+        """The tile ``(level, i, j)``, waiting for it if it is being prefetched."""
+        tile = self._cached(key)
+        if tile is not None:
+            return tile
+        future = self._pending.get(key)
+        if future is not None:
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+        return self._compute(key)
+
+    def read(self, level, r0, r1, c0, c1):
+        """Rows ``r0:r1`` and columns ``c0:c1`` of a level, assembled from tiles."""
+        t = self.tile_size
+        out = None
+        for key in self.tiles_in(level, r0, r1, c0, c1):
+            tile = self.tile(key)
+            if out is None:
+                out = np.empty((r1 - r0, c1 - c0) + tile.shape[2:], dtype=tile.dtype)
+            # top left corner of the tile in level and in window coordinates
+            y, x = key[1] * t, key[2] * t
+            sub = tile[max(r0 - y, 0):r1 - y, max(c0 - x, 0):c1 - x]
+            y, x = max(y - r0, 0), max(x - c0, 0)
+            out[y:y + sub.shape[0], x:x + sub.shape[1]] = sub
+        return out
+
+    def prefetch(self, keys):
+        """
+        Compute `keys` in the background thread, in order. Prefetches that
+        have not started yet are dropped, so only the latest request is kept.
+        """
+        # cancelled futures leave _pending through their done callback
+        for future in list(self._pending.values()):
+            future.cancel()
+        for key in keys:
+            if key in self._pending or self._cached(key) is not None:
+                continue
+            future = self._executor.submit(self._compute, key)
+            self._pending[key] = future
+            future.add_done_callback(lambda f, key=key: self._pending.pop(key, None))
+
+    def close(self):
+        """Stop the prefetch thread."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class TiledImage(PyramidImage):
+    """
+    Image artist that shows a `TilePyramid`, for images too large for one
+    `AxesImage` (e.g. stitched STEM montages).
+
+    Only the tiles of the level matching the zoom that are in view are
+    assembled and resampled at each draw. When the view limits change (pan,
+    zoom), the newly visible tiles and a ring of neighbours at the same
+    level, plus the parent level, are queued for the background thread of
+    the pyramid, so that panning finds them in the cache.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    pyramid : TilePyramid
+        Image to display.
+    prefetch : bool, default True
+        Prefetch tiles around the view on pan and zoom.
+    **kwargs
+        Passed to `matplotlib.image.AxesImage` (e.g. cmap, norm, interpolation).
+    """
+
+    def __init__(self, ax, pyramid, prefetch=True, **kwargs):
+        super().__init__(ax, pyramid, tile_size=pyramid.tile_size, **kwargs)
+        self.prefetch = prefetch
+        if prefetch:
+            ax.callbacks.connect('xlim_changed', self._on_view_change)
+            ax.callbacks.connect('ylim_changed', self._on_view_change)
+
+    def _prefetch_keys(self, window):
+        level, r0, r1, c0, c1 = window
+        t = self.tile_size
+        lh, lw = self.pyramid.level_shape(level)
+        # visible tiles first, then one tile around them, then the next level up
+        keys = self.pyramid.tiles_in(level, r0, r1, c0, c1)
+        keys += [k for k in self.pyramid.tiles_in(level, max(r0 - t, 0), min(r1 + t, lh),
+                                                  max(c0 - t, 0), min(c1 + t, lw)) if k not in keys]
+        if level + 1 < self.pyramid.n_levels:
+            ph, pw = self.pyramid.level_shape(level + 1)
+            keys += self.pyramid.tiles_in(level + 1, r0 // 2, min(-(-r1 // 2), ph),
+                                          c0 // 2, min(-(-c1 // 2), pw))
+        return keys
+
+    def _on_view_change(self, ax):
+        window = self._view_window()
+        if window is not None:
+            self.pyramid.prefetch(self._prefetch_keys(window))
+
+
+def ax_add_tiled_image(ax, img, tile_size=256, reduce='mean', cache_mb=256, prefetch=True, **kwargs):
+    """
+    Show `img` on `ax` as a `TiledImage` and frame it, like ``ax.imshow``.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    img : np.ndarray or TilePyramid
+        Image, or a pyramid to share between axes.
+    tile_size, reduce, cache_mb
+        See `TilePyramid`; ignored when `img` is a pyramid.
+    prefetch : bool, default True
+        See `TiledImage`.
+    **kwargs
+        Passed to `TiledImage`; ``aspect`` is applied to the axes.
+
+    Returns
+    -------
+    TiledImage
+    """
+    if not isinstance(img, TilePyramid):
+        img = TilePyramid(img, tile_size=tile_size, reduce=reduce, cache_mb=cache_mb)
+    aspect = kwargs.pop('aspect', rcParams['image.aspect'])
+    im = TiledImage(ax, img, prefetch=prefetch, **kwargs)
+    ax.add_image(im)
+    x0, x1, y0, y1 = im.full_extent
+    ax.update_datalim([(x0, y1), (x1, y0)])
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
+    ax.set_aspect(aspect)
+    return im
@@ -0,0 +1,84 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from PIL import Image
+
+from stemplot.arrows import ArrowAnimator, get_arrow
+
+
+def test_arrow_animator_batches_and_exports(tmp_path):
+    fig, (ax0, ax1) = plt.subplots(1, 2)
+    anim = ArrowAnimator(fig, dash_on_length=4, dash_off_length=2)
+    for ax in (ax0, ax1):
+        anim.add_arrows([get_arrow((0, 0), (1, k), radius=0.1, head_length=0.1) for k in range(5)],
+                        ax=ax)
+    anim.add_arrow(*get_arrow((0.1, 0.5), (0.9, 0.5), radius=0, head_length=0.02))
+    line, = ax0.plot([0, 1], [1, 0])
+    anim.add_line(line, phase=2)
+    assert not line.get_visible()
+
+    # one LineCollection per axes plus one for the figure
+    assert len(anim.collections) == 3
+    assert len(anim.collections[0].get_segments()) == 6
+
+    anim._update(3)
+    # matplotlib scales dash offsets by the line width and wraps them by the period
+    offsets = np.array([ls[0] for ls in anim.collections[0].get_linestyle()])
+    lws = anim.collections[0].get_linewidth()
+    assert np.allclose(offsets / lws, [3] * 5 + [5])
+
+    path = tmp_path / 'arrows.gif'
+    anim.save(path)
+    with Image.open(path) as im:
+        assert im.n_frames == 6
+    plt.close(fig)
+
+
+def test_arrow_animator_pushes_arrows_once_before_draw(monkeypatch):
+    calls = []
+    set_segments = LineCollection.set_segments
+
+    def counting_set_segments(self, segments):
+        calls.append(len(segments))
+        set_segments(self, segments)
+
+    monkeypatch.setattr(LineCollection, 'set_segments', counting_set_segments)
+
+    fig, ax = plt.subplots()
+    anim = ArrowAnimator(fig)
+    anim.add_arrows([get_arrow((0, 0), (1, k), radius=0.1, head_length=0.1) for k in range(50)], ax=ax)
+    anim.add_arrow(*get_arrow((0, 1), (1, 0), radius=0, head_length=0.1), ax=ax)
+    assert calls == [0]  # the empty collection
+    # a plain draw, without the animation, shows every arrow
+    fig.canvas.draw()
+    assert calls == [0, 51]
+    assert len(ax.collections[0].get_segments()) == 51
+    assert len(ax.collections[1].get_paths()) == 51
+    fig.canvas.draw()
+    assert calls == [0, 51]
+    plt.close(fig)
+
+
+def test_arrow_animator_blits_axes_and_figure_arrows():
+    fig, ax = plt.subplots()
+    anim = ArrowAnimator(fig, dash_on_length=4, dash_off_length=2)
+    anim.add_arrow(*get_arrow((0, 0), (1, 1), radius=0.1, head_length=0.1), ax=ax)
+    anim.add_arrow(*get_arrow((0.1, 0.5), (0.9, 0.5), radius=0, head_length=0.02), phase=1)
+    ani = anim.animate(blit=True)
+    fig.canvas.draw()
+    for _ in range(3):
+        ani._step()
+
+    # figure arrows live in an overlay that is neither in fig.axes nor hit by the mouse
+    overlay = anim.collections[1].axes
+    assert overlay is not None and overlay not in fig.axes
+    assert fig.canvas.inaxes(ax.transAxes.transform((0.5, 0.5))) is ax
+    offsets = [lc.get_linestyle()[0][0] / lc.get_linewidth()[0] for lc in anim.collections]
+    assert np.allclose(offsets, [(0 - 2) % 6, (1 - 2) % 6])
+    # the figure arrow is drawn left of the axes, where nothing else is
+    rgba = np.asarray(fig.canvas.buffer_rgba())
+    w, h = fig.bbox.size.astype(int)
+    assert np.any(rgba[h // 2 - 3:h // 2 + 3, int(0.1 * w):int(0.12 * w), :3] != 255)
+    plt.close(fig)
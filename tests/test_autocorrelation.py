@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from scipy.signal import correlate
+
+from stemplot.interactive._autocorrelation import (autocorrelation_fft, estimate_patch_sizes,
+                                                   radial_profile)
+
+
+@pytest.mark.parametrize("shape", [(64, 64), (63, 80), (50, 51)])
+def test_autocorrelation_matches_correlate_same(shape):
+    """The rFFT autocorrelation equals scipy's 'same' correlation of the standardized image."""
+    img = np.random.default_rng(0).random(shape)
+    std = (img - img.mean()) / img.std()
+    expected = correlate(std, std, mode='same', method='fft')
+    np.testing.assert_allclose(autocorrelation_fft(img), expected, atol=1e-8)
+
+
+def test_float32_batch():
+    """float32 batches stay float32 and match the per-image result."""
+    imgs = np.random.default_rng(1).random((3, 32, 40)).astype(np.float32)
+    ac = autocorrelation_fft(imgs)
+    assert ac.dtype == np.float32
+    profiles = radial_profile(ac)
+    assert profiles.dtype == np.float32
+    np.testing.assert_allclose(profiles[1], radial_profile(ac[1]), rtol=1e-4, atol=1e-3)
+
+
+def test_estimate_patch_sizes_lattice():
+    """A square lattice of period p gives a patch size close to p * sqrt(2)."""
+    rng = np.random.default_rng(2)
+    yy, xx = np.mgrid[:256, :256]
+    imgs = [np.cos(2 * np.pi * xx / p) + np.cos(2 * np.pi * yy / p) + rng.normal(0, .3, (256, 256))
+            for p in (8, 15)]
+    sizes = estimate_patch_sizes(imgs)
+    np.testing.assert_allclose(sizes, [8 * np.sqrt(2), 15 * np.sqrt(2)], atol=3)
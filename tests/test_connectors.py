@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.patches import Polygon
+
+from stemplot.arrows import connect_by_branches_collection, connect_by_gradients
+from stemplot.arrows._connectors import _gradient_polygon
+
+
+def test_connect_by_branches_collection():
+    fig, axs = plt.subplots(4, 2)
+    pc = connect_by_branches_collection(axs[0, 0], axs[:, 1])
+    # one closed path per target, all in one artist
+    assert len(pc.get_paths()) == 4
+    assert pc in fig.artists
+    verts = pc.get_paths()[2].vertices
+    x0, y0, w, h = axs[0, 0].get_position().bounds
+    x1, y1, w1, h1 = axs[2, 1].get_position().bounds
+    assert np.allclose(verts[0], [x0 + w, y0 + h / 2])
+    assert np.allclose(verts[7], [x1, y1 + h1 / 2])
+    fig.canvas.draw()
+
+
+def test_connect_by_gradients_single_image():
+    fig, axs = plt.subplots(2, 3, dpi=50)
+    n_axes = len(fig.axes)
+    im = connect_by_gradients([(axs[0, 0], axs[0, 1]), (axs[0, 1], axs[0, 2])], alpha=0.5)
+    assert len(fig.axes) == n_axes + 1
+    rgba = im.get_array()
+    assert rgba.shape[:2] == tuple(np.round(fig.bbox.size[::-1]).astype(int))
+    # transparent outside the gaps between panels
+    assert set(np.unique(rgba[..., 3])) <= {0, 0.5}
+    assert len(im.get_clip_path().get_fully_transformed_path().vertices) == 10
+    fig.canvas.draw()
+
+
+def _gradient_reference(fig, pts, direction, cmap='gray', alpha=0.5):
+    # one connection as _arrow_old.connect_by_gradient draws it: a 2x2
+    # bicubic image over the bounding box, clipped by the polygon
+    xmin, ymin = pts.min(axis=0)
+    w, h = np.ptp(pts, axis=0)
+    ax_ = fig.add_axes([xmin, ymin, w, h])
+    ax_.axis('off')
+    phi = direction * np.pi / 2
+    v = np.array([np.cos(phi), np.sin(phi)])
+    X = np.array([[v @ [1, 0], v @ [1, 1]],
+                  [v @ [0, 0], v @ [0, 1]]])
+    X = X / X.max()
+    im = ax_.imshow(X, extent=[0, 1, 0, 1], aspect='auto', interpolation='bicubic', vmin=0, vmax=1,
+                    cmap=cmap, alpha=alpha, zorder=-2)
+    im.set_clip_path(Polygon(pts, transform=fig.transFigure))
+
+
+@pytest.mark.parametrize('direction', [0, 1, 0.5])
+def test_connect_by_gradients_matches_old_rendering(direction):
+    def render(new):
+        fig = plt.figure(figsize=(4, 3), dpi=100)
+        ax1 = fig.add_axes([0.05, 0.1, 0.3, 0.8])
+        ax2 = fig.add_axes([0.65, 0.3, 0.3, 0.4])
+        for ax in (ax1, ax2):
+            ax.axis('off')
+        if new:
+            connect_by_gradients([(ax1, ax2)], direction=direction)
+        else:
+            _gradient_reference(fig, _gradient_polygon(ax1, ax2, 'right', 'left'), direction)
+        fig.canvas.draw()
+        buf = np.asarray(fig.canvas.buffer_rgba(), dtype=float) / 255
+        plt.close(fig)
+        return buf
+
+    diff = np.abs(render(True) - render(False))
+    # rounding to 8 bits only
+    assert diff.max() <= 1 / 255 + 1e-9
@@ -0,0 +1,139 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.backend_bases import KeyEvent, TimerBase
+
+from stemplot.interactive._data_slicer import DataSlicer, imshow
+
+
+def test_imshow_pages_through_memmap(tmp_path):
+    path = tmp_path / 'stack.npy'
+    stack = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(20, 16, 16))
+    stack[:] = np.arange(20, dtype=np.float32)[:, None, None]
+    stack.flush()
+    ds = imshow(np.load(path, mmap_mode='r'), cache_size=4)
+    canvas = ds.ax.figure.canvas
+    canvas.draw()
+    for _ in range(7):
+        ds.press_key(KeyEvent('key_press_event', canvas, 'right'))
+    assert ds.ind == 7
+    assert ds.artist.get_array()[0, 0] == 7
+    assert len(ds.data._cache) <= 4
+    ds.press_key(KeyEvent('key_press_event', canvas, 'left'))
+    assert ds.artist.get_array()[0, 0] == 6
+    plt.close(ds.ax.figure)
+
+
+def test_paging_without_event_loop_does_not_blit():
+    fig, ax = plt.subplots()
+    ds = DataSlicer(ax, np.arange(3 * 64, dtype=float).reshape(3, 8, 8))
+    fig.canvas.draw()
+    ds.press_key(KeyEvent('key_press_event', fig.canvas, 'right'))
+    # the Agg timer never fires, so nothing may be left for it to undo
+    assert not ds.artist.get_animated() and ax.xaxis.label.get_visible()
+    plt.close(fig)
+
+
+class _FiringTimer(TimerBase):
+    """Timer of an interactive canvas, fired by hand."""
+
+
+def test_blitting_is_undone_by_settle_timer_and_export(monkeypatch, tmp_path):
+    fig, ax = plt.subplots()
+    monkeypatch.setattr(fig.canvas, 'new_timer', lambda **kwargs: _FiringTimer(**kwargs))
+    ds = DataSlicer(ax, np.arange(3 * 64, dtype=float).reshape(3, 8, 8))
+    fig.canvas.draw()
+    ds.press_key(KeyEvent('key_press_event', fig.canvas, 'right'))
+    assert ds.artist.get_animated() and not ax.xaxis.label.get_visible()
+    ds._settle_timer._on_timer()
+    assert not ds.artist.get_animated() and ax.xaxis.label.get_visible()
+
+    ds.press_key(KeyEvent('key_press_event', fig.canvas, 'right'))
+    ds.export(tmp_path / 'slices.png', n_jobs=1)
+    assert not ds.artist.get_animated() and ax.xaxis.label.get_visible()
+    plt.close(fig)
+
+def test_slicer_reads_file_list(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f'{i}.npy')
+        np.save(paths[-1], np.full((8, 8), i, dtype=float))
+    fig, ax = plt.subplots()
+    ds = DataSlicer(ax, paths)
+    assert ds.num_slices == 3
+    assert ds.data[2][0, 0] == 2
+    plt.close(fig)
+
+
+def test_point_limits_cover_all_slices():
+    points = np.zeros((5, 10, 2))
+    points[3] = 10.
+    fig, ax = plt.subplots()
+    DataSlicer(ax, points)
+    assert ax.get_xlim() == (-0.5, 10.5)
+    plt.close(fig)
+
+
+def test_contrast_limits_per_frame():
+    stack = np.arange(3 * 100, dtype=float).reshape(3, 10, 10)
+    fig, ax = plt.subplots()
+    ds = DataSlicer(ax, stack, contrast='percentile', percentiles=(0, 100))
+    assert np.allclose(ds.artist.get_clim(), (0, 99))
+    ds.press_key(KeyEvent('key_press_event', fig.canvas, 'right'))
+    assert np.allclose(ds.artist.get_clim(), (100, 199))
+    plt.close(fig)
+
+
+def test_quantized_frames():
+    stack = np.linspace(0, 1, 2 * 64).reshape(2, 8, 8)
+    fig, ax = plt.subplots()
+    ds = DataSlicer(ax, stack, contrast='global', percentiles=(0, 100), quantize=True)
+    frame = ds.artist.get_array()
+    assert frame.dtype == np.uint8
+    assert frame.min() == 0 and ds.artist.get_clim() == (0, 255)
+    plt.close(fig)
+
+
+def test_export_gif_and_png(tmp_path):
+    from PIL import Image
+    stack = np.random.default_rng(0).random((4, 16, 16))
+    fig, ax = plt.subplots(figsize=(2, 2), dpi=50)
+    ds = DataSlicer(ax, stack)
+    gif, = ds.export(tmp_path / 'stack.gif', fps=5, n_jobs=2)
+    with Image.open(gif) as im:
+        assert im.n_frames == 4
+        assert im.size == (100, 100)
+        assert im.info['duration'] == 200
+    pngs = ds.export(tmp_path / 'frame.png', n_jobs=1)
+    assert [p.name for p in pngs] == [f'frame_{i:05d}.png' for i in range(4)]
+    assert all(p.exists() for p in pngs)
+    plt.close(fig)
+
+
+class _CountingStack:
+    def __init__(self, n):
+        self.n = n
+        self.loads = 0
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        self.loads += 1
+        return np.full((16, 16), float(i))
+
+
+def test_imshow_lazy_stack_reads_only_a_few_frames():
+    stack = _CountingStack(50)
+    ds = imshow(stack, prefetch=0)
+    assert isinstance(ds, DataSlicer) and ds.num_slices == 50
+    assert stack.loads <= 2
+    plt.close(ds.ax.figure)
+
+
+def test_imshow_generator_goes_to_slicer():
+    ds = imshow(np.full((8, 8), float(i)) for i in range(5))
+    assert isinstance(ds, DataSlicer) and ds.num_slices == 5
+    assert ds.data[4][0, 0] == 4
+    plt.close(ds.ax.figure)
@@ -0,0 +1,44 @@
+import pickle
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.utils import DensityAccumulator, binned_kde, plot_density
+from stemplot.utils._binned_kde import kde_bandwidth
+
+
+def test_chunked_and_merged_match_binned_kde():
+    rng = np.random.default_rng(0)
+    xy = rng.normal([1, -2], [1, 0.5], (20000, 2))
+    lims = dict(xlim=(-4, 6), ylim=(-5, 1))
+
+    # two "workers" over different chunks, merged after a pickle round trip
+    a, b = DensityAccumulator(grid_size=(101, 61), **lims), DensityAccumulator(grid_size=(101, 61), **lims)
+    for chunk in np.array_split(xy[:12000], 5):
+        a.update(chunk)
+    for chunk in np.array_split(xy[12000:], 3):
+        b.update(chunk)
+    a.merge(pickle.loads(pickle.dumps(b)))
+
+    assert np.isclose(a.weight, len(xy))
+    assert np.allclose(a.mean, xy.mean(axis=0))
+    assert np.allclose(a.bandwidth(), kde_bandwidth(xy))
+
+    X, Y, Z = a.density()
+    X2, Y2, Z2 = binned_kde(xy, grid_size=(101, 61), **lims)
+    assert np.allclose(X, X2) and np.allclose(Y, Y2)
+    assert np.allclose(Z, Z2, atol=1e-3 * Z2.max())
+
+
+def test_weighted_moments_and_plot():
+    rng = np.random.default_rng(1)
+    xy = rng.normal(size=(1000, 2))
+    w = rng.uniform(0, 2, 1000)
+    acc = DensityAccumulator((-4, 4), (-4, 4), grid_size=50).update(xy[:500], w[:500]).update(xy[500:], w[500:])
+    assert np.allclose(acc.bandwidth('silverman'), kde_bandwidth(xy, 'silverman', weights=w))
+
+    fig, ax = plt.subplots()
+    plot_density(accumulator=acc, ax=ax)
+    assert ax.get_xlim() == (-4, 4)
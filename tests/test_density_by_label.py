@@ -0,0 +1,31 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.utils import binned_kde, plot_density_by_label
+from stemplot.utils._density_by_label import density_by_label
+
+
+def test_density_by_label_matches_per_label_kde():
+    rng = np.random.default_rng(0)
+    lbs = rng.integers(-1, 4, 5000)
+    points = np.array([[0, 0], [5, 0], [0, 5], [5, 5]])[np.maximum(lbs, 0)] + rng.normal(size=(5000, 2))
+    labels, X, Y, Z = density_by_label(points, lbs, grid_size=(80, 60), n_jobs=2)
+    assert np.array_equal(labels, [0, 1, 2, 3])
+    assert Z.shape == (4, 60, 80)
+    lims = dict(xlim=(X[0, 0], X[0, -1]), ylim=(Y[0, 0], Y[-1, 0]))
+    for k, label in enumerate(labels):
+        _, _, z = binned_kde(points[lbs == label], grid_size=(80, 60), **lims)
+        assert np.allclose(Z[k], z, atol=1e-6 * z.max())
+
+
+def test_plot_density_by_label_colors():
+    rng = np.random.default_rng(1)
+    lbs = np.repeat([0, 1], 500)
+    points = rng.normal(size=(1000, 2)) + lbs[:, None] * 4
+    fig, ax = plt.subplots()
+    contours = plot_density_by_label(points, lbs, ax=ax, n_levels=3, colors=['red', 'blue'])
+    assert len(contours) == 2
+    assert len(contours[0].levels) == 3
+    assert np.allclose(contours[1].get_edgecolor()[0], [0, 0, 1, 1])
@@ -0,0 +1,58 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import PathCollection
+
+from stemplot.interactive._density_scatter import DensityImage, cluster_scatter
+
+
+def test_cluster_scatter_switches_on_threshold():
+    rng = np.random.default_rng(0)
+    xy = rng.normal(size=(1000, 2))
+    colors = np.where(xy[:, 0] > 0, 'C1', 'C0')
+    fig, ax = plt.subplots()
+    assert isinstance(cluster_scatter(ax, xy, colors), PathCollection)
+    assert isinstance(cluster_scatter(ax, xy, colors, threshold=500), DensityImage)
+    plt.close(fig)
+
+
+def test_density_image_counts_and_zoom():
+    rng = np.random.default_rng(0)
+    xy = np.vstack([rng.normal(-3, 0.5, (5000, 2)), rng.normal(3, 0.5, (5000, 2))])
+    colors = np.repeat(['#ff0000', '#0000ff'], 5000)
+    fig, ax = plt.subplots()
+    im = cluster_scatter(ax, xy, colors, density=True)
+    fig.canvas.draw()
+    rgba = im.get_array()
+    assert rgba.shape[:2] == (int(round(ax.bbox.height)), int(round(ax.bbox.width)))
+    # the left half only holds red points, the right half only blue ones
+    w = rgba.shape[1]
+    left, right = rgba[:, :w // 2], rgba[:, w // 2:]
+    assert np.all(left[left[..., 3] > 0, 2] == 0)
+    assert np.all(right[right[..., 3] > 0, 0] == 0)
+
+    ax.set_xlim(2, 4)
+    fig.canvas.draw()
+    assert im._view_extent[:2] == (2, 4)
+    zoomed = im.get_array()
+    assert np.all(zoomed[zoomed[..., 3] > 0, 0] == 0)
+    # the data limits still hold every point
+    ax.relim()
+    assert np.allclose(ax.dataLim.extents, [*xy.min(axis=0), *xy.max(axis=0)])
+
+    im.set_color('#00ff00')
+    fig.canvas.draw()
+    zoomed = im.get_array()
+    assert np.allclose(zoomed[zoomed[..., 3] > 0, :3], [0, 1, 0])
+    plt.close(fig)
+
+
+def test_spectra_explorer_uses_cluster_scatter():
+    from stemplot.interactive import interactive_spectra
+    rng = np.random.default_rng(0)
+    app = interactive_spectra(rng.random((100, 2)), rng.random((100, 8)), rng.random((10, 10)), density=True)
+    assert isinstance(app.path_collection, DensityImage)
+    app.onselect([(0, 0), (0.5, 0), (0.5, 0.5), (0, 0.5)])
+    assert np.all(app.xy[app.ind] < 0.5)
+    plt.close('all')
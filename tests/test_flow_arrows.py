@@ -0,0 +1,71 @@
+import numpy as np
+from PIL import Image, ImageSequence
+
+from stemplot.arrows._flow_arrows import gif_chroma_to_transparent
+
+
+def test_gif_chroma_to_transparent(tmp_path):
+    bg = (255, 0, 255)
+    frames = []
+    for i in range(3):
+        a = np.empty((20, 30, 3), dtype=np.uint8)
+        a[:] = bg
+        a[i:i + 5, 5:25] = (100, 149, 237)
+        a[15, 0] = (250, 5, 250)  # near-key color
+        frames.append(Image.fromarray(a))
+    src = tmp_path / 'in.gif'
+    frames[0].save(src, save_all=True, append_images=frames[1:], duration=40, loop=0)
+
+    dst = tmp_path / 'out.gif'
+    gif_chroma_to_transparent(src, dst, bg_rgb=bg, tolerance=10)
+    with Image.open(dst) as im:
+        assert im.n_frames == 3
+        for i, frame in enumerate(ImageSequence.Iterator(im)):
+            rgba = np.asarray(frame.convert('RGBA'))
+            opaque = rgba[..., 3] > 0
+            assert opaque.sum() == 5 * 20
+            assert opaque[i:i + 5, 5:25].all()
+            assert (rgba[i, 5, :3] == (100, 149, 237)).all()
+
+    # in place, without tolerance the near-key pixel stays
+    gif_chroma_to_transparent(src, src, bg_rgb=bg)
+    with Image.open(src) as im:
+        assert np.asarray(im.convert('RGBA'))[15, 0, 3] == 255
+
+
+def test_flow_arrow_animation_writes_one_frame_per_phase(tmp_path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from stemplot.arrows import get_arrow, flow_arrow_animation
+
+    x, y, head = get_arrow((0, 0), (10, 5), radius=1, head_length=1, mode='hv')
+    path = tmp_path / 'flow.gif'
+    fig, ax, ani = flow_arrow_animation(x, y, head, dash_on_length=4, dash_off_length=2,
+                                        save_path=path, make_transparent=True)
+    with Image.open(path) as im:
+        assert im.n_frames == 6
+        rgba = np.asarray(im.convert('RGBA'))
+        assert rgba[0, 0, 3] == 0
+        assert (rgba[..., 3] > 0).any()
+    plt.close(fig)
+
+
+def test_get_arrow_heads_matches_get_arrow_head():
+    from stemplot.arrows import get_arrow_head, get_arrow_heads
+
+    rng = np.random.default_rng(0)
+    curves = [np.cumsum(rng.random((n, 2)), axis=0) for n in (2, 3, 7, 20)]
+    head_length = [0.3, 1.0, 0.5, 100.0]
+    heads, points, offsets = get_arrow_heads(curves, head_length, head_width=0.8)
+    assert heads.shape == (4, 3, 2)
+    for k, c in enumerate(curves):
+        x, y, head = get_arrow_head(c[:, 0], c[:, 1], head_length[k], head_width=0.8)
+        np.testing.assert_allclose(heads[k], head)
+        np.testing.assert_allclose(points[offsets[k]:offsets[k + 1]], np.column_stack([x, y]))
+
+    # the same curves given as one flat buffer
+    flat = np.concatenate(curves)
+    heads2, _, _ = get_arrow_heads(flat, head_length, head_width=0.8,
+                                   offsets=np.cumsum([0] + [len(c) for c in curves]))
+    np.testing.assert_allclose(heads2, heads)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.patches import GradientImage, ax_add_gradient_polygon, ax_add_gradient_polygons
+from stemplot.patches._gradient import _unit_ramp
+from stemplot.utils import plot_gradient_bar
+
+
+def test_unit_ramp_cached_float32():
+    ramp = _unit_ramp(50, 90)
+    assert ramp is _unit_ramp(50, 90)
+    assert ramp.dtype == np.float32 and not ramp.flags.writeable
+    # angle 90 runs bottom (row 0) to top
+    assert np.allclose(ramp[:, 0], np.linspace(0, 1, 50))
+    assert np.allclose(ramp[:, 0], ramp[:, -1])
+
+
+def test_shared_polygons_render_as_one_image():
+    fig, ax = plt.subplots(figsize=(20, 2))
+    squares = [np.array([[0, 0], [1, 0], [1, 1], [0, 1]]) + [2 * k, 0] for k in range(50)]
+    im = ax_add_gradient_polygons(ax, squares, angle=0, cmap='gray')
+    ax_add_gradient_polygon(ax, squares[0] + [0, 2], 0, 'gray', shared=True)
+    assert len(ax.images) == 1 and isinstance(im, GradientImage)
+    assert im.bounds == (0, 99, 0, 3)
+
+    fig.canvas.draw()
+    rgba = im.get_array()
+    assert rgba.dtype == np.float32
+    row = rgba[rgba.shape[0] // 4]
+    # left to right ramp inside the first square, transparent in the gap
+    first = row[:int(rgba.shape[1] / 99)]
+    assert np.all(np.diff(first[1:-1, 0]) >= 0) and first[-2, 0] > first[1, 0]
+    assert row[int(1.5 / 99 * rgba.shape[1]), 3] == 0
+
+
+def test_plot_gradient_bar_single_image():
+    fig, ax = plt.subplots()
+    plot_gradient_bar(ax, np.arange(1, 21))
+    assert len(ax.images) == 1
+    fig.canvas.draw()
+
+
+def test_shared_polygon_rejects_patch_kwargs():
+    fig, ax = plt.subplots()
+    square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+    with pytest.raises(ValueError, match='edgecolor'):
+        ax_add_gradient_polygon(ax, square, 0, 'gray', shared=True, edgecolor='k', linewidth=2)
+    assert len(ax.images) == 0
+    im = ax_add_gradient_polygon(ax, square, 0, 'gray', shared=True, zorder=5)
+    assert im.get_zorder() == 5
+    plt.close(fig)
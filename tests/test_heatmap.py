@@ -0,0 +1,48 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.utils import annotate_heatmap, plot_confusion_matrix
+from stemplot.utils._cell_labels import CellLabels
+
+
+def test_annotate_heatmap_batched_colors_and_level_of_detail():
+    fig, ax = plt.subplots(figsize=(4, 4), dpi=100)
+    data = np.arange(100.).reshape(10, 10)
+    im = ax.imshow(data)
+    labels = annotate_heatmap(im, valfmt="{x:.0f}", batched=True)
+    assert isinstance(labels, CellLabels)
+    # one vectorized threshold at the middle of the colormap
+    assert np.allclose(labels.colors[0, 0], [0, 0, 0, 1])
+    assert np.allclose(labels.colors[9, 9], [1, 1, 1, 1])
+    assert np.allclose(labels.xs, np.arange(10)) and np.allclose(labels.ys, np.arange(10))
+
+    fig.canvas.draw()
+    rows, cols = labels.visible_cells()
+    assert len(rows) == 10 and len(cols) == 10
+
+    # zoomed out the cells are too small for text; zoomed in only the view is labelled
+    ax.set_xlim(-0.5, 199.5)
+    ax.set_ylim(199.5, -0.5)
+    assert len(labels.visible_cells()[0]) == 0
+    ax.set_xlim(1.5, 4.5)
+    ax.set_ylim(3.5, 0.5)
+    rows, cols = labels.visible_cells()
+    assert list(rows) == [1, 2, 3] and list(cols) == [2, 3, 4]
+    fig.canvas.draw()
+
+
+def test_annotate_heatmap_small_matrix_keeps_text_artists():
+    fig, ax = plt.subplots()
+    texts = annotate_heatmap(ax.imshow(np.eye(3)))
+    assert len(texts) == 9 and texts[4].get_text() == '1.00'
+
+
+def test_confusion_matrix_few_artists():
+    fig, ax = plt.subplots(figsize=(6, 6))
+    plot_confusion_matrix(np.arange(10000).reshape(100, 100), ax)
+    assert len(ax.patches) == 0 and len(ax.texts) == 0
+    assert len(ax.images) == 1 and len(ax.collections) == 1
+    assert ax.get_xlim() == (0, 100) and ax.get_ylim() == (100, 0)
+    fig.canvas.draw()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.utils import HeatmapPyramid, PyramidImage, plot_big_heatmap
+
+
+def test_pyramid_levels_and_global_range(tmp_path):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(301, 250))
+    data[7, 9] = 50.
+    pyramid = HeatmapPyramid(data, min_size=64, band_rows=64)
+    assert [lvl.shape for lvl in pyramid.levels] == [(301, 250), (151, 125), (76, 63), (38, 32)]
+    # full blocks are plain 2x2 means, the odd last row is averaged on its own
+    assert np.allclose(pyramid.levels[1][:150], data[:300].reshape(150, 2, 125, 2).mean(axis=(1, 3)), atol=1e-6)
+    assert np.allclose(pyramid.levels[1][-1], data[-1].reshape(125, 2).mean(axis=1), atol=1e-6)
+    assert (pyramid.vmin, pyramid.vmax) == (data.min(), data.max())
+
+    peaks = HeatmapPyramid(data, reduce='max', directory=tmp_path, min_size=64)
+    assert isinstance(peaks.levels[-1], np.memmap)
+    assert (tmp_path / 'level_3.npy').exists()
+    assert peaks.levels[-1].max() == 50.
+
+    with pytest.raises(ValueError):
+        HeatmapPyramid(data, reduce='median')
+
+
+def test_big_heatmap_draws_visible_tiles_of_matching_level():
+    data = np.add.outer(np.arange(3000.), np.arange(4000.)).astype(np.float32)
+    fig, ax = plt.subplots(figsize=(4, 4), dpi=100)
+    plot_big_heatmap(data, ax=ax, lod=True)
+    im = ax.images[0]
+    assert isinstance(im, PyramidImage)
+    assert im.norm.vmin == 0 and im.norm.vmax == 6998
+
+    fig.canvas.draw()
+    coarse = im.level
+    assert coarse > 0 and im.get_array().shape == im.pyramid.levels[coarse].shape
+
+    ax.set_xlim(1030.5, 1100.5)
+    ax.set_ylim(2100.5, 2060.5)
+    fig.canvas.draw()
+    assert im.level == 0
+    assert im.get_array().shape == (256, 256)
+    x0, x1, y1, y0 = im.get_extent()
+    assert x0 <= 1030.5 and x1 >= 1100.5 and y0 <= 2060.5 and y1 >= 2100.5
+    assert im.get_array()[0, 0] == data[int(y0 + 0.5), int(x0 + 0.5)]
+    plt.close(fig)
+
+
+def test_big_heatmap_saves_with_tight_bbox(tmp_path):
+    fig, ax = plt.subplots(figsize=(3, 3), dpi=50)
+    plot_big_heatmap(np.random.default_rng(0).random((300, 200)), ax=ax, lod=True)
+    fig.savefig(tmp_path / 'heatmap.png', bbox_inches='tight')
+    extent = ax.images[0].get_window_extent()
+    assert np.allclose([extent.x0, extent.x1], ax.transData.transform([(-0.5, 0), (199.5, 0)])[:, 0])
+    plt.close(fig)
+
+
+def test_big_heatmap_draws_prebuilt_pyramid_without_lod():
+    data = np.random.default_rng(0).random((300, 200))
+    fig, ax = plt.subplots()
+    plot_big_heatmap(HeatmapPyramid(data, min_size=64), ax=ax, lod=False)
+    im = ax.images[0]
+    assert not isinstance(im, PyramidImage)
+    assert np.array_equal(im.get_array(), data)
+    fig.canvas.draw()
+    plt.close(fig)
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from stemplot.interactive._labelling import binary_threshold, gmm_relabel
+
+
+def _two_classes(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.vstack([rng.normal(0, 1, (n, 5)), rng.normal(4, 1, (n, 5))])
+    ps = np.concatenate([rng.normal(1, .1, (n, 9, 9)), rng.normal(.5, .1, (n, 9, 9))])
+    lbs = -np.ones(2 * n, dtype=int)
+    lbs[:20] = 0
+    lbs[n:n + 20] = 1
+    return X, ps, lbs
+
+
+def test_gmm_relabel_propagates_seed_labels():
+    """Seed labels are propagated to every sample without modifying the input."""
+    X, _, lbs = _two_classes()
+    new = gmm_relabel(X, lbs, random_state=0)
+    assert np.all(lbs[40:60] == -1)
+    np.testing.assert_array_equal(new, np.repeat([0, 1], 200))
+
+
+def test_binary_threshold_between_class_means():
+    """The threshold lies between the two central intensities."""
+    X, ps, lbs = _two_classes()
+    new, stats = binary_threshold(X, ps, lbs, random_state=0)
+    assert stats['v1_mean'] < stats['threshold'] < stats['v0_mean']
+    assert set(np.unique(new)) == {0, 1}
+
+
+def test_gmm_relabel_requires_both_classes():
+    X, _, lbs = _two_classes()
+    lbs[lbs == 1] = -1
+    with pytest.raises(ValueError):
+        gmm_relabel(X, lbs)
+
+
+def test_batch_import_does_not_import_pyplot():
+    """The batch driver runs headless: importing it leaves pyplot unloaded."""
+    code = "import sys, stemplot.batch; sys.exit('matplotlib.pyplot' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code]).returncode == 0
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+skimage = pytest.importorskip("skimage")
+from skimage.morphology import disk
+from skimage.transform import warp_polar
+
+from stemplot.interactive._polar import PolarTransformer, get_polar_transformer
+
+
+def test_matches_warp_polar_defaults():
+    """Default geometry reproduces skimage.transform.warp_polar."""
+    img = np.random.default_rng(0).random((41, 41))
+    np.testing.assert_allclose(PolarTransformer(img.shape).transform(img), warp_polar(img), atol=1e-12)
+
+
+def test_matches_warp_polar_with_mask_and_center():
+    """mask_radius behaves like multiplying by disk(); custom centers are honoured."""
+    rng = np.random.default_rng(1)
+    img = rng.random((41, 41))
+    pt = PolarTransformer(img.shape, mask_radius=20)
+    np.testing.assert_allclose(pt.transform(img), warp_polar(img * disk(20)), atol=1e-12)
+
+    img = rng.random((64, 80))
+    pt = PolarTransformer(img.shape, center=(30, 41), radius=20, output_shape=(180, 50))
+    expected = warp_polar(img, center=(30, 41), radius=20, output_shape=(180, 50))
+    np.testing.assert_allclose(pt.transform(img), expected, atol=1e-12)
+
+
+def test_batch_and_cache():
+    """A batch equals per-image transforms; same geometry returns the same transformer."""
+    ps = np.random.default_rng(2).random((5, 21, 21)).astype(np.float32)
+    pt = get_polar_transformer((21, 21), mask_radius=10)
+    assert pt is get_polar_transformer((21, 21), mask_radius=10)
+    out = pt.transform(ps)
+    assert out.dtype == np.float32
+    for p, o in zip(ps, out):
+        np.testing.assert_allclose(o, pt.transform(p), rtol=1e-6)
@@ -0,0 +1,172 @@
+import json
+import os
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from functools import partial
+from PIL import Image
+
+from stemplot.utils import figure_hash, save_fig, save_figs
+
+
+def _make_fig(seed):
+    rng = np.random.default_rng(seed)
+    fig, axs = plt.subplots(1, 2, figsize=(4, 2))
+    for ax in axs:
+        ax.plot(rng.random(20))
+        ax.set_title('panel')
+    return fig
+
+
+def test_save_figs_matches_tight_savefig(tmp_path):
+    fig = _make_fig(0)
+    fig.tight_layout(pad=0)
+    fig.savefig(tmp_path / 'ref.png', dpi=100, bbox_inches='tight', pad_inches=0.05, transparent=True)
+
+    results = save_figs([_make_fig(0)], [tmp_path / 'fig'], formats=('png', 'svg'), n_jobs=1, dpi=100)
+    assert results[0]['files'] == [str(tmp_path / 'fig.png'), str(tmp_path / 'fig.svg')]
+    assert set(results[0]['render']) == set(results[0]['files'])
+    assert (tmp_path / 'fig.svg').stat().st_size > 0
+    ref = np.asarray(Image.open(tmp_path / 'ref.png'))
+    assert np.array_equal(np.asarray(Image.open(tmp_path / 'fig.png')), ref)
+    plt.close('all')
+
+
+def test_save_figs_process_pool_and_layout_cache(tmp_path):
+    cache = {}
+    paths = [tmp_path / f'fig{i}.png' for i in range(3)]
+    first = save_figs([partial(_make_fig, i) for i in range(3)], paths, n_jobs=2, dpi=50, layout_cache=cache)
+    assert set(cache) == {str(p) for p in paths}
+    assert all(r['measure'] > 0 for r in first)
+
+    ref = np.asarray(Image.open(paths[1]))
+    again = save_figs([partial(_make_fig, i) for i in range(3)], paths, n_jobs=1, dpi=50, layout_cache=cache)
+    assert all(r['measure'] == 0 and r['layout'] == 0 for r in again)
+    assert np.array_equal(np.asarray(Image.open(paths[1])), ref)
+
+
+def test_save_fig_formats_share_one_layout(tmp_path):
+    fig = _make_fig(1)
+    save_fig(fig, tmp_path / 'single.png', dpi=80)
+    save_fig(fig, tmp_path / 'multi', formats=('png', 'pdf', 'svg'), dpi=80)
+    assert all((tmp_path / f'multi.{fmt}').stat().st_size > 0 for fmt in ('png', 'pdf', 'svg'))
+    assert np.array_equal(np.asarray(Image.open(tmp_path / 'multi.png')),
+                          np.asarray(Image.open(tmp_path / 'single.png')))
+    with pytest.raises(ValueError):
+        save_fig(fig, tmp_path / 'multi', format='png', formats=('pdf',))
+    plt.close(fig)
+
+
+def test_save_fig_honours_bbox_extra_artists(tmp_path):
+    def make():
+        fig, ax = plt.subplots(figsize=(2, 2))
+        ax.plot([0, 1])
+        label = ax.text(1.6, 0.5, 'outside the axes', transform=ax.transAxes)
+        label.set_in_layout(False)
+        return fig, label
+
+    fig, label = make()
+    fig.tight_layout(pad=0)
+    fig.savefig(tmp_path / 'ref.png', dpi=50, bbox_inches='tight', pad_inches=0.05, transparent=True,
+                bbox_extra_artists=[label])
+    fig, label = make()
+    save_fig(fig, tmp_path / 'fig.png', dpi=50, bbox_extra_artists=[label])
+    ref = np.asarray(Image.open(tmp_path / 'ref.png'))
+    assert np.array_equal(np.asarray(Image.open(tmp_path / 'fig.png')), ref)
+    fig, label = make()
+    save_fig(fig, tmp_path / 'cut.png', dpi=50)
+    assert Image.open(tmp_path / 'cut.png').size[0] < ref.shape[1]
+    plt.close('all')
+
+def test_export_cache_skips_unchanged_figures(tmp_path):
+    path = tmp_path / 'fig.png'
+    save_fig(_make_fig(2), path, dpi=50, cache=True)
+    index = json.loads((tmp_path / '.stemplot_export_cache.json').read_text())
+    assert list(index) == ['fig.png']
+    mtime = path.stat().st_mtime_ns
+
+    # the same figure rebuilt from scratch is not saved again
+    save_fig(_make_fig(2), path, dpi=50, cache=True)
+    assert path.stat().st_mtime_ns == mtime
+    # new data, other save options or a modified file are
+    fig = _make_fig(3)
+    assert figure_hash(fig, dpi=50) != figure_hash(_make_fig(2), dpi=50)
+    results = save_figs([fig], [path], n_jobs=1, dpi=50, cache=True)
+    assert not results[0]['cached'] and path.stat().st_mtime_ns != mtime
+    assert save_figs([_make_fig(3)], [path], n_jobs=1, dpi=50, cache=True)[0]['cached']
+    assert not save_figs([_make_fig(3)], [path], n_jobs=1, dpi=60, cache=True)[0]['cached']
+    path.write_bytes(b'')
+    assert not save_figs([_make_fig(3)], [path], n_jobs=1, dpi=60, cache=True)[0]['cached']
+    plt.close('all')
+
+
+def test_figure_hash_with_colorbar_legend_and_image(tmp_path):
+    def make(scale=1.):
+        fig, ax = plt.subplots(figsize=(3, 3))
+        im = ax.imshow(np.arange(16.).reshape(4, 4) * scale)
+        fig.colorbar(im, ax=ax)
+        ax.plot([0, 3], [0, 3], label='diagonal')
+        ax.legend()
+        return fig
+
+    assert figure_hash(make()) == figure_hash(make())
+    assert figure_hash(make()) != figure_hash(make(2.))
+    path = tmp_path / 'cbar.png'
+    save_fig(make(), path, dpi=50, cache=True)
+    mtime = path.stat().st_mtime_ns
+    save_fig(make(), path, dpi=50, cache=True)
+    assert path.stat().st_mtime_ns == mtime
+    plt.close('all')
+
+
+@pytest.mark.parametrize('draw, a, b', [
+    (lambda ax, v: ax.scatter([0, 1], [0, 1], s=v), 10, 100),
+    (lambda ax, v: ax.plot([0, 1], [0, 1], 'o', mfc=v), 'r', 'b'),
+    (lambda ax, v: ax.plot([0, 1], [0, 1], 'o', mec=v), 'r', 'b'),
+    (lambda ax, v: ax.plot([0, 1], [0, 1], 'o', fillstyle=v), 'full', 'left'),
+    (lambda ax, v: ax.text(0, 0, 'a', bbox=dict(facecolor=v)), 'w', 'y'),
+    (lambda ax, v: ax.text(0, 0, 'a', bbox=dict(boxstyle=v)), 'round,pad=0.3', 'round,pad=0.6'),
+    (lambda ax, v: ax.imshow(np.eye(3), norm=v), 'linear', 'log'),
+])
+def test_figure_hash_changes_with_one_property(draw, a, b):
+    digests = []
+    for value in (a, b, a):
+        fig, ax = plt.subplots()
+        draw(ax, value)
+        digests.append(figure_hash(fig))
+        plt.close(fig)
+    assert digests[0] != digests[1] and digests[0] == digests[2]
+
+
+def test_figure_hash_identifies_memmap_pyramids_without_reading(tmp_path, monkeypatch):
+    from stemplot.utils import TilePyramid, plot_image
+    from stemplot.utils import _export_cache
+
+    path = tmp_path / 'big.npy'
+    data = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(300, 400))
+    data[:] = 1
+    data.flush()
+    fig, ax = plt.subplots()
+    im = plot_image(ax, TilePyramid(np.load(path, mmap_mode='r'), tile_size=64))
+
+    sizes = []
+    update = _export_cache._update
+
+    def recording_update(h, value):
+        sizes.append(np.size(value) if isinstance(value, np.ndarray) else 0)
+        update(h, value)
+
+    monkeypatch.setattr(_export_cache, '_update', recording_update)
+    digest = figure_hash(fig)
+    assert max(sizes) < data.size and figure_hash(fig) == digest
+
+    # rewriting the file changes the hash
+    data[0, 0] = 2
+    data.flush()
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert figure_hash(fig) != digest
+    im.pyramid.close()
+    plt.close(fig)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.utils import plot_density
+from stemplot.utils._plot_density import perform_kde
+from stemplot.utils._scalable_kde import evaluate_kde, select_bandwidth, stratified_subsample
+
+
+def test_stratified_subsample_seeded_and_proportional():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(10000, 2))
+    labels = np.repeat([0, 1, 2], [7000, 2500, 500])
+    idx = stratified_subsample(points, 1000, random_state=3, strata=labels)
+    assert len(idx) == 1000 and len(np.unique(idx)) == 1000
+    assert np.array_equal(np.bincount(labels[idx]), [700, 250, 50])
+    assert np.array_equal(idx, stratified_subsample(points, 1000, random_state=3, strata=labels))
+    assert len(stratified_subsample(points, 777)) == 777
+
+
+def test_select_bandwidth_matches_tree_cv():
+    from sklearn.model_selection import GridSearchCV, KFold
+    from sklearn.neighbors import KernelDensity
+    rng = np.random.default_rng(1)
+    xy = np.vstack([rng.normal(0, 1, (400, 2)), rng.normal(4, 0.3, (200, 2))])
+    grid = GridSearchCV(KernelDensity(), {'bandwidth': np.logspace(-1, 1, 20)},
+                        cv=KFold(5, shuffle=True, random_state=0)).fit(xy)
+    bw = select_bandwidth(xy, 'cv')
+    candidates = np.logspace(-1, 1, 20)
+    assert abs(np.searchsorted(candidates, bw) - np.searchsorted(candidates, grid.best_params_['bandwidth'])) <= 1
+    assert np.isclose(select_bandwidth(xy, 'scott'), np.sqrt(np.prod(600 ** (-1 / 6) * xy.std(0, ddof=1))))
+
+
+def test_select_bandwidth_skips_unresolvable_candidates():
+    rng = np.random.default_rng(3)
+    xy = rng.normal(0, 100, (500, 2))
+    with pytest.warns(RuntimeWarning, match='Skipped bandwidths'):
+        bw = select_bandwidth(xy, 'cv', bandwidths=[0.1, 1, 20, 40], grid_size=512)
+    assert bw in (20, 40)
+    with pytest.raises(ValueError, match='grid_size'):
+        select_bandwidth(xy, 'cv', bandwidths=[0.1, 1], grid_size=512)
+
+def test_plot_density_binned_matches_tree():
+    rng = np.random.default_rng(2)
+    xy = rng.normal(size=(2000, 2))
+    kde = perform_kde(xy, bandwidth=0.4)
+    assert np.allclose(evaluate_kde(kde, xy[:100], chunk_size=7), kde.score_samples(xy[:100]))
+
+    fig, axs = plt.subplots(1, 2)
+    plot_density(xy, kde=kde, ax=axs[0], xlim=(-2, 2), ylim=(-2, 2))
+    plot_density(xy, kde=kde, ax=axs[1], xlim=(-2, 2), ylim=(-2, 2), method='tree')
+    # contour levels span [0, Z.max()] of either evaluation
+    levels = [ax.collections[0].levels for ax in axs]
+    assert np.allclose(levels[0], levels[1], rtol=1e-2)
@@ -0,0 +1,78 @@
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from stemplot.utils import HeatmapPyramid, TilePyramid, TiledImage, plot_image
+from stemplot.interactive import _data_slicer
+
+
+def test_tile_pyramid_matches_eager_pyramid_and_bounds_cache():
+    rng = np.random.default_rng(0)
+    img = rng.random((1001, 777)).astype(np.float32)
+    tiles = TilePyramid(img, tile_size=128)
+    eager = HeatmapPyramid(img, min_size=128)
+    assert tiles.n_levels == eager.n_levels
+    for k in range(tiles.n_levels):
+        h, w = tiles.level_shape(k)
+        assert np.allclose(tiles.read(k, 0, h, 0, w), eager.levels[k], atol=1e-6)
+    assert np.array_equal(tiles.read(0, 100, 300, 250, 700), img[100:300, 250:700])
+
+    small = TilePyramid(img, tile_size=128, cache_mb=0.2)
+    small.read(0, 0, 1001, 0, 777)
+    assert 0 < small.cached_bytes <= 0.2 * 2 ** 20
+
+    rgb = (rng.random((300, 500, 3)) * 255).astype(np.uint8)
+    level = TilePyramid(rgb, tile_size=64).read(2, 0, 75, 0, 125)
+    assert level.shape == (75, 125, 3) and level.dtype == np.uint8
+
+
+def test_tiled_plot_image_prefetches_on_zoom():
+    img = np.add.outer(np.arange(2000.), np.arange(3000.))
+    fig, ax = plt.subplots(figsize=(4, 4), dpi=100)
+    im = plot_image(ax, img, clip=True, keep_spine=False, tiled=True, tile_size=128)
+    assert isinstance(im, TiledImage)
+    assert im.get_clip_path() is not None and not ax.spines['left'].get_visible()
+
+    fig.canvas.draw()
+    assert im.level > 0
+    ax.set_xlim(1000, 1200)
+    ax.set_ylim(700, 500)
+    # the prefetch thread computes the visible tiles and their neighbours
+    deadline = time.time() + 10
+    while im.pyramid._pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert (0, 4, 8) in im.pyramid._cache and (0, 3, 7) in im.pyramid._cache
+    fig.canvas.draw()
+    assert im.level == 0
+    assert im.get_array()[0, 0] == img[384, 896]
+    im.pyramid.close()
+    plt.close(fig)
+
+
+def test_interactive_imshow_tiles_large_images(monkeypatch):
+    monkeypatch.setattr(_data_slicer, 'TILED_THRESHOLD', 100)
+    im = _data_slicer.imshow(np.zeros((20, 30)))
+    assert isinstance(im, TiledImage)
+    plt.close('all')
+
+
+def test_tiled_image_color_limits(monkeypatch):
+    img = np.add.outer(np.arange(200.), np.arange(300.))
+    fig, ax = plt.subplots()
+    im = plot_image(ax, img, tiled=True, tile_size=64, vmin=10, vmax=100)
+    fig.canvas.draw()
+    assert im.get_clim() == (10, 100)
+    im.pyramid.close()
+
+    # without limits the first loaded window sets the range
+    im = plot_image(ax, img, tiled=True, tile_size=64)
+    fig.canvas.draw()
+    assert im.get_clim() == (img.min(), img.max())
+    im.pyramid.close()
+
+    monkeypatch.setattr(_data_slicer, 'TILED_THRESHOLD', 100)
+    im = _data_slicer.imshow(img, vmin=0, vmax=1)
+    assert isinstance(im, TiledImage) and im.get_clim() == (0, 1)
+    plt.close('all')
@@ -10,6 +10,7 @@ _spec = importlib.util.spec_from_file_location("_utils", _utils_path)
 _mod = importlib.util.module_from_spec(_spec)
 _spec.loader.exec_module(_mod)
 _add_rounded_corners = _mod._add_rounded_corners
+_add_rounded_corners_batch = _mod._add_rounded_corners_batch
 
 
 # --- Open path (closed=False) ---
@@ -82,3 +83,28 @@ def test_closed_zero_radius_sharp_corners():
     """With radius=0 all corners are below threshold; one point per corner."""
     x, y = _add_rounded_corners([0, 1, 1, 0], [0, 0, 1, 1], radius=0, closed=True)
     assert len(x) == 4
+
+
+# --- Ragged batch ---
+
+def test_batch_matches_single_calls():
+    """Every polyline of a batch is rounded exactly like a single call."""
+    lines = [([0, 50, 50], [0, 0, 50]),
+             ([0, 10, 10, 30], [0, 0, 10, 10]),
+             ([0, 50, 100], [0, 0, 0])]
+    points = np.concatenate([np.column_stack(line) for line in lines])
+    offsets = np.cumsum([0] + [len(line[0]) for line in lines])
+    out, out_offsets = _add_rounded_corners_batch(points, offsets, radius=5)
+    assert len(out_offsets) == len(lines) + 1
+    for i, (x_in, y_in) in enumerate(lines):
+        x, y = _add_rounded_corners(x_in, y_in, radius=5)
+        np.testing.assert_allclose(out[out_offsets[i]:out_offsets[i + 1]], np.column_stack([x, y]))
+
+
+def test_batch_closed_per_line_radius():
+    """Closed polygons with one radius per polygon; radius 0 keeps the corners."""
+    square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+    points = np.concatenate([square, square + 2])
+    out, offsets = _add_rounded_corners_batch(points, [0, 4, 8], radius=[0.1, 0], closed=True)
+    np.testing.assert_array_equal(np.diff(offsets), [4 * 20, 4])
+    np.testing.assert_allclose(out[offsets[1]:], square + 2)